@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the FULLTEXT search index to the tasks table.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path so we can import from src
+sys.path.insert(0, os.path.dirname(__file__))
+
+INDEX_NAME = 'ft_task_text'
+
+def migrate_add_fulltext():
+    """Add a FULLTEXT index on tasks(title, description) if it is missing."""
+    print("🔄 Adding full-text search index")
+    print("=" * 50)
+    
+    try:
+        # Import after adding to path
+        from src.database import DatabaseConnection
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        print("Make sure you're running this from the project root directory")
+        return False
+    
+    db = DatabaseConnection()
+    
+    if not db.connect():
+        print("❌ Failed to connect to database")
+        return False
+    
+    try:
+        print("1. Checking existing indexes...")
+        existing = db.fetch_one("SHOW INDEX FROM tasks WHERE Key_name = %s", (INDEX_NAME,))
+        if existing:
+            print(f"   ℹ️  Index {INDEX_NAME} already exists")
+            return True
+        
+        tasks_count = db.fetch_one("SELECT COUNT(*) as count FROM tasks")['count']
+        print(f"2. Building index over {tasks_count} tasks (this may take a while)...")
+        cursor = db.execute_query(
+            f"ALTER TABLE tasks ADD FULLTEXT INDEX {INDEX_NAME} (title, description)"
+        )
+        if not cursor:
+            print("❌ Failed to create index")
+            return False
+        
+        print("✅ Migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+    finally:
+        db.disconnect()
+
+def main():
+    """Main migration function."""
+    print("🚀 Task Manager Full-Text Search Migration")
+    print("=" * 50)
+    
+    print("This script will add a FULLTEXT index on tasks(title, description)")
+    print("so that full-text search can rank results by relevance.")
+    
+    confirm = input("\nContinue with migration? (y/N): ").strip().lower()
+    if confirm not in ('y', 'yes'):
+        print("Migration cancelled.")
+        return
+    
+    if migrate_add_fulltext():
+        print("\n🎉 Full-text search is ready!")
+    else:
+        print("❌ Migration failed.")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
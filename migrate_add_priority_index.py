@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Migration script to add the (user_id, priority_level) index that priority
+filters use (databases created by setup_multi_user.py lacked it).
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path so we can import from src
+sys.path.insert(0, os.path.dirname(__file__))
+
+INDEX_NAME = 'idx_user_priority'
+
+def migrate_add_priority_index():
+    """Add the idx_user_priority index on tasks(user_id, priority_level) if it is missing."""
+    print("🔄 Adding priority index")
+    print("=" * 50)
+    
+    try:
+        # Import after adding to path
+        from src.database import DatabaseConnection
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        print("Make sure you're running this from the project root directory")
+        return False
+    
+    db = DatabaseConnection()
+    
+    if not db.connect():
+        print("❌ Failed to connect to database")
+        return False
+    
+    try:
+        print("1. Checking existing indexes...")
+        existing = db.fetch_one("SHOW INDEX FROM tasks WHERE Key_name = %s", (INDEX_NAME,))
+        if existing:
+            print(f"   ℹ️  Index {INDEX_NAME} already exists")
+            return True
+        
+        tasks_count = db.fetch_one("SELECT COUNT(*) as count FROM tasks")['count']
+        print(f"2. Building index over {tasks_count} tasks (this may take a while)...")
+        cursor = db.execute_query(
+            f"ALTER TABLE tasks ADD INDEX {INDEX_NAME} (user_id, priority_level)"
+        )
+        if not cursor:
+            print("❌ Failed to create index")
+            return False
+        
+        print("✅ Migration completed successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+    finally:
+        db.disconnect()
+
+def main():
+    """Main migration function."""
+    print("🚀 Task Manager Priority Index Migration")
+    print("=" * 50)
+    
+    print("This script will add an index on tasks(user_id, priority_level),")
+    print("which listing tasks filtered by priority relies on.")
+    
+    confirm = input("\nContinue with migration? (y/N): ").strip().lower()
+    if confirm not in ('y', 'yes'):
+        print("Migration cancelled.")
+        return
+    
+    if migrate_add_priority_index():
+        print("\n🎉 Priority filters are ready!")
+    else:
+        print("❌ Migration failed.")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
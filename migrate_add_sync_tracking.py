@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Migration script to add change tracking for incremental cache refreshes.
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path so we can import from src
+sys.path.insert(0, os.path.dirname(__file__))
+
+INDEX_NAME = 'idx_user_updated'
+TRIGGER_NAME = 'trg_tasks_tombstone'
+
+def migrate_add_sync_tracking():
+    """Add tasks.updated_at, its (user_id, updated_at) index and the task_tombstones table."""
+    print("🔄 Adding change tracking")
+    print("=" * 50)
+    
+    try:
+        # Import after adding to path
+        from src.database import DatabaseConnection
+    except ImportError as e:
+        print(f"❌ Import error: {e}")
+        print("Make sure you're running this from the project root directory")
+        return False
+    
+    db = DatabaseConnection()
+    
+    if not db.connect():
+        print("❌ Failed to connect to database")
+        return False
+    
+    try:
+        print("1. Checking tasks table...")
+        if not db.fetch_one("SHOW COLUMNS FROM tasks LIKE 'user_id'"):
+            print("❌ tasks has no user_id column; run migrate_to_multi_user.py first")
+            return False
+        
+        if db.fetch_one("SHOW COLUMNS FROM tasks LIKE 'updated_at'"):
+            print("   ℹ️  Column updated_at already exists")
+        else:
+            tasks_count = db.fetch_one("SELECT COUNT(*) as count FROM tasks")['count']
+            print(f"2. Adding updated_at to {tasks_count} tasks (this may take a while)...")
+            # Existing rows get the current time, so the first sync after a load reads nothing extra
+            cursor = db.execute_query("""
+                ALTER TABLE tasks ADD COLUMN updated_at TIMESTAMP NOT NULL
+                    DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            """)
+            if not cursor:
+                print("❌ Failed to add updated_at")
+                return False
+        
+        if not db.fetch_one("SHOW INDEX FROM tasks WHERE Key_name = %s", (INDEX_NAME,)):
+            print(f"3. Adding index {INDEX_NAME}...")
+            if not db.execute_query(f"ALTER TABLE tasks ADD INDEX {INDEX_NAME} (user_id, updated_at)"):
+                print("❌ Failed to create index")
+                return False
+        
+        print("4. Creating task_tombstones table...")
+        cursor = db.execute_query("""
+            CREATE TABLE IF NOT EXISTS task_tombstones (
+                task_id INT PRIMARY KEY,
+                user_id INT NOT NULL,
+                deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_user_deleted (user_id, deleted_at),
+                INDEX idx_deleted (deleted_at)
+            )
+        """)
+        if not cursor:
+            print("❌ Failed to create task_tombstones")
+            return False
+        # Tables created before purging existed lack the index purge_tombstones uses
+        if not db.fetch_one("SHOW INDEX FROM task_tombstones WHERE Key_name = 'idx_deleted'"):
+            if not db.execute_query("ALTER TABLE task_tombstones ADD INDEX idx_deleted (deleted_at)"):
+                print("❌ Failed to create index idx_deleted")
+                return False
+        
+        existing = db.fetch_one(
+            "SELECT TRIGGER_NAME FROM information_schema.TRIGGERS "
+            "WHERE TRIGGER_SCHEMA = DATABASE() AND TRIGGER_NAME = %s",
+            (TRIGGER_NAME,)
+        )
+        if existing:
+            print(f"   ℹ️  Trigger {TRIGGER_NAME} already exists")
+        else:
+            print(f"5. Creating trigger {TRIGGER_NAME}...")
+            # Every delete, whoever runs it, leaves a tombstone for incremental refreshes
+            cursor = db.execute_query(f"""
+                CREATE TRIGGER {TRIGGER_NAME} AFTER DELETE ON tasks FOR EACH ROW
+                    INSERT INTO task_tombstones (task_id, user_id) VALUES (OLD.task_id, OLD.user_id)
+                    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP
+            """)
+            if not cursor:
+                print("❌ Failed to create trigger")
+                return False
+        
+        print("✅ Migration completed successfully!")
+        return True
+    
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        return False
+    finally:
+        db.disconnect()
+
+def main():
+    """Main migration function."""
+    print("🚀 Task Manager Change Tracking Migration")
+    print("=" * 50)
+    
+    print("This script will add an updated_at column to tasks and record")
+    print("deleted tasks in task_tombstones, so that cached tasks can be")
+    print("refreshed incrementally with refresh_tasks(incremental=True).")
+    
+    confirm = input("\nContinue with migration? (y/N): ").strip().lower()
+    if confirm not in ('y', 'yes'):
+        print("Migration cancelled.")
+        return
+    
+    if migrate_add_sync_tracking():
+        print("\n🎉 Incremental refresh is ready!")
+    else:
+        print("❌ Migration failed.")
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
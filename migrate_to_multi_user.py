@@ -34,8 +34,8 @@ def migrate_to_multi_user():
     try:
         # Step 1: Backup current tasks (optional)
         print("1. Checking current tasks...")
-        current_tasks = db.fetch_all("SELECT * FROM tasks")
-        print(f"   Found {len(current_tasks)} existing tasks")
+        current_tasks = db.fetch_one("SELECT COUNT(*) as count FROM tasks")
+        print(f"   Found {current_tasks['count']} existing tasks")
         
         # Step 2: Create users table
         print("2. Creating users table...")
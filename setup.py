@@ -8,9 +8,12 @@ setup(
         "PyMySQL>=1.0.0",
         "python-dateutil>=2.8.0"
     ],
+    extras_require={
+        'async': ["aiomysql>=0.2.0"],
+    },
     entry_points={
         'console_scripts': [
-            'task-manager=src.cli:main',
+            'task-manager=src.commands:main',
         ],
     },
     python_requires='>=3.8',
@@ -49,7 +49,8 @@ def setup_database():
                 creation_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 INDEX idx_due_date (due_date),
                 INDEX idx_priority (priority_level),
-                INDEX idx_status (status)
+                INDEX idx_status (status),
+                FULLTEXT INDEX ft_task_text (title, description)
             )
         ''')
         
@@ -48,12 +48,34 @@ def setup_multi_user_database():
                 priority_level ENUM('Low', 'Medium', 'High') NOT NULL DEFAULT 'Medium',
                 status ENUM('Pending', 'In Progress', 'Completed') NOT NULL DEFAULT 'Pending',
                 creation_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
                 FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
                 INDEX idx_user_id (user_id),
-                INDEX idx_user_status (user_id, status)
+                INDEX idx_user_status (user_id, status),
+                INDEX idx_user_priority (user_id, priority_level),
+                INDEX idx_user_updated (user_id, updated_at),
+                FULLTEXT INDEX ft_task_text (title, description)
             )
         ''')
         
+        # Deleted tasks, for incremental cache refreshes
+        print("Creating task_tombstones table...")
+        db.execute_query('''
+            CREATE TABLE IF NOT EXISTS task_tombstones (
+                task_id INT PRIMARY KEY,
+                user_id INT NOT NULL,
+                deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                INDEX idx_user_deleted (user_id, deleted_at),
+                INDEX idx_deleted (deleted_at)
+            )
+        ''')
+        if not db.fetch_one("SHOW TRIGGERS LIKE 'tasks'"):
+            db.execute_query('''
+                CREATE TRIGGER trg_tasks_tombstone AFTER DELETE ON tasks FOR EACH ROW
+                    INSERT INTO task_tombstones (task_id, user_id) VALUES (OLD.task_id, OLD.user_id)
+                    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP
+            ''')
+        
         # Create admin user
         create_admin = input("Create admin user? (y/N): ").strip().lower()
         if create_admin in ('y', 'yes'):
@@ -13,6 +13,12 @@ except ImportError:
 
 def main():
     """Main entry point with secure configuration."""
+    if len(sys.argv) > 1:
+        # One-shot command such as "python -m src list --json"
+        from src.commands import main as run_command
+        run_command(sys.argv[1:])
+        return
+    
     from src.config import DatabaseConfig
     from src.database import DatabaseConnection
     from src.cli import TaskManagerCLI
@@ -0,0 +1,243 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple
+import pymysql
+from pymysql.constants import CLIENT
+from .config import DatabaseConfig
+from .database import PoolTimeoutError, RollbackOnlyError, setup_logger
+
+try:
+    import aiomysql
+except ImportError:  # Optional: pip install aiomysql
+    aiomysql = None
+
+if TYPE_CHECKING:
+    import logging
+
+class AsyncDatabaseConnection:
+    """asyncio counterpart of DatabaseConnection, backed by an aiomysql pool.
+    
+    Methods mirror DatabaseConnection but are coroutines (fetch_iter is an
+    async generator and transaction() an async context manager). Queries
+    borrow a connection from the pool for the duration of one await, so
+    many tasks share a few connections without a thread each. The active
+    transaction is tracked per asyncio task rather than per thread.
+    Unlike DatabaseConnection's pool, connections are not closed when idle
+    but replaced once older than pool_recycle seconds.
+    """
+    
+    def __init__(self, host: str = None, user: str = None,
+                 password: str = None, database: str = None, port: int = None,
+                 pool_min_size: int = None, pool_max_size: int = None,
+                 pool_timeout: float = None, pool_recycle: float = None):
+        config = DatabaseConfig.get_connection_params()
+        pool_config = DatabaseConfig.get_pool_params()
+        self.host = host or config['host']
+        self.user = user or config['user']
+        self.password = password or config['password']
+        self.database = database or config['database']
+        self.port = port or config['port']
+        self.pool_min_size = pool_config['min_size'] if pool_min_size is None else pool_min_size
+        # Always pooled: DB_POOL_MAX_SIZE=0 means DB_ASYNC_POOL_MAX_SIZE here
+        self.pool_max_size = (pool_max_size or pool_config['max_size']
+                              or DatabaseConfig.ASYNC_POOL_MAX_SIZE)
+        self.pool_timeout = pool_config['timeout'] if pool_timeout is None else pool_timeout
+        self.pool_recycle = DatabaseConfig.ASYNC_POOL_RECYCLE if pool_recycle is None else pool_recycle
+        self.pool = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        # Connection of the transaction the current asyncio task is running, if any
+        self._transaction: ContextVar[Optional[Any]] = ContextVar(
+            f'transaction_{id(self)}', default=None)
+        # Set when a nested transaction() block of the current task raised
+        self._rollback_only: ContextVar[bool] = ContextVar(
+            f'rollback_only_{id(self)}', default=False)
+        self._logger: Optional['logging.Logger'] = None
+    
+    @property
+    def logger(self) -> 'logging.Logger':
+        """Logger, configured on first use rather than on construction."""
+        if self._logger is None:
+            self._logger = setup_logger(__name__)
+        return self._logger
+    
+    async def connect(self) -> bool:
+        """Open the connection pool."""
+        if aiomysql is None:
+            self.logger.error("AsyncDatabaseConnection needs aiomysql (pip install aiomysql)")
+            return False
+        try:
+            self.pool = await aiomysql.create_pool(
+                host=self.host,
+                user=self.user,
+                password=self.password,
+                db=self.database,
+                port=self.port,
+                minsize=self.pool_min_size,
+                maxsize=self.pool_max_size,
+                pool_recycle=self.pool_recycle,
+                charset='utf8mb4',
+                cursorclass=aiomysql.DictCursor,
+                # Report matched rather than changed rows so rowcount confirms ownership
+                client_flag=CLIENT.FOUND_ROWS,
+                autocommit=True
+            )
+            self.logger.info(
+                f"Async database connection pool established "
+                f"(min={self.pool_min_size}, max={self.pool_max_size})"
+            )
+            return True
+        except pymysql.Error as e:
+            self.logger.error(f"Database connection failed: {e}")
+            return False
+    
+    async def disconnect(self) -> None:
+        """Close the pool, waiting for borrowed connections to come back."""
+        if self.pool is not None:
+            self.pool.close()
+            await self.pool.wait_closed()
+            self.pool = None
+            self.logger.info("Async database connection pool closed")
+    
+    @property
+    def is_connected(self) -> bool:
+        return self.pool is not None
+    
+    async def _ensure_connected(self) -> None:
+        """Connect on first use, so callers that never query never connect."""
+        if self.is_connected:
+            return
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if not self.is_connected and not await self.connect():
+                raise pymysql.err.OperationalError("Could not connect to the database")
+    
+    @asynccontextmanager
+    async def _borrow(self) -> AsyncIterator[Any]:
+        """Yield a connection for exclusive use by the calling asyncio task."""
+        active = self._transaction.get()
+        if active is not None:
+            # Queries inside transaction() reuse its connection
+            yield active
+            return
+        
+        await self._ensure_connected()
+        # disconnect() may clear self.pool while the connection is out
+        pool = self.pool
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), self.pool_timeout)
+        except asyncio.TimeoutError:
+            raise PoolTimeoutError(
+                f"No database connection available within {self.pool_timeout} seconds"
+            ) from None
+        try:
+            yield conn
+        finally:
+            pool.release(conn)
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling asyncio task is inside transaction()."""
+        return self._transaction.get() is not None
+    
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[Any]:
+        """Run the enclosed queries on one connection as a single transaction.
+        
+        Same rules as DatabaseConnection.transaction: queries awaited by the
+        same task join it, it commits on normal exit and rolls back on error,
+        nested blocks join the outermost one, which rolls back and raises
+        RollbackOnlyError if any of them raised.
+        """
+        if self.in_transaction:
+            try:
+                yield self._transaction.get()
+            except BaseException:
+                self._rollback_only.set(True)
+                raise
+            return
+        
+        async with self._borrow() as connection:
+            await connection.begin()
+            token = self._transaction.set(connection)
+            rollback_token = self._rollback_only.set(False)
+            try:
+                yield connection
+                if self._rollback_only.get():
+                    raise RollbackOnlyError("A nested transaction failed; all its changes were rolled back")
+                await connection.commit()
+            except BaseException:
+                await self._rollback(connection)
+                raise
+            finally:
+                self._rollback_only.reset(rollback_token)
+                self._transaction.reset(token)
+    
+    async def _run(self, query: str, params: tuple,
+                   fetch: Optional[str] = None) -> Tuple[Optional[Any], Any]:
+        """Execute query, optionally fetching 'all' or 'one'; returns (cursor, result)."""
+        in_transaction = self.in_transaction
+        try:
+            async with self._borrow() as connection:
+                try:
+                    async with connection.cursor() as cursor:
+                        await cursor.execute(query, params)
+                        result = None
+                        if fetch == 'all':
+                            result = await cursor.fetchall()
+                        elif fetch == 'one':
+                            result = await cursor.fetchone()
+                        if not in_transaction:
+                            await connection.commit()
+                        return cursor, result
+                except pymysql.Error as e:
+                    self.logger.error(f"Query execution failed: {e}")
+                    # Inside transaction() the owner of the block decides
+                    if not in_transaction:
+                        await self._rollback(connection)
+                    return None, None
+        except pymysql.Error as e:
+            self.logger.error(f"Could not obtain a database connection: {e}")
+            return None, None
+    
+    async def _rollback(self, connection: Any) -> None:
+        """Roll back, tolerating connections that are already broken."""
+        try:
+            await connection.rollback()
+        except pymysql.Error:
+            pass
+    
+    async def execute_query(self, query: str, params: tuple = ()) -> Optional[Any]:
+        """Execute SQL query; the returned cursor carries rowcount and lastrowid."""
+        cursor, _ = await self._run(query, params)
+        return cursor
+    
+    async def fetch_all(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
+        """Execute query and fetch all results."""
+        cursor, rows = await self._run(query, params, 'all')
+        return list(rows) if cursor else []
+    
+    async def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
+        """Execute query and fetch single result."""
+        _, row = await self._run(query, params, 'one')
+        return row
+    
+    async def fetch_iter(self, query: str, params: tuple = (),
+                         batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """Stream query results through a server-side cursor (see DatabaseConnection.fetch_iter)."""
+        async with self._borrow() as connection:
+            cursor = await connection.cursor(aiomysql.SSDictCursor)
+            try:
+                await cursor.execute(query, params)
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+            except pymysql.Error as e:
+                self.logger.error(f"Streaming query failed: {e}")
+                raise
+            finally:
+                await cursor.close()
\ No newline at end of file
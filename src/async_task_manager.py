@@ -0,0 +1,477 @@
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Iterable
+from datetime import date
+import time
+from .models import Task
+from .cache import (TaskCache, TenantCache, can_sync, is_warm, latest_value, merge_changes,
+                    page_cursor, parse_cursor, sync_since)
+from .config import CacheConfig, DatabaseConfig
+from .context import current_user
+from .query import (CHANGES_QUERY, LOAD_QUERY, PURGE_TOMBSTONES_QUERY, STATISTICS_FIELDS,
+                    STATISTICS_QUERY, TOMBSTONE_PURGE_INTERVAL, TOMBSTONES_QUERY, UPDATABLE_FIELDS,
+                    TaskQuery, assign_ids, fulltext_query, insert_statement, keyword_condition,
+                    matches_filters, paginate, ranked_search_query, tasks_from_specs)
+from .search import SearchHit, fulltext_hits, hits_from_rows, rank_hits
+
+if TYPE_CHECKING:
+    from .async_database import AsyncDatabaseConnection
+    from .auth import AuthenticationManager
+
+class AsyncTaskManager:
+    """asyncio version of TaskManager over an AsyncDatabaseConnection.
+    
+    Same methods, arguments and results as TaskManager, as coroutines
+    (page_cursor stays a plain function). Queries, ordering, user_context
+    handling and the per-user cache partitions in a TenantCache are shared
+    with TaskManager; each asyncio task sees its own user_context. Partitions
+    are only touched between awaits, so they need no lock of their own.
+    """
+    
+    def __init__(self, db_connection: 'AsyncDatabaseConnection', auth_manager: 'AuthenticationManager',
+                 cache_statistics: bool = False, cache_limit: Optional[int] = None,
+                 tenant_cache: Optional[TenantCache] = None):
+        self.db = db_connection
+        self.auth = auth_manager
+        self.cache_statistics = cache_statistics
+        self.cache_limit = CacheConfig.TASK_CACHE_LIMIT if cache_limit is None else cache_limit
+        self._tenants = TenantCache.shared(db_connection) if tenant_cache is None else tenant_cache
+        self._purged_at: Optional[float] = None
+    
+    def _user_id(self) -> Optional[int]:
+        """The user this call acts for (see TaskManager), or None."""
+        context = current_user()
+        if context is not None:
+            return context.user_id
+        return self.auth.get_current_user_id() if self.auth.is_authenticated() else None
+    
+    async def _cache_for(self, user_id: int) -> TaskCache:
+        """The cache partition of user_id, loaded on first use."""
+        if self.cache_limit <= 0:
+            return TaskCache()
+        cache = self._tenants.get(user_id)
+        if cache is None:
+            cache = TaskCache()
+            self._tenants.put(user_id, cache)
+            await self._load_tasks(user_id, cache)
+        return cache
+    
+    async def warm_up(self) -> None:
+        """Load the current user's partition unless it is already cached (see TaskManager.warm_up)."""
+        user_id = self._user_id()
+        if user_id is not None:
+            await self._cache_for(user_id)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Metrics of the TenantCache behind this manager (see TenantCache.stats)."""
+        return self._tenants.stats()
+    
+    async def _load_tasks(self, user_id: int, cache: TaskCache) -> None:
+        """Load the user's most recent tasks (up to cache_limit) into their partition."""
+        writes = self._tenants.write_count(user_id)
+        try:
+            rows = await self.db.fetch_all(LOAD_QUERY, (user_id, self.cache_limit + 1))
+            complete = len(rows) <= self.cache_limit
+            tasks = [Task.from_row(row) for row in rows[:self.cache_limit]]
+            tasks.reverse()
+            # Writes awaited by other tasks during the query leave it cold
+            written = self._tenants.write_count(user_id) != writes
+            watermark = latest_value(None, rows[:self.cache_limit], 'updated_at')
+            cache.load(tasks, complete=complete and not written, watermark=watermark)
+            self._tenants.resize(user_id)
+            if written:
+                self._tenants.discard(user_id, cache)
+        except Exception as e:
+            print(f"Error loading tasks: {e}")
+    
+    async def _sync_tasks(self, user_id: int, cache: TaskCache) -> bool:
+        """Merge rows changed since the partition's watermark (see TaskManager._sync_tasks)."""
+        since = sync_since(cache)
+        writes = self._tenants.write_count(user_id)
+        try:
+            rows = await self.db.fetch_all(CHANGES_QUERY, (user_id, since))
+            tombstones = await self.db.fetch_all(TOMBSTONES_QUERY, (user_id, since))
+        except Exception as e:
+            print(f"Error syncing tasks: {e}")
+            return False
+        
+        if self._tenants.write_count(user_id) != writes:
+            return False
+        merge_changes(cache, rows, tombstones, self.cache_limit)
+        self._tenants.resize(user_id)
+        self._tenants.renew(user_id)
+        if rows or tombstones:
+            self._tenants.drop_statistics(user_id)
+        
+        if self._purged_at is None or time.monotonic() - self._purged_at >= TOMBSTONE_PURGE_INTERVAL:
+            await self.purge_tombstones()
+        return True
+    
+    async def purge_tombstones(self) -> int:
+        """Delete tombstones older than the retention window (see TaskManager.purge_tombstones)."""
+        self._purged_at = time.monotonic()
+        try:
+            cursor = await self.db.execute_query(PURGE_TOMBSTONES_QUERY,
+                                                 (CacheConfig.TASK_TOMBSTONE_RETENTION_HOURS,))
+            return cursor.rowcount if cursor else 0
+        except Exception as e:
+            print(f"Error purging tombstones: {e}")
+            return 0
+    
+    def _partition(self, user_id: int) -> TaskCache:
+        """The user's partition for a write; writes never load one, so a miss is a throwaway."""
+        cache = self._tenants.peek(user_id)
+        return cache if cache is not None else TaskCache()
+    
+    async def add_task(self, title: str, description: str = "", due_date: Optional[date] = None,
+                       priority_level: str = "Medium") -> bool:
+        """Add a new task for the current user."""
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to add tasks")
+            return False
+        
+        try:
+            task = Task(title=title, description=description,
+                        due_date=due_date, priority_level=priority_level)
+            
+            cursor = await self.db.execute_query(*insert_statement(user_id, [task]))
+            if cursor:
+                task._task_id = cursor.lastrowid
+                self._partition(user_id).add(task)
+                self._invalidate_statistics(user_id)
+                print(f"✅ Task added successfully with ID: {task.task_id}")
+                return True
+            return False
+        
+        except Exception as e:
+            print(f"Error adding task: {e}")
+            return False
+    
+    async def add_tasks(self, specs: Iterable[Dict[str, Any]],
+                        chunk_size: Optional[int] = None) -> List[int]:
+        """Add many tasks for the current user in a single transaction (see TaskManager.add_tasks)."""
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to add tasks")
+            return []
+        
+        chunk_size = DatabaseConfig.BULK_CHUNK_SIZE if chunk_size is None else chunk_size
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        tasks = tasks_from_specs(specs)
+        if not tasks:
+            return []
+        
+        try:
+            async with self.db.transaction() as connection:
+                async with connection.cursor() as cursor:
+                    for start in range(0, len(tasks), chunk_size):
+                        chunk = tasks[start:start + chunk_size]
+                        await cursor.execute(*insert_statement(user_id, chunk))
+                        assign_ids(cursor, chunk)
+        except Exception as e:
+            print(f"Error adding tasks: {e}")
+            return []
+        
+        cache = self._partition(user_id)
+        if len(cache) + len(tasks) <= self.cache_limit:
+            cache.add_many(tasks)
+        else:
+            cache.complete = False
+        self._invalidate_statistics(user_id)
+        
+        print(f"✅ {len(tasks)} tasks added successfully")
+        return [task.task_id for task in tasks]
+    
+    async def get_task(self, task_id: int) -> Optional[Task]:
+        """Retrieve a task by ID (only if owned by current user)."""
+        user_id = self._user_id()
+        if user_id is None:
+            return None
+        
+        cache = await self._cache_for(user_id)
+        task = cache.get(task_id)
+        if task is not None:
+            return task
+        
+        task_data = await self.db.fetch_one(
+            "SELECT * FROM tasks WHERE task_id = %s AND user_id = %s",
+            (task_id, user_id)
+        )
+        if task_data:
+            task = Task.from_row(task_data)
+            self._partition(user_id).add(task)
+            return task
+        
+        return None
+    
+    async def update_task(self, task_id: int, **kwargs) -> bool:
+        """Update task details (only if owned by current user)."""
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to update tasks")
+            return False
+        
+        try:
+            updates = {k: v for k, v in kwargs.items() if k in UPDATABLE_FIELDS}
+            
+            if not updates:
+                print("ℹ️  No changes made")
+                return True
+            
+            Task.validate_fields(**updates)
+            
+            set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
+            query = f"UPDATE tasks SET {set_clause} WHERE task_id = %s AND user_id = %s"
+            params = tuple(updates.values()) + (task_id, user_id)
+            
+            cursor = await self.db.execute_query(query, params)
+            if not cursor:
+                return False
+            if cursor.rowcount == 0:
+                print(f"❌ Task with ID {task_id} not found or access denied")
+                return False
+            
+            self._partition(user_id).update(task_id, updates)
+            self._invalidate_statistics(user_id)
+            print(f"✅ Task {task_id} updated successfully")
+            return True
+        
+        except Exception as e:
+            print(f"Error updating task: {e}")
+            return False
+    
+    async def update_tasks(self, task_ids: Iterable[int], **kwargs) -> Dict[int, bool]:
+        """Apply the same field updates to many tasks (see TaskManager.update_tasks)."""
+        task_ids = list(dict.fromkeys(task_ids))
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to update tasks")
+            return {task_id: False for task_id in task_ids}
+        if not task_ids:
+            return {}
+        
+        updates = {k: v for k, v in kwargs.items() if k in UPDATABLE_FIELDS}
+        if not updates:
+            print("ℹ️  No changes made")
+            return {task_id: True for task_id in task_ids}
+        
+        try:
+            Task.validate_fields(**updates)
+            set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
+            chunk_size = DatabaseConfig.BULK_CHUNK_SIZE
+            
+            updated = set()
+            async with self.db.transaction() as connection:
+                async with connection.cursor() as cursor:
+                    for start in range(0, len(task_ids), chunk_size):
+                        chunk = task_ids[start:start + chunk_size]
+                        placeholders = ", ".join(["%s"] * len(chunk))
+                        await cursor.execute(
+                            f"UPDATE tasks SET {set_clause} "
+                            f"WHERE user_id = %s AND task_id IN ({placeholders})",
+                            tuple(updates.values()) + (user_id,) + tuple(chunk)
+                        )
+                        if cursor.rowcount == len(chunk):
+                            updated.update(chunk)
+                            continue
+                        await cursor.execute(
+                            f"SELECT task_id FROM tasks WHERE user_id = %s AND task_id IN ({placeholders})",
+                            (user_id,) + tuple(chunk)
+                        )
+                        updated.update(row['task_id'] for row in await cursor.fetchall())
+        except Exception as e:
+            print(f"Error updating tasks: {e}")
+            return {task_id: False for task_id in task_ids}
+        
+        if updated:
+            cache = self._partition(user_id)
+            for task_id in updated:
+                cache.update(task_id, updates)
+            self._invalidate_statistics(user_id)
+        
+        missing = [task_id for task_id in task_ids if task_id not in updated]
+        if updated:
+            print(f"✅ {len(updated)} task(s) updated successfully")
+        if missing:
+            print(f"❌ Not found or access denied: {', '.join(map(str, missing))}")
+        return {task_id: task_id in updated for task_id in task_ids}
+    
+    async def delete_task(self, task_id: int) -> bool:
+        """Delete a task from the system (only if owned by current user)."""
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to delete tasks")
+            return False
+        
+        try:
+            cursor = await self.db.execute_query(
+                "DELETE FROM tasks WHERE task_id = %s AND user_id = %s", (task_id, user_id))
+            if not cursor:
+                return False
+            if cursor.rowcount == 0:
+                print(f"❌ Task with ID {task_id} not found or access denied")
+                return False
+            
+            self._partition(user_id).remove(task_id)
+            self._invalidate_statistics(user_id)
+            print(f"✅ Task {task_id} deleted successfully")
+            return True
+        except Exception as e:
+            print(f"Error deleting task: {e}")
+            return False
+    
+    async def list_tasks(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                         after_cursor: Optional[str] = None) -> List[Task]:
+        """List tasks for current user with optional filtering (see TaskManager.list_tasks)."""
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to list tasks")
+            return []
+        
+        after = parse_cursor(after_cursor) if after_cursor else None
+        cache = await self._cache_for(user_id)
+        if is_warm(cache):
+            predicate = (lambda task: matches_filters(task, filters)) if filters else None
+            return cache.sorted_page(after, limit, predicate)
+        
+        query, params = TaskQuery(user_id) \
+            .filter(filters or {}).after(after).limit(limit).build()
+        try:
+            results = await self.db.fetch_all(query, params)
+            return [Task.from_row(task_data) for task_data in results]
+        except Exception as e:
+            print(f"Error listing tasks: {e}")
+            return []
+    
+    @staticmethod
+    def page_cursor(task: Task) -> str:
+        """Cursor for list_tasks(after_cursor=...) that resumes after task."""
+        return page_cursor(task)
+    
+    async def mark_completed(self, task_id: int) -> bool:
+        """Mark a task as completed (only if owned by current user)."""
+        return await self.update_task(task_id, status='Completed')
+    
+    async def complete_tasks(self, task_ids: Iterable[int]) -> Dict[int, bool]:
+        """Mark many tasks as completed; see update_tasks."""
+        return await self.update_tasks(task_ids, status='Completed')
+    
+    async def get_statistics(self) -> Dict[str, Any]:
+        """Get task statistics for current user."""
+        user_id = self._user_id()
+        if user_id is None:
+            return dict.fromkeys(STATISTICS_FIELDS, 0)
+        
+        today = date.today()
+        
+        if self.cache_statistics:
+            cached = self._tenants.get_statistics(user_id, today)
+            if cached is not None:
+                return cached
+        
+        writes = self._tenants.write_count(user_id)
+        try:
+            result = await self.db.fetch_one(STATISTICS_QUERY, (user_id,))
+            if not result:
+                raise RuntimeError("statistics query returned no result")
+            
+            stats = {key: int(result[key] or 0) for key in STATISTICS_FIELDS}
+            if self.cache_statistics and self._tenants.write_count(user_id) == writes:
+                self._tenants.put_statistics(user_id, today, stats)
+            return stats
+        
+        except Exception as e:
+            print(f"Error getting statistics from database: {e}")
+            return self._partition(user_id).statistics()
+    
+    def _invalidate_statistics(self, user_id: int) -> None:
+        """Note a write (dropping cached statistics), and re-measure the partition it changed."""
+        self._tenants.note_write(user_id)
+        self._tenants.resize(user_id)
+    
+    async def search_tasks(self, keyword: str, prefix: bool = False, fulltext: bool = False,
+                           limit: Optional[int] = None, offset: int = 0) -> List[Task]:
+        """Search tasks by keyword in title or description (see TaskManager.search_tasks)."""
+        user_id = self._user_id()
+        if user_id is None:
+            return []
+        
+        if fulltext:
+            return await self._search_fulltext(user_id, keyword, limit, offset)
+        
+        cache = await self._cache_for(user_id)
+        if is_warm(cache):
+            return paginate(cache.search(keyword, prefix=prefix), limit, offset)
+        
+        condition, match_params = keyword_condition(keyword, prefix)
+        query = f"SELECT * FROM tasks WHERE user_id = %s AND {condition} ORDER BY creation_timestamp DESC"
+        try:
+            results = await self.db.fetch_all(query, (user_id,) + match_params)
+            return paginate([Task.from_row(row) for row in results], limit, offset)
+        except Exception as e:
+            print(f"Error searching tasks: {e}")
+            return []
+    
+    async def search_hits(self, keyword: str, limit: Optional[int] = None, prefix: bool = False,
+                          fulltext: bool = False) -> List[SearchHit]:
+        """Ranked search results with highlighted excerpts (see TaskManager.search_hits)."""
+        user_id = self._user_id()
+        if user_id is None or not keyword:
+            return []
+        
+        if fulltext:
+            tasks = await self._search_fulltext(user_id, keyword, limit, 0)
+            return fulltext_hits(tasks, keyword)
+        
+        cache = await self._cache_for(user_id)
+        if is_warm(cache):
+            return rank_hits(cache.matches(keyword, prefix=prefix), keyword, limit)
+        
+        try:
+            results = await self.db.fetch_all(
+                *ranked_search_query(user_id, keyword, prefix, limit))
+        except Exception as e:
+            print(f"Error searching tasks: {e}")
+            return []
+        return hits_from_rows(results, keyword)
+    
+    async def _search_fulltext(self, user_id: int, keyword: str, limit: Optional[int],
+                               offset: int) -> List[Task]:
+        statement = fulltext_query(user_id, keyword, limit, offset)
+        if statement is None:
+            return []
+        try:
+            results = await self.db.fetch_all(*statement)
+            return [Task.from_row(task_data) for task_data in results]
+        except Exception as e:
+            print(f"Error searching tasks: {e}")
+            return []
+    
+    async def sync_tasks(self) -> None:
+        """Merge changes made by other processes into the cached tasks (see TaskManager.sync_tasks)."""
+        user_id = self._user_id()
+        if user_id is None or self.cache_limit <= 0:
+            return
+        cache = self._tenants.peek(user_id)
+        if not can_sync(cache):
+            return
+        if not await self._sync_tasks(user_id, cache):
+            self._tenants.discard(user_id, cache)
+    
+    async def refresh_tasks(self, incremental: bool = False) -> None:
+        """Reload the current user's tasks from database (see TaskManager.refresh_tasks)."""
+        user_id = self._user_id()
+        if user_id is None:
+            return
+        
+        self._invalidate_statistics(user_id)
+        if self.cache_limit <= 0:
+            return
+        if incremental:
+            cache = self._tenants.peek(user_id)
+            if can_sync(cache) and await self._sync_tasks(user_id, cache):
+                return
+        cache = TaskCache()
+        self._tenants.put(user_id, cache)
+        await self._load_tasks(user_id, cache)
\ No newline at end of file
@@ -1,13 +1,17 @@
 import hashlib
-import getpass
-from typing import Optional, Tuple
-from .database import DatabaseConnection
+import hmac
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
+from .config import AuthConfig
 from .utils import InputValidator
 
+if TYPE_CHECKING:
+    from .database import DatabaseConnection
+
 class AuthenticationManager:
     """Handles user authentication and registration."""
     
-    def __init__(self, db_connection: DatabaseConnection):
+    def __init__(self, db_connection: 'DatabaseConnection'):
         self.db = db_connection
         self.current_user: Optional[dict] = None
         self.validator = InputValidator()
@@ -22,6 +26,7 @@ class AuthenticationManager:
         print("-" * 30)
         
         try:
+            import getpass
             username = input("Username: ").strip()
             password = getpass.getpass("Password: ")
             confirm_password = getpass.getpass("Confirm Password: ")
@@ -62,9 +67,17 @@ class AuthenticationManager:
         print("-" * 30)
         
         try:
+            import getpass
             username = input("Username: ").strip()
             password = getpass.getpass("Password: ")
-            
+        except Exception as e:
+            print(f"❌ Login failed: {e}")
+            return False
+        return self.authenticate(username, password)
+    
+    def authenticate(self, username: str, password: str) -> bool:
+        """Authenticate user with the given credentials, without prompting."""
+        try:
             if not username or not password:
                 raise ValueError("Username and password are required")
             
@@ -88,6 +101,53 @@ class AuthenticationManager:
             print(f"❌ Login failed: {e}")
             return False
     
+    def issue_token(self, ttl_days: Optional[int] = None) -> str:
+        """Create an access token for the logged-in user.
+        
+        The token is "user_id.expiry.signature", signed with HMAC-SHA256
+        keyed by the user's password hash, so changing the password revokes
+        every token issued before.
+        """
+        if not self.current_user:
+            raise ValueError("Log in before requesting a token")
+        ttl_days = AuthConfig.TOKEN_TTL_DAYS if ttl_days is None else ttl_days
+        expires = int(time.time()) + ttl_days * 86400
+        payload = f"{self.current_user['user_id']}.{expires}"
+        return f"{payload}.{self._sign(payload, self.current_user['password_hash'])}"
+    
+    def login_with_token(self, token: str) -> bool:
+        """Authenticate with a token from issue_token."""
+        try:
+            self.current_user = self.verify_token(token)
+            return True
+        except Exception as e:
+            print(f"❌ Login failed: {e}")
+            return False
+    
+    def verify_token(self, token: str) -> dict:
+        """Return the user a token from issue_token belongs to, without logging in.
+        
+        Raises ValueError if the token is malformed, expired or not validly signed.
+        """
+        try:
+            user_id_str, expires_str, signature = token.strip().split('.')
+            user_id, expires = int(user_id_str), int(expires_str)
+        except ValueError:
+            raise ValueError("Malformed token")
+        if expires < time.time():
+            raise ValueError("Token has expired")
+        
+        query = "SELECT user_id, username, password_hash, email, created_at FROM users WHERE user_id = %s"
+        user = self.db.fetch_one(query, (user_id,))
+        if not user or not hmac.compare_digest(
+                signature, self._sign(f"{user_id}.{expires}", user['password_hash'])):
+            raise ValueError("Invalid token")
+        return user
+    
+    @staticmethod
+    def _sign(payload: str, password_hash: str) -> str:
+        return hmac.new(password_hash.encode(), payload.encode(), hashlib.sha256).hexdigest()
+    
     def logout(self) -> None:
         """Log out current user."""
         if self.current_user:
@@ -0,0 +1,452 @@
+import threading
+import time
+import weakref
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .config import CacheConfig
+from .models import Task, TaskBatch
+from .search import SearchIndex
+
+# Rough memory cost of one cached task besides its text: the slotted Task,
+# its index and sorted-view entries and its search index postings
+TASK_OVERHEAD_BYTES = 1024
+
+def view_key(task: Task) -> Tuple[Any, ...]:
+    """Full ordering key; the task ID makes every key unique within a user's tasks."""
+    return task.sort_key + (task.task_id or 0,)
+
+def page_cursor(task: Task) -> str:
+    """Opaque keyset cursor pointing just past task in list order."""
+    rank, _, due, task_id = view_key(task)
+    due_str = '' if task.due_date is None else due.isoformat()
+    return f"{-rank}|{due_str}|{task_id}"
+
+def estimated_size(task: Task) -> int:
+    """Approximate bytes a cached task takes; text is counted twice for the search index."""
+    return TASK_OVERHEAD_BYTES + 2 * (len(task.title) + len(task.description or ''))
+
+def parse_cursor(cursor: str) -> Tuple[Any, ...]:
+    """Turn a cursor from page_cursor back into the view key it encodes."""
+    try:
+        rank, due_str, task_id = cursor.split('|')
+        due = date.fromisoformat(due_str) if due_str else None
+        return (-int(rank), due is None, due or date.max, int(task_id))
+    except ValueError:
+        raise ValueError(f"Invalid page cursor: {cursor!r}")
+
+class TaskCache:
+    """In-memory copy of one user's tasks.
+    
+    Keeps a task_id index in insertion order (oldest first), a view that
+    stays sorted by priority and due date, a keyword search index and a
+    TaskBatch of the counted columns, so lookups are O(1), listing needs no
+    sort, search needs no scan and statistics need no pass over Task objects.
+    Not thread-safe: TaskManager guards it with its lock.
+    """
+    
+    def __init__(self):
+        self._index: Dict[int, Task] = {}
+        self._sorted_keys: List[Tuple[Any, ...]] = []
+        self._sorted_tasks: List[Task] = []
+        # Key each task was filed under in the sorted view, needed to find it
+        # again after its priority or due date changed
+        self._view_keys: Dict[int, Tuple[Any, ...]] = {}
+        self.search_index = SearchIndex()
+        self.columns = TaskBatch()
+        # False until load() runs, so callers can tell an empty account from a cold cache
+        self.loaded = False
+        # False when load() only received part of the account (see TaskManager.cache_limit)
+        self.complete = False
+        # Sum of estimated_size over the cached tasks, kept up to date by every change
+        self.size = 0
+        # Latest updated_at (or deleted_at) seen by load() and merge(); None when unknown
+        self.watermark: Optional[datetime] = None
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._index
+    
+    def clear(self) -> None:
+        """Drop every cached task."""
+        self._index.clear()
+        self._sorted_keys.clear()
+        self._sorted_tasks.clear()
+        self._view_keys.clear()
+        self.search_index.clear()
+        self.columns.clear()
+        self.loaded = False
+        self.complete = False
+        self.size = 0
+        self.watermark = None
+    
+    def load(self, tasks: Iterable[Task], complete: bool = True,
+             watermark: Optional[datetime] = None) -> None:
+        """Replace the cache contents; tasks are given oldest first."""
+        self.clear()
+        for task in tasks:
+            self._index[task.task_id] = task
+        self.size = sum(estimated_size(task) for task in self._index.values())
+        
+        keyed = sorted((view_key(task), task) for task in self._index.values())
+        self._sorted_keys = [key for key, _ in keyed]
+        self._sorted_tasks = [task for _, task in keyed]
+        self._view_keys = {task.task_id: key for key, task in keyed}
+        self.search_index.build(self._index.values())
+        self.columns = TaskBatch.from_tasks(self._index.values())
+        self.loaded = True
+        self.complete = complete
+        self.watermark = watermark
+    
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._index.get(task_id)
+    
+    def add(self, task: Task) -> None:
+        """Cache a task as the newest one (replacing any stale copy)."""
+        if task.task_id in self._index:
+            self.remove(task.task_id)
+        self._index[task.task_id] = task
+        self._insert_sorted(task)
+        self.search_index.add(task)
+        self.columns.put(task)
+        self.size += estimated_size(task)
+    
+    def add_many(self, tasks: List[Task]) -> None:
+        """Cache several new tasks, re-sorting the view once instead of per task."""
+        for task in tasks:
+            if task.task_id in self._index:
+                self.remove(task.task_id)
+        
+        for task in tasks:
+            self._index[task.task_id] = task
+            self.search_index.add(task)
+            self.columns.put(task)
+            self.size += estimated_size(task)
+        
+        # Both inputs are sorted runs, which Timsort merges in linear time
+        keyed = list(zip(self._sorted_keys, self._sorted_tasks))
+        keyed.extend(sorted((view_key(task), task) for task in tasks))
+        keyed.sort(key=lambda item: item[0])
+        self._sorted_keys = [key for key, _ in keyed]
+        self._sorted_tasks = [task for _, task in keyed]
+        self._view_keys.update((task.task_id, view_key(task)) for task in tasks)
+    
+    def replace(self, task: Task) -> None:
+        """Swap in a fresh copy of a cached task, keeping its place in insertion order."""
+        old = self._index.get(task.task_id)
+        if old is None:
+            self.add(task)
+            return
+        
+        self._remove_sorted(task.task_id)
+        self._index[task.task_id] = task
+        self._insert_sorted(task)
+        self.search_index.add(task)
+        self.columns.put(task)
+        self.size += estimated_size(task) - estimated_size(old)
+    
+    def merge(self, tasks: Iterable[Task], deleted_ids: Iterable[int],
+              watermark: Optional[datetime]) -> None:
+        """Apply the rows changed and the tasks deleted since the last sync.
+        
+        Changed tasks replace their cached copies, unknown ones are added as
+        the newest, and the watermark only ever moves forward.
+        """
+        for task_id in deleted_ids:
+            self.remove(task_id)
+        
+        new = []
+        for task in tasks:
+            if task.task_id in self._index:
+                self.replace(task)
+            else:
+                new.append(task)
+        if new:
+            self.add_many(sorted(new, key=lambda task: task.task_id))
+        
+        if watermark is not None and (self.watermark is None or watermark > self.watermark):
+            self.watermark = watermark
+    
+    def remove(self, task_id: int) -> Optional[Task]:
+        """Drop a task from the cache and return it, if it was cached."""
+        task = self._index.pop(task_id, None)
+        if task is not None:
+            self._remove_sorted(task_id)
+            self.search_index.remove(task_id)
+            self.columns.remove(task_id)
+            self.size -= estimated_size(task)
+        return task
+    
+    def update(self, task_id: int, fields: Dict[str, Any]) -> Optional[Task]:
+        """Apply field updates to a cached task and reposition it in the sorted view."""
+        task = self._index.get(task_id)
+        if task is None:
+            return None
+        
+        self._remove_sorted(task_id)
+        self.size -= estimated_size(task)
+        try:
+            for field, value in fields.items():
+                setattr(task, field, value)
+        finally:
+            self._insert_sorted(task)
+            self.columns.put(task)
+            self.size += estimated_size(task)
+            if 'title' in fields or 'description' in fields:
+                self.search_index.add(task)
+        return task
+    
+    def statistics(self) -> Dict[str, Any]:
+        """Counters of TaskManager.get_statistics over the cached tasks."""
+        return self.columns.statistics()
+    
+    def search(self, keyword: str, prefix: bool = False) -> List[Task]:
+        """Cached tasks matching keyword as a substring (or word prefix), newest first."""
+        tasks = self.matches(keyword, prefix=prefix)
+        tasks.sort(key=lambda task: task.creation_timestamp, reverse=True)
+        return tasks
+    
+    def matches(self, keyword: str, prefix: bool = False) -> List[Task]:
+        """Cached tasks matching keyword, in no particular order."""
+        if prefix:
+            task_ids = self.search_index.search_prefix(keyword)
+        else:
+            task_ids = self.search_index.search(keyword)
+        return [self._index[task_id] for task_id in task_ids]
+    
+    def sorted_page(self, after: Optional[Tuple[Any, ...]] = None, limit: Optional[int] = None,
+                    predicate: Optional[Callable[[Task], bool]] = None) -> List[Task]:
+        """Up to limit tasks in list order that come after the view key after."""
+        start = 0 if after is None else bisect_right(self._sorted_keys, after)
+        if predicate is None:
+            end = None if limit is None else start + limit
+            return self._sorted_tasks[start:end]
+        
+        page = []
+        for position in range(start, len(self._sorted_tasks)):
+            task = self._sorted_tasks[position]
+            if predicate(task):
+                page.append(task)
+                if limit is not None and len(page) >= limit:
+                    break
+        return page
+    
+    def values(self) -> List[Task]:
+        """Cached tasks in insertion order."""
+        return list(self._index.values())
+    
+    def _insert_sorted(self, task: Task) -> None:
+        key = view_key(task)
+        position = bisect_left(self._sorted_keys, key)
+        self._sorted_keys.insert(position, key)
+        self._sorted_tasks.insert(position, task)
+        self._view_keys[task.task_id] = key
+    
+    def _remove_sorted(self, task_id: int) -> None:
+        key = self._view_keys.pop(task_id)
+        position = bisect_left(self._sorted_keys, key)
+        del self._sorted_keys[position]
+        del self._sorted_tasks[position]
+
+class TenantCache:
+    """Process-wide TaskCaches of many users (tenants), keyed by user_id.
+    
+    Kept in least recently used order: once more than max_users are resident,
+    or their estimated size passes memory_budget bytes, the least recently
+    used users are evicted (the most recently used one always stays). A
+    user's tasks expire ttl seconds after they were loaded, so changes made
+    by other processes are picked up; ttl 0 never expires them. Counts hits,
+    misses, evictions and expirations (see stats). Thread-safe; managers
+    sharing it also share its lock, which guards the TaskCaches themselves.
+    
+    Managers also record their writes here (note_write), so a load run by
+    one manager notices a write made by another while it was in flight,
+    and keep their cached statistics here, so those writes clear them.
+    """
+    
+    # One per database connection, so every TaskManager on it reuses the same tenants
+    _shared: 'weakref.WeakKeyDictionary[Any, TenantCache]' = weakref.WeakKeyDictionary()
+    _shared_lock = threading.Lock()
+    
+    def __init__(self, max_users: Optional[int] = None, memory_budget: Optional[int] = None,
+                 ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.max_users = CacheConfig.TENANT_CACHE_MAX_USERS if max_users is None else max_users
+        self.memory_budget = (CacheConfig.TENANT_CACHE_MEMORY_MB * 1024 * 1024
+                              if memory_budget is None else memory_budget)
+        self.ttl = CacheConfig.TENANT_CACHE_TTL if ttl is None else ttl
+        self.lock = threading.RLock()
+        self._clock = clock
+        # user_id -> (cache, load time), least recently used first
+        self._tenants: 'OrderedDict[int, Tuple[TaskCache, float]]' = OrderedDict()
+        self._size = 0
+        self._sizes: Dict[int, int] = {}
+        # user_id -> writes noted so far; never reset, as loads compare counts
+        self._writes: Dict[int, int] = {}
+        # user_id -> (date computed, statistics)
+        self._statistics: Dict[int, Tuple[date, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    @classmethod
+    def shared(cls, owner: Any) -> 'TenantCache':
+        """The process-wide TenantCache for owner (a database connection)."""
+        with cls._shared_lock:
+            tenants = cls._shared.get(owner)
+            if tenants is None:
+                tenants = cls._shared[owner] = cls()
+            return tenants
+    
+    def __len__(self) -> int:
+        return len(self._tenants)
+    
+    def __contains__(self, user_id: int) -> bool:
+        return user_id in self._tenants
+    
+    def get(self, user_id: int) -> Optional[TaskCache]:
+        """The user's cache, marked most recently used; None (a miss) if absent or expired."""
+        with self.lock:
+            entry = self._tenants.get(user_id)
+            if entry is not None and self.ttl > 0 and self._clock() - entry[1] >= self.ttl:
+                self._discard(user_id)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._tenants.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+    
+    def peek(self, user_id: int) -> Optional[TaskCache]:
+        """The user's cache if resident, without counting a hit or changing the LRU order."""
+        with self.lock:
+            entry = self._tenants.get(user_id)
+            return entry[0] if entry is not None else None
+    
+    def put(self, user_id: int, cache: TaskCache) -> None:
+        """Make cache the user's (newly loaded) cache, evicting others if over the limits."""
+        with self.lock:
+            self._discard(user_id)
+            self._tenants[user_id] = (cache, self._clock())
+            self.resize(user_id)
+    
+    def resize(self, user_id: int) -> None:
+        """Re-measure the user's cache after it changed, evicting others if over the limits."""
+        with self.lock:
+            entry = self._tenants.get(user_id)
+            if entry is None:
+                return
+            self._size += entry[0].size - self._sizes.get(user_id, 0)
+            self._sizes[user_id] = entry[0].size
+            self._tenants.move_to_end(user_id)
+            while len(self._tenants) > 1 and (len(self._tenants) > self.max_users
+                                               or self._size > self.memory_budget):
+                self._discard(next(iter(self._tenants)))
+                self.evictions += 1
+    
+    def renew(self, user_id: int) -> None:
+        """Restart the user's TTL, e.g. after their cache was synced with the database."""
+        with self.lock:
+            entry = self._tenants.get(user_id)
+            if entry is not None:
+                self._tenants[user_id] = (entry[0], self._clock())
+    
+    def write_count(self, user_id: int) -> int:
+        """Writes noted for the user; a load that saw it change may have missed one."""
+        with self.lock:
+            return self._writes.get(user_id, 0)
+    
+    def note_write(self, user_id: int) -> None:
+        """Record a write to the user's tasks, dropping their cached statistics."""
+        with self.lock:
+            self._writes[user_id] = self._writes.get(user_id, 0) + 1
+            self._statistics.pop(user_id, None)
+    
+    def drop_statistics(self, user_id: int) -> None:
+        with self.lock:
+            self._statistics.pop(user_id, None)
+    
+    def get_statistics(self, user_id: int, today: date) -> Optional[Dict[str, Any]]:
+        """The user's cached statistics if computed today (overdue counts change at midnight)."""
+        with self.lock:
+            entry = self._statistics.get(user_id)
+            return dict(entry[1]) if entry is not None and entry[0] == today else None
+    
+    def put_statistics(self, user_id: int, today: date, statistics: Dict[str, Any]) -> None:
+        with self.lock:
+            self._statistics[user_id] = (today, dict(statistics))
+    
+    def discard(self, user_id: int, cache: Optional[TaskCache] = None) -> None:
+        """Drop the user's cache, if resident (and, when cache is given, still that one)."""
+        with self.lock:
+            entry = self._tenants.get(user_id)
+            if entry is not None and (cache is None or entry[0] is cache):
+                self._discard(user_id)
+    
+    def clear(self) -> None:
+        """Drop every user's cache (metrics are kept)."""
+        with self.lock:
+            self._tenants.clear()
+            self._statistics.clear()
+            self._sizes.clear()
+            self._size = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Resident users, their estimated bytes, and hit/miss/eviction counters."""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'users': len(self._tenants), 'bytes': self._size,
+                'hits': self.hits, 'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions, 'expirations': self.expirations,
+            }
+    
+    def _discard(self, user_id: int) -> None:
+        self._statistics.pop(user_id, None)
+        if self._tenants.pop(user_id, None) is not None:
+            self._size -= self._sizes.pop(user_id, 0)
+
+def is_warm(cache: TaskCache) -> bool:
+    """Whether the partition holds every task of the account."""
+    return cache.loaded and cache.complete
+
+def can_sync(cache: Optional[TaskCache]) -> bool:
+    """Whether an incremental sync can bring the partition up to date.
+    
+    It must hold the whole account and have a watermark recent enough
+    that the tombstones since then have not been purged.
+    """
+    if cache is None or not is_warm(cache) or cache.watermark is None:
+        return False
+    retention = timedelta(hours=CacheConfig.TASK_TOMBSTONE_RETENTION_HOURS)
+    return cache.watermark > datetime.now() - retention
+
+def sync_since(cache: TaskCache) -> datetime:
+    """Start of the window an incremental sync reads, a little before the watermark."""
+    return cache.watermark - timedelta(seconds=CacheConfig.TASK_SYNC_OVERLAP_SECONDS)
+
+def latest_value(current: Optional[datetime], rows: Iterable[Dict[str, Any]],
+                 column: str) -> Optional[datetime]:
+    """The latest of current and the column's non-null values in rows."""
+    for row in rows:
+        value = row.get(column)
+        if value is not None and (current is None or value > current):
+            current = value
+    return current
+
+def merge_changes(cache: TaskCache, rows: List[Dict[str, Any]],
+                  tombstones: List[Dict[str, Any]], cache_limit: int) -> None:
+    """Merge changed rows and tombstones into a partition and advance its watermark."""
+    watermark = latest_value(latest_value(cache.watermark, rows, 'updated_at'),
+                             tombstones, 'deleted_at')
+    cache.merge([Task.from_row(row) for row in rows],
+                [row['task_id'] for row in tombstones], watermark)
+    if len(cache) > cache_limit:
+        # Past the cache limit the account is served from MySQL instead
+        cache.complete = False
\ No newline at end of file
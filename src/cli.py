@@ -1,12 +1,17 @@
 import cmd
 import sys
+from contextlib import ExitStack
 from datetime import date
-from typing import Dict, Any, Optional
-from .task_manager import TaskManager
-from .database import DatabaseConnection
-from .auth import AuthenticationManager
+from itertools import chain
+from typing import TYPE_CHECKING, IO, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from .renderer import TaskRenderer
 from .utils import InputValidator, DateUtils
 
+if TYPE_CHECKING:
+    from .task_manager import TaskManager
+    from .auth import AuthenticationManager
+    from .models import Task
+
 class TaskManagerCLI(cmd.Cmd):
     """Command-line interface for the Multi-User Task Management application."""
     
@@ -20,7 +25,12 @@ Type 'help' for available commands or 'menu' to see the main menu.
 """
     prompt = 'task_manager> '
     
-    def __init__(self, task_manager: TaskManager, auth_manager: AuthenticationManager):
+    # Commands that write tasks; consecutive ones in a script share a transaction
+    MUTATING_COMMANDS = frozenset({'add', 'update', 'complete', 'delete'})
+    # Tasks fetched per query while list output is fed to a pager
+    PAGER_FETCH_SIZE = 200
+    
+    def __init__(self, task_manager: 'TaskManager', auth_manager: 'AuthenticationManager'):
         super().__init__()
         self.task_manager = task_manager
         self.auth = auth_manager
@@ -46,7 +56,7 @@ Type 'help' for available commands or 'menu' to see the main menu.
             
             if choice == '1':
                 if self.auth.login():
-                    self.task_manager._load_tasks()  # Load user's tasks
+                    self.task_manager.warm_up()  # Load user's tasks unless still cached
                     self.prompt = f'task_manager({self.auth.current_user["username"]})> '
                     self.display_statistics()
                     break
@@ -130,8 +140,8 @@ Type 'help' for available commands or 'menu' to see the main menu.
             return
             
         username = self.auth.current_user['username']
+        # The user's cached tasks stay resident for their next login
         self.auth.logout()
-        self.task_manager._load_tasks()  # Clear tasks from memory
         self.prompt = 'task_manager> '
         print(f"✅ Logged out successfully. Goodbye, {username}!")
         self.show_auth_menu()
@@ -174,10 +184,16 @@ Type 'help' for available commands or 'menu' to see the main menu.
     def do_list(self, arg: str) -> None:
         """List tasks with optional filtering.
         Usage: list [status=STATUS] [priority=PRIORITY] [due_date=DATE]
+                    [due_before=DATE] [due_after=DATE] [--page-size N]
+                    [--limit N] [--format full|table|json|ndjson] [--pager]
         Examples:
           list
           list status=Completed
           list priority=High status=Pending
+          list due_before=2025-01-01 status=Pending
+          list --page-size 20
+          list --format table --limit 50
+        --page-size prompts between pages, so it only works with full and table.
         """
         if not self.auth.is_authenticated():
             print("❌ Please log in to list tasks")
@@ -185,41 +201,156 @@ Type 'help' for available commands or 'menu' to see the main menu.
             return
             
         try:
-            filters = self._parse_filters(arg)
-            tasks = self.task_manager.list_tasks(filters)
+            filter_str, options = self._parse_list_options(arg)
+            filters = self._parse_filters(filter_str)
+            renderer = TaskRenderer(options['format'])
+            if options['page_size'] and renderer.is_machine_readable:
+                raise ValueError(f"--page-size cannot be used with --format {renderer.fmt}")
+            
+            if options['pager'] and sys.stdout.isatty():
+                self._list_through_pager(filters, options, renderer)
+                return
+            if options['page_size']:
+                self._list_in_pages(filters, options['page_size'], renderer)
+                return
             
-            if not tasks:
+            tasks = self.task_manager.list_tasks(filters, limit=options['limit'])
+            
+            if not tasks and not renderer.is_machine_readable:
                 print("📭 No tasks found.")
                 return
             
             user = self.auth.current_user['username']
-            print(f"\n📋 TASK LIST for {user} ({len(tasks)} tasks)")
-            print("="*80)
-            
-            for i, task in enumerate(tasks, 1):
-                status_icon = "✅" if task.status == "Completed" else "🔄" if task.status == "In Progress" else "⏳"
-                priority_icon = "⚡" if task.priority_level == "High" else "🔶" if task.priority_level == "Medium" else "🔷"
-                due_info = f"Due: {self.date_utils.format_date(task.due_date)}"
-                days_left = self.date_utils.days_until_due(task.due_date)
-                
-                if days_left is not None:
-                    if days_left < 0:
-                        due_info += " 📅 OVERDUE!"
-                    elif days_left == 0:
-                        due_info += " 📅 Due today!"
-                    elif days_left <= 3:
-                        due_info += f" 📅 {days_left} days left!"
-                
-                print(f"{i:2d}. {status_icon} {priority_icon} {task.title}")
-                print(f"     ID: {task.task_id} | Status: {task.status} | Priority: {task.priority_level}")
-                print(f"     {due_info}")
-                if task.description:
-                    print(f"     Description: {task.description[:100]}{'...' if len(task.description) > 100 else ''}")
-                print("-" * 80)
+            self._emit(self._list_header(renderer, f"📋 TASK LIST for {user} ({len(tasks)} tasks)")
+                       + renderer.render(tasks), options['pager'])
                 
+        except ValueError as e:
+            print(f"❌ {e}")
         except Exception as e:
             print(f"❌ Error listing tasks: {e}")
     
+    def _task_pages(self, filters: Dict[str, Any], page_size: int,
+                    limit: Optional[int] = None) -> Iterator[List['Task']]:
+        """Yield up to limit tasks page_size at a time, querying each page only when it is asked for."""
+        cursor = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            tasks = self.task_manager.list_tasks(filters, limit=size, after_cursor=cursor)
+            if tasks:
+                yield tasks
+            if len(tasks) < size:
+                return
+            if remaining is not None:
+                remaining -= len(tasks)
+            cursor = self.task_manager.page_cursor(tasks[-1])
+    
+    def _list_in_pages(self, filters: Dict[str, Any], page_size: int, renderer: TaskRenderer) -> None:
+        """Print tasks one page at a time, fetching and formatting each page only when asked for."""
+        user = self.auth.current_user['username']
+        shown = 0
+        
+        for tasks in self._task_pages(filters, page_size):
+            if shown:
+                more = input(f"-- {shown} tasks shown. Press Enter for more, 'q' to stop: ").strip().lower()
+                if more in ('q', 'quit'):
+                    return
+            header = "" if shown else self._list_header(renderer, f"📋 TASK LIST for {user}")
+            self._emit(header + renderer.render(tasks, start=shown + 1))
+            shown += len(tasks)
+        
+        if not shown:
+            print("📭 No tasks found.")
+    
+    def _list_through_pager(self, filters: Dict[str, Any], options: Dict[str, Any],
+                            renderer: TaskRenderer) -> None:
+        """Feed the list to the pager page by page, so only what it has read gets fetched and formatted."""
+        pages = self._task_pages(filters, options['page_size'] or self.PAGER_FETCH_SIZE, options['limit'])
+        first = next(pages, None)
+        if first is None and not renderer.is_machine_readable:
+            print("📭 No tasks found.")
+            return
+        
+        user = self.auth.current_user['username']
+        header = self._list_header(renderer, f"📋 TASK LIST for {user}")
+        rest = chain([first], pages) if first is not None else iter(())
+        self._emit_stream(chain([header], renderer.render_stream(rest)), pager=True)
+    
+    @staticmethod
+    def _list_header(renderer: TaskRenderer, title: str) -> str:
+        """Heading printed above a task list in the given format."""
+        if renderer.fmt == 'full':
+            return f"\n{title}\n{'=' * 80}\n"
+        if renderer.fmt == 'table':
+            return renderer.table_header()
+        return ""
+    
+    @classmethod
+    def _emit(cls, text: str, pager: bool = False) -> None:
+        """Write a whole rendered block at once, through a pager if asked and interactive."""
+        cls._emit_stream([text], pager)
+    
+    @staticmethod
+    def _emit_stream(chunks: Iterable[str], pager: bool = False) -> None:
+        """Write rendered chunks as they are produced, through $PAGER if asked and interactive.
+        
+        The pager reads from a pipe, so once the pipe is full the next chunk
+        is not produced until the user scrolls, and not at all if they quit.
+        """
+        if not (pager and sys.stdout.isatty()):
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+        
+        import os
+        import shlex
+        import subprocess
+        try:
+            process = subprocess.Popen(shlex.split(os.environ.get('PAGER') or 'less'),
+                                       stdin=subprocess.PIPE, text=True, encoding='utf-8')
+        except OSError:
+            for chunk in chunks:
+                sys.stdout.write(chunk)
+            return
+        try:
+            for chunk in chunks:
+                process.stdin.write(chunk)
+            process.stdin.close()
+        except BrokenPipeError:
+            # The user quit the pager before the end
+            pass
+        process.wait()
+    
+    def _parse_list_options(self, arg: str, paged: bool = True) -> Tuple[str, Dict[str, Any]]:
+        """Split --page-size N, --limit N, --format F and --pager off an argument string.
+        
+        With paged=False (commands that cannot page) --page-size is an error.
+        """
+        options: Dict[str, Any] = {'page_size': None, 'limit': None, 'format': 'full', 'pager': False}
+        remaining = []
+        parts = arg.split()
+        i = 0
+        while i < len(parts):
+            name, has_value, value = parts[i].partition('=')
+            if name == '--pager' and not has_value:
+                options['pager'] = True
+            elif name in ('--page-size', '--limit', '--format'):
+                if name == '--page-size' and not paged:
+                    raise ValueError("--page-size is not supported here; use --limit or --pager")
+                if not has_value:
+                    i += 1
+                    value = parts[i] if i < len(parts) else ''
+                if name == '--format':
+                    if value not in TaskRenderer.FORMATS:
+                        raise ValueError(f"--format must be one of: {', '.join(TaskRenderer.FORMATS)}")
+                    options['format'] = value
+                else:
+                    options[name[2:].replace('-', '_')] = self.validator.validate_positive_int(value, name)
+            else:
+                remaining.append(parts[i])
+            i += 1
+        return " ".join(remaining), options
+    
     def _parse_filters(self, filter_str: str) -> Dict[str, Any]:
         """Parse filter string into dictionary."""
         filters = {}
@@ -239,6 +370,8 @@ Type 'help' for available commands or 'menu' to see the main menu.
                         filters['priority'] = self.validator.validate_priority(value)
                     elif key == 'due_date':
                         filters['due_date'] = self.validator.validate_date(value)
+                    elif key in ('due_before', 'due_after'):
+                        filters[key] = self.validator.validate_filter_date(value)
         except ValueError as e:
             print(f"⚠️  Filter warning: {e}")
         
@@ -304,8 +437,9 @@ Type 'help' for available commands or 'menu' to see the main menu.
             print(f"❌ Error updating task: {e}")
     
     def do_complete(self, arg: str) -> None:
-        """Mark a task as completed.
+        """Mark one or more tasks as completed.
         Usage: complete TASK_ID
+               complete 12,13,40-55
         """
         if not self.auth.is_authenticated():
             print("❌ Please log in to complete tasks")
@@ -314,10 +448,17 @@ Type 'help' for available commands or 'menu' to see the main menu.
             
         try:
             if not arg:
-                task_id_str = input("Enter task ID to mark as completed: ").strip()
+                task_id_str = input("Enter task ID(s) to mark as completed: ").strip()
             else:
                 task_id_str = arg.strip()
             
+            if ',' in task_id_str or '-' in task_id_str:
+                task_ids = self.validator.validate_task_ids(task_id_str)
+                outcomes = self.task_manager.complete_tasks(task_ids)
+                completed = sum(outcomes.values())
+                print(f"✅ {completed} of {len(task_ids)} task(s) marked as completed")
+                return
+            
             task_id = self.validator.validate_task_id(task_id_str)
             
             if self.task_manager.mark_completed(task_id):
@@ -381,7 +522,7 @@ Type 'help' for available commands or 'menu' to see the main menu.
     
     def do_search(self, arg: str) -> None:
         """Search tasks by keyword in title or description.
-        Usage: search KEYWORD
+        Usage: search KEYWORD [--limit N] [--format full|table|json|ndjson] [--pager]
         """
         if not self.auth.is_authenticated():
             print("❌ Please log in to search tasks")
@@ -389,43 +530,28 @@ Type 'help' for available commands or 'menu' to see the main menu.
             return
             
         try:
-            if not arg:
+            keyword, options = self._parse_list_options(arg, paged=False)
+            if not keyword:
                 keyword = input("Enter search keyword: ").strip()
-            else:
-                keyword = arg.strip()
             
             if not keyword:
                 print("❌ Please provide a search keyword.")
                 return
             
-            tasks = self.task_manager.list_tasks()
-            matching_tasks = []
-            
-            for task in tasks:
-                if (keyword.lower() in task.title.lower() or 
-                    keyword.lower() in task.description.lower()):
-                    matching_tasks.append(task)
+            renderer = TaskRenderer(options['format'])
+            hits = self.task_manager.search_hits(keyword, limit=options['limit'])
             
-            if not matching_tasks:
+            if not hits and not renderer.is_machine_readable:
                 print(f"🔍 No tasks found matching '{keyword}'.")
                 return
             
             user = self.auth.current_user['username']
-            print(f"\n🔍 SEARCH RESULTS for '{keyword}' ({len(matching_tasks)} tasks for {user})")
-            print("="*80)
-            
-            for i, task in enumerate(matching_tasks, 1):
-                status_icon = "✅" if task.status == "Completed" else "🔄" if task.status == "In Progress" else "⏳"
-                print(f"{i:2d}. {status_icon} {task.title} (ID: {task.task_id})")
-                if task.description:
-                    desc_lower = task.description.lower()
-                    keyword_lower = keyword.lower()
-                    if keyword_lower in desc_lower:
-                        start = desc_lower.find(keyword_lower)
-                        excerpt = task.description[max(0, start-20):start+50]
-                        print(f"     ...{excerpt}...")
-                print("-" * 80)
+            title = f"🔍 SEARCH RESULTS for '{keyword}' ({len(hits)} tasks for {user})"
+            self._emit(self._list_header(renderer, title) + renderer.render_search(hits),
+                       options['pager'])
                 
+        except ValueError as e:
+            print(f"❌ {e}")
         except Exception as e:
             print(f"❌ Error searching tasks: {e}")
     
@@ -475,6 +601,55 @@ Type 'help' for available commands or 'menu' to see the main menu.
             print("\n👋 Goodbye!")
         return True
     
+    def run_script(self, script: IO[str]) -> None:
+        """Run commands from script, one per line, in this session.
+        
+        Prompts of a command (such as add) read their answers from the lines
+        that follow it. Blank lines and lines starting with '#' are skipped.
+        Each run of consecutive mutating commands is executed in a single
+        database transaction; if it fails to commit, or a bulk command in it
+        failed part way, its changes are rolled back and the task cache is
+        reloaded.
+        """
+        saved_stdin = sys.stdin
+        sys.stdin = script
+        transaction: Optional[ExitStack] = None
+        try:
+            for line in iter(script.readline, ''):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                
+                command = self.parseline(line)[0]
+                if command in self.MUTATING_COMMANDS:
+                    if transaction is None:
+                        transaction = ExitStack()
+                        transaction.enter_context(self.task_manager.db.transaction())
+                elif transaction is not None:
+                    self._finish_transaction(transaction)
+                    transaction = None
+                
+                if self.onecmd(line):
+                    break
+        except BaseException:
+            if transaction is not None:
+                transaction.__exit__(*sys.exc_info())
+                transaction = None
+                self.task_manager.refresh_tasks()
+            raise
+        finally:
+            sys.stdin = saved_stdin
+            if transaction is not None:
+                self._finish_transaction(transaction)
+    
+    def _finish_transaction(self, transaction: ExitStack) -> None:
+        """Commit a script transaction, resyncing the cache if it rolled back."""
+        try:
+            transaction.close()
+        except Exception as e:
+            print(f"❌ Transaction failed, changes rolled back: {e}")
+            self.task_manager.refresh_tasks()
+    
     def emptyline(self) -> None:
         """Do nothing when empty line is entered."""
         pass
@@ -484,8 +659,22 @@ Type 'help' for available commands or 'menu' to see the main menu.
         print(f"❌ Unknown command: {line}")
         print("Type 'help' for available commands or 'menu' for the main menu.")
 
-def main():
-    """Main entry point for the CLI application."""
+def main(argv: Optional[List[str]] = None):
+    """Main entry point for the CLI application.
+    
+    With command-line arguments (e.g. "list --json") a single command is
+    run by src.commands instead of starting the interactive shell.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        from .commands import main as run_command
+        run_command(argv)
+        return
+    
+    from .database import DatabaseConnection
+    from .auth import AuthenticationManager
+    from .task_manager import TaskManager
+    
     try:
         # Initialize database connection
         db = DatabaseConnection()
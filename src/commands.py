@@ -0,0 +1,397 @@
+import argparse
+import json
+import sys
+from contextlib import redirect_stdout
+from typing import Any, Callable, Dict, IO, List, Optional, Tuple
+from . import __version__
+from .config import AuthConfig, DatabaseConfig
+from .utils import InputValidator
+
+# The database layer is imported by the handlers that need it, so "--help",
+# "--version" and usage errors return without loading pymysql, and the
+# database is only connected once the arguments are known to be valid.
+# tests/test_startup.py holds this module to an import-time budget.
+
+STATUSES = ('Pending', 'In Progress', 'Completed')
+PRIORITIES = ('Low', 'Medium', 'High')
+TRANSFER_FORMATS = ('jsonl', 'csv')
+
+def _checked(validator: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Adapt an InputValidator method for argparse, keeping its error message."""
+    def convert(value: str) -> Any:
+        try:
+            return validator(value)
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(str(e))
+    return convert
+
+def _title(value: str) -> str:
+    return InputValidator.validate_string(value, "Title")
+
+def _positive(name: str, allow_zero: bool = False) -> Callable[[str], int]:
+    return _checked(lambda value: InputValidator.validate_positive_int(value, name, allow_zero))
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='task-manager',
+        description="Multi-user task manager. Run without a command for the interactive shell.",
+        epilog="Commands authenticate with --token or TASK_MANAGER_TOKEN, else with "
+               "TASK_MANAGER_USERNAME and TASK_MANAGER_PASSWORD, else by prompting."
+    )
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    parser.add_argument('--token', help="Access token from 'task-manager token'")
+    parser.add_argument('--username', help="Log in as this user (password from TASK_MANAGER_PASSWORD)")
+    parser.add_argument('--script', metavar='FILE',
+                        help="Run interactive-shell commands from FILE ('-' for standard input) "
+                             "in one session")
+    subparsers = parser.add_subparsers(dest='command')
+    
+    list_parser = subparsers.add_parser('list', help="List tasks by priority and due date")
+    list_parser.add_argument('--status', choices=STATUSES)
+    list_parser.add_argument('--priority', choices=PRIORITIES)
+    list_parser.add_argument('--due-before', type=_checked(InputValidator.validate_filter_date))
+    list_parser.add_argument('--due-after', type=_checked(InputValidator.validate_filter_date))
+    list_parser.add_argument('--limit', type=_positive('--limit'),
+                             help="Show at most this many tasks")
+    list_parser.add_argument('--after', help="Page cursor printed by a previous --limit run")
+    list_parser.add_argument('--json', action='store_true', help="Print a JSON array")
+    
+    add_parser = subparsers.add_parser('add', help="Add a task and print its ID")
+    add_parser.add_argument('--title', required=True, type=_checked(_title))
+    add_parser.add_argument('--description', default='')
+    add_parser.add_argument('--due', type=_checked(InputValidator.validate_date),
+                            help="Due date (YYYY-MM-DD)")
+    add_parser.add_argument('--priority', choices=PRIORITIES, default='Medium')
+    add_parser.add_argument('--json', action='store_true', help="Print the new task as JSON")
+    
+    update_parser = subparsers.add_parser('update', help="Change fields of a task")
+    update_parser.add_argument('task_id', type=_checked(InputValidator.validate_task_id))
+    update_parser.add_argument('--title', type=_checked(_title))
+    update_parser.add_argument('--description')
+    update_parser.add_argument('--due', type=_checked(InputValidator.validate_date))
+    update_parser.add_argument('--priority', choices=PRIORITIES)
+    update_parser.add_argument('--status', choices=STATUSES)
+    
+    complete_parser = subparsers.add_parser('complete', help="Mark tasks as completed")
+    complete_parser.add_argument('task_ids', type=_checked(InputValidator.validate_task_ids),
+                                 help="IDs and ranges, e.g. 12,13,40-55")
+    complete_parser.add_argument('--json', action='store_true', help="Print per-ID outcomes")
+    
+    delete_parser = subparsers.add_parser('delete', help="Delete a task")
+    delete_parser.add_argument('task_id', type=_checked(InputValidator.validate_task_id))
+    
+    search_parser = subparsers.add_parser('search', help="Search titles and descriptions")
+    search_parser.add_argument('keyword')
+    search_parser.add_argument('--prefix', action='store_true', help="Match word prefixes")
+    search_parser.add_argument('--fulltext', action='store_true', help="Rank by relevance")
+    search_parser.add_argument('--limit', type=_positive('--limit'))
+    search_parser.add_argument('--json', action='store_true', help="Print a JSON array")
+    
+    stats_parser = subparsers.add_parser('stats', help="Show task statistics")
+    stats_parser.add_argument('--json', action='store_true', help="Print a JSON object")
+    
+    token_parser = subparsers.add_parser('token', help="Print an access token for scripts")
+    token_parser.add_argument('--days', type=_positive('--days'), default=AuthConfig.TOKEN_TTL_DAYS,
+                              help="Days until the token expires")
+    
+    export_parser = subparsers.add_parser('export', help="Write all your tasks as JSON lines or CSV")
+    export_parser.add_argument('--format', choices=TRANSFER_FORMATS, default='jsonl')
+    export_parser.add_argument('--output', '-o', default='-',
+                               help="File to write (default: standard output)")
+    
+    import_parser = subparsers.add_parser('import', help="Add tasks from a JSON lines or CSV file")
+    import_parser.add_argument('file', help="File to read ('-' for standard input)")
+    import_parser.add_argument('--format', choices=TRANSFER_FORMATS,
+                               help="Input format (default: from the file extension, else jsonl)")
+    import_parser.add_argument('--chunk-size', type=_positive('--chunk-size'),
+                               default=DatabaseConfig.BULK_CHUNK_SIZE,
+                               help="Tasks inserted per transaction")
+    import_parser.add_argument('--offset', type=_positive('--offset', allow_zero=True), default=0,
+                               help="Skip this many records (resume an interrupted import)")
+    
+    serve_parser = subparsers.add_parser('serve', help="Serve the tasks API over HTTP (JSON)")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Address to listen on")
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument('--workers', type=_positive('--workers'), default=8,
+                              help="Requests handled in parallel")
+    serve_parser.add_argument('--log-requests', action='store_true', help="Log every request")
+    return parser
+
+def _task_manager(db, auth_manager):
+    from .task_manager import TaskManager
+    # One-shot commands query MySQL directly instead of warming the cache first
+    return TaskManager(db, auth_manager, cache_limit=0)
+
+def _write_tasks(tasks: List[Any], as_json: bool, out: IO[str]) -> None:
+    if as_json:
+        from .transfer import task_record
+        json.dump([task_record(task) for task in tasks], out, ensure_ascii=False)
+        out.write("\n")
+    else:
+        out.write("".join(f"{task}\n" for task in tasks))
+
+def run_list(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    filters = {key: value for key, value in (
+        ('status', args.status), ('priority', args.priority),
+        ('due_before', args.due_before), ('due_after', args.due_after)
+    ) if value is not None}
+    manager = _task_manager(db, auth_manager)
+    try:
+        tasks = manager.list_tasks(filters, limit=args.limit, after_cursor=args.after)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 2
+    _write_tasks(tasks, args.json, out)
+    if args.limit and len(tasks) == args.limit:
+        print(f"ℹ️  More tasks may follow: --after '{manager.page_cursor(tasks[-1])}'")
+    return 0
+
+def run_add(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    manager = _task_manager(db, auth_manager)
+    task_ids = manager.add_tasks([{
+        'title': args.title, 'description': args.description,
+        'due_date': args.due, 'priority_level': args.priority
+    }])
+    if not task_ids:
+        return 1
+    if args.json:
+        from .transfer import task_record
+        out.write(json.dumps(task_record(manager.get_task(task_ids[0])), ensure_ascii=False) + "\n")
+    else:
+        out.write(f"{task_ids[0]}\n")
+    return 0
+
+def _update_fields(args: argparse.Namespace) -> Dict[str, Any]:
+    return {field: value for field, value in (
+        ('title', args.title), ('description', args.description), ('due_date', args.due),
+        ('priority_level', args.priority), ('status', args.status)
+    ) if value is not None}
+
+def run_update(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    updates = _update_fields(args)
+    return 0 if _task_manager(db, auth_manager).update_task(args.task_id, **updates) else 1
+
+def run_complete(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    outcomes = _task_manager(db, auth_manager).complete_tasks(args.task_ids)
+    if args.json:
+        json.dump({str(task_id): done for task_id, done in outcomes.items()}, out)
+        out.write("\n")
+    return 0 if all(outcomes.values()) else 1
+
+def run_delete(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    return 0 if _task_manager(db, auth_manager).delete_task(args.task_id) else 1
+
+def run_search(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    tasks = _task_manager(db, auth_manager).search_tasks(
+        args.keyword, prefix=args.prefix, fulltext=args.fulltext, limit=args.limit)
+    _write_tasks(tasks, args.json, out)
+    return 0
+
+def run_stats(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    stats = _task_manager(db, auth_manager).get_statistics()
+    if args.json:
+        json.dump(stats, out)
+        out.write("\n")
+    else:
+        for key, value in stats.items():
+            out.write(f"{key}: {value}\n")
+    return 0
+
+def run_token(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    out.write(auth_manager.issue_token(args.days) + "\n")
+    return 0
+
+def run_export(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    from .transfer import export_tasks
+    user_id = auth_manager.get_current_user_id()
+    if args.output == '-':
+        count = export_tasks(db, user_id, out, args.format)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as target:
+            count = export_tasks(db, user_id, target, args.format)
+    print(f"✅ Exported {count} tasks")
+    return 0
+
+def run_import(args: argparse.Namespace, db, auth_manager, out: IO[str]) -> int:
+    from .transfer import import_tasks
+    fmt = args.format or ('csv' if args.file.lower().endswith('.csv') else 'jsonl')
+    task_manager = _task_manager(db, auth_manager)
+    
+    def report(offset: int, imported: int) -> None:
+        print(f"… {imported} imported, {offset} records read")
+    
+    if args.file == '-':
+        result = import_tasks(task_manager, sys.stdin, fmt, args.chunk_size, args.offset, report)
+    else:
+        with open(args.file, encoding='utf-8', newline='') as source:
+            result = import_tasks(task_manager, source, fmt, args.chunk_size, args.offset, report)
+    
+    for error in result.errors:
+        print(f"⚠️  Skipped {error}")
+    print(f"✅ Imported {result.imported} tasks ({len(result.errors)} skipped)")
+    if not result.finished:
+        print(f"❌ Import stopped; resume with --offset {result.next_offset}")
+        return 1
+    return 0
+
+COMMANDS: Dict[str, Callable[..., int]] = {
+    'list': run_list,
+    'add': run_add,
+    'update': run_update,
+    'complete': run_complete,
+    'delete': run_delete,
+    'search': run_search,
+    'stats': run_stats,
+    'token': run_token,
+    'export': run_export,
+    'import': run_import,
+}
+
+def authenticate(auth_manager, token: Optional[str] = None, username: Optional[str] = None) -> bool:
+    """Log in from a token or environment credentials, prompting only on a terminal."""
+    token = token or AuthConfig.TOKEN
+    if token:
+        return auth_manager.login_with_token(token)
+    username = username or AuthConfig.USERNAME
+    if username and AuthConfig.PASSWORD:
+        return auth_manager.authenticate(username, AuthConfig.PASSWORD)
+    if sys.stdin.isatty():
+        return auth_manager.login()
+    print("❌ Not logged in: set TASK_MANAGER_TOKEN, or TASK_MANAGER_USERNAME "
+          "and TASK_MANAGER_PASSWORD")
+    return False
+
+def _open_session(args: argparse.Namespace) -> Optional[Tuple[Any, Any]]:
+    """Connect and log in; return (db, auth_manager), or None after saying why not."""
+    if not DatabaseConfig.validate_config():
+        return None
+    
+    from .database import DatabaseConnection
+    from .auth import AuthenticationManager
+    
+    db = DatabaseConnection()
+    if not db.connect():
+        print("❌ Failed to connect to database. Please check your database configuration.")
+        return None
+    auth_manager = AuthenticationManager(db)
+    if not authenticate(auth_manager, args.token, args.username):
+        db.disconnect()
+        return None
+    return db, auth_manager
+
+def run_command(args: argparse.Namespace, out: IO[str]) -> int:
+    """Connect, log in, run one parsed command and return its exit status."""
+    session = _open_session(args)
+    if session is None:
+        return 1
+    db, auth_manager = session
+    try:
+        return COMMANDS[args.command](args, db, auth_manager, out)
+    finally:
+        db.disconnect()
+
+def run_serve(args: argparse.Namespace, out: IO[str]) -> int:
+    """Run the HTTP API; each request authenticates with its own token, so no login here."""
+    if not DatabaseConfig.validate_config():
+        return 1
+    
+    from .database import DatabaseConnection
+    from .server import serve
+    
+    # Every worker needs its own connection
+    db = DatabaseConnection(pool_max_size=max(DatabaseConfig.POOL_MAX_SIZE, args.workers))
+    if not db.connect():
+        print("❌ Failed to connect to database. Please check your database configuration.")
+        return 1
+    try:
+        serve(db, args.host, args.port, args.workers, args.log_requests)
+        return 0
+    finally:
+        db.disconnect()
+
+class BufferedOutput:
+    """File-like object that hands text to target in blocks of at least limit characters.
+    
+    flush() requests (input() makes one per prompt) are ignored; call
+    drain() to release whatever is still buffered.
+    """
+    
+    def __init__(self, target: IO[str], limit: int = 64 * 1024):
+        self.target = target
+        self.limit = limit
+        self._parts: List[str] = []
+        self._size = 0
+    
+    def write(self, text: str) -> int:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self.limit:
+            self.drain()
+        return len(text)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> None:
+        if self._parts:
+            self.target.write(''.join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        self.target.flush()
+
+def run_script(args: argparse.Namespace, out: IO[str]) -> int:
+    """Run a file of interactive-shell commands in one session and connection."""
+    session = _open_session(args)
+    if session is None:
+        return 1
+    db, auth_manager = session
+    
+    from .cli import TaskManagerCLI
+    from .task_manager import TaskManager
+    
+    output = BufferedOutput(out)
+    script = sys.stdin if args.script == '-' else open(args.script, encoding='utf-8')
+    try:
+        with redirect_stdout(output):
+            cli = TaskManagerCLI(TaskManager(db, auth_manager), auth_manager)
+            cli.run_script(script)
+        return 0
+    finally:
+        output.drain()
+        if script is not sys.stdin:
+            script.close()
+        db.disconnect()
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Entry point of the task-manager command."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'update' and not _update_fields(args):
+        parser.error("update needs at least one of --title, --description, --due, "
+                     "--priority, --status")
+    if args.script and args.command:
+        parser.error("--script cannot be combined with a command")
+    if args.command is None and not args.script:
+        from .cli import main as interactive_main
+        interactive_main([])
+        return
+    
+    # Results go to stdout; greetings, progress and errors go to stderr so
+    # that output stays machine-readable
+    out = sys.stdout
+    try:
+        with redirect_stdout(sys.stderr):
+            if args.script:
+                status = run_script(args, out)
+            elif args.command == 'serve':
+                status = run_serve(args, out)
+            else:
+                status = run_command(args, out)
+    except KeyboardInterrupt:
+        print("\n👋 Interrupted.", file=sys.stderr)
+        status = 130
+    out.flush()
+    sys.exit(status)
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -10,6 +10,19 @@ class DatabaseConfig:
     DATABASE = os.getenv('DB_NAME', 'task_manager')
     PORT = int(os.getenv('DB_PORT', '3306'))
     
+    # Connection pool (DB_POOL_MAX_SIZE=0 keeps a single shared connection)
+    POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '1'))
+    POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '0'))
+    POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))
+    POOL_MAX_IDLE = float(os.getenv('DB_POOL_MAX_IDLE', '300'))
+    # AsyncDatabaseConnection is always pooled; used when DB_POOL_MAX_SIZE is 0
+    ASYNC_POOL_MAX_SIZE = int(os.getenv('DB_ASYNC_POOL_MAX_SIZE', '20'))
+    # aiomysql has no idle timeout; its pooled connections are replaced at this age instead
+    ASYNC_POOL_RECYCLE = float(os.getenv('DB_ASYNC_POOL_RECYCLE', '3600'))
+    
+    # Rows per multi-row INSERT when adding tasks in bulk
+    BULK_CHUNK_SIZE = int(os.getenv('DB_BULK_CHUNK_SIZE', '500'))
+    
     @classmethod
     def get_connection_params(cls) -> Dict[str, Any]:
         """Get connection parameters as dictionary."""
@@ -21,6 +34,16 @@ class DatabaseConfig:
             'port': cls.PORT
         }
     
+    @classmethod
+    def get_pool_params(cls) -> Dict[str, Any]:
+        """Get connection pool settings as dictionary."""
+        return {
+            'min_size': cls.POOL_MIN_SIZE,
+            'max_size': cls.POOL_MAX_SIZE,
+            'timeout': cls.POOL_TIMEOUT,
+            'max_idle': cls.POOL_MAX_IDLE
+        }
+    
     @classmethod
     def validate_config(cls) -> bool:
         """Validate that required configuration is present."""
@@ -45,4 +68,31 @@ class DatabaseConfig:
             return True
         except Exception as e:
             print(f"Connection test failed: {e}")
-            return False
\ No newline at end of file
+            return False
+
+class AuthConfig:
+    """Credentials for non-interactive task-manager commands."""
+    
+    # Either a token from "task-manager token" or a username and password
+    TOKEN = os.getenv('TASK_MANAGER_TOKEN', '')
+    USERNAME = os.getenv('TASK_MANAGER_USERNAME', '')
+    PASSWORD = os.getenv('TASK_MANAGER_PASSWORD', '')
+    TOKEN_TTL_DAYS = int(os.getenv('TASK_MANAGER_TOKEN_TTL_DAYS', '30'))
+
+class CacheConfig:
+    """In-memory task cache settings."""
+    
+    # Accounts with more tasks than this are served page by page from MySQL
+    TASK_CACHE_LIMIT = int(os.getenv('TASK_CACHE_LIMIT', '5000'))
+    # Process-wide limits on the users whose tasks stay cached (see cache.TenantCache)
+    TENANT_CACHE_MAX_USERS = int(os.getenv('TENANT_CACHE_MAX_USERS', '1000'))
+    TENANT_CACHE_MEMORY_MB = int(os.getenv('TENANT_CACHE_MEMORY_MB', '256'))
+    # Seconds before a user's cached tasks are reloaded; 0 keeps them until evicted
+    TENANT_CACHE_TTL = float(os.getenv('TENANT_CACHE_TTL', '3600'))
+    # refresh_tasks(incremental=True) re-reads rows this many seconds older than its
+    # watermark, so rows written by transactions that committed late are not missed
+    TASK_SYNC_OVERLAP_SECONDS = float(os.getenv('TASK_SYNC_OVERLAP_SECONDS', '5'))
+    # Tombstones of deleted tasks are kept this long; older watermarks mean a full reload
+    TASK_TOMBSTONE_RETENTION_HOURS = int(os.getenv('TASK_TOMBSTONE_RETENTION_HOURS', '168'))
+    # TENANT_CACHE_TTL of the HTTP API server; it also syncs every request incrementally
+    API_CACHE_TTL = float(os.getenv('API_CACHE_TTL', '30'))
\ No newline at end of file
@@ -0,0 +1,29 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, NamedTuple, Optional
+
+class UserContext(NamedTuple):
+    """The user a TaskManager call acts for."""
+    user_id: int
+    username: str = ''
+
+# Set per thread or asyncio task, so interleaved requests never see each other's user
+_current_user: ContextVar[Optional[UserContext]] = ContextVar('task_manager_user', default=None)
+
+def current_user() -> Optional[UserContext]:
+    """The user set by the innermost active user_context, if any."""
+    return _current_user.get()
+
+@contextmanager
+def user_context(user_id: int, username: str = '') -> Iterator[UserContext]:
+    """Run the enclosed TaskManager calls as this user.
+    
+    Takes precedence over the manager's logged-in AuthenticationManager, so
+    one TaskManager can serve many users, e.g. one per API request.
+    """
+    context = UserContext(user_id, username)
+    token = _current_user.set(context)
+    try:
+        yield context
+    finally:
+        _current_user.reset(token)
\ No newline at end of file
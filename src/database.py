@@ -1,52 +1,274 @@
 import pymysql
-import logging
-from typing import Optional, Dict, Any
+from pymysql.constants import CLIENT
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, Deque, Iterator, List, Tuple
 from .config import DatabaseConfig  # Add this import
 
+if TYPE_CHECKING:
+    import logging
+
+def setup_logger(name: str) -> 'logging.Logger':
+    """Logger for name, with a stream handler attached on first use."""
+    import logging
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        formatter = logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        )
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    
+    return logger
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """Raised when no pooled connection becomes available before the timeout."""
+
+class RollbackOnlyError(pymysql.err.OperationalError):
+    """Raised instead of committing a transaction that a nested block failed in."""
+
+
+class ConnectionPool:
+    """Thread-safe pool of pymysql connections.
+    
+    Connections are created lazily up to max_size, health-checked when
+    borrowed, and closed once they sit idle longer than max_idle seconds
+    (the pool never shrinks below min_size).
+    """
+    
+    def __init__(self, factory: Callable[[], pymysql.Connection], min_size: int = 1,
+                 max_size: int = 5, timeout: float = 10.0, max_idle: float = 300.0,
+                 health_check_interval: float = 5.0):
+        if max_size < 1:
+            raise ValueError("Pool max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("Pool min_size must be between 0 and max_size")
+        self._factory = factory
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        # Idle connections with the monotonic time they were returned; the
+        # right end is the most recently used, so eviction pops from the left.
+        self._idle: Deque[Tuple[pymysql.Connection, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    @property
+    def size(self) -> int:
+        """Number of open connections, idle and borrowed."""
+        return self._size
+    
+    @property
+    def idle_count(self) -> int:
+        """Number of connections waiting in the pool."""
+        return len(self._idle)
+    
+    def fill(self) -> None:
+        """Open connections until the pool holds min_size of them."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._factory()
+            except Exception:
+                self._forget()
+                raise
+            self.release(conn)
+    
+    def acquire(self, timeout: Optional[float] = None) -> pymysql.Connection:
+        """Borrow a healthy connection, waiting up to timeout seconds."""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        
+        while True:
+            conn, idle_since, expired = self._checkout(deadline)
+            self._close_all(expired)
+            
+            if conn is None:
+                try:
+                    return self._factory()
+                except Exception:
+                    self._forget()
+                    raise
+            
+            if time.monotonic() - idle_since < self.health_check_interval:
+                return conn
+            try:
+                conn.ping(reconnect=False)
+                return conn
+            except pymysql.Error:
+                # Stale connection (server restart, wait_timeout): drop it and
+                # try the next one instead of handing it to the caller.
+                self.release(conn, discard=True)
+    
+    def _checkout(self, deadline: float) -> Tuple[Optional[pymysql.Connection], float,
+                                                  List[pymysql.Connection]]:
+        """Take an idle connection or reserve a slot for a new one."""
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise pymysql.err.InterfaceError("Connection pool is closed")
+                expired = self._evict_idle_locked()
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                    return conn, idle_since, expired
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, 0.0, expired
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"No database connection available within {self.timeout} seconds"
+                    )
+                self._cond.wait(remaining)
+    
+    def release(self, conn: pymysql.Connection, discard: bool = False) -> None:
+        """Return a borrowed connection; broken connections should be discarded."""
+        with self._cond:
+            if self._closed or discard or not conn.open:
+                self._size -= 1
+                keep = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                keep = True
+            self._cond.notify()
+        if not keep:
+            self._close_all([conn])
+    
+    def evict_idle(self) -> int:
+        """Close connections idle longer than max_idle; return how many."""
+        with self._cond:
+            expired = self._evict_idle_locked()
+        self._close_all(expired)
+        return len(expired)
+    
+    def _evict_idle_locked(self) -> List[pymysql.Connection]:
+        expired = []
+        cutoff = time.monotonic() - self.max_idle
+        while (self._idle and self._size > self.min_size
+               and self._idle[0][1] < cutoff):
+            expired.append(self._idle.popleft()[0])
+            self._size -= 1
+        return expired
+    
+    def _forget(self) -> None:
+        """Give back a slot reserved for a connection that failed to open."""
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+    
+    def close(self) -> None:
+        """Close every idle connection; borrowed ones close on release."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        self._close_all(idle)
+    
+    @staticmethod
+    def _close_all(connections: List[pymysql.Connection]) -> None:
+        for conn in connections:
+            try:
+                conn.close()
+            except pymysql.Error:
+                pass
+
+
 class DatabaseConnection:
-    """Handles MySQL database connection and operations."""
+    """Handles MySQL database connection and operations.
     
-    def __init__(self, host: str = None, user: str = None, 
-                 password: str = None, database: str = None, port: int = None):
+    By default a single connection is shared (and serialized with a lock).
+    When pool_max_size is greater than zero, queries borrow connections
+    from a ConnectionPool instead so concurrent callers run in parallel.
+    If connect() was not called, the first query connects.
+    """
+    
+    def __init__(self, host: str = None, user: str = None,
+                 password: str = None, database: str = None, port: int = None,
+                 pool_min_size: int = None, pool_max_size: int = None,
+                 pool_timeout: float = None, pool_max_idle: float = None):
         # Use provided parameters or fall back to config defaults
         config = DatabaseConfig.get_connection_params()
+        pool_config = DatabaseConfig.get_pool_params()
         self.host = host or config['host']
         self.user = user or config['user']
         self.password = password or config['password']
         self.database = database or config['database']
         self.port = port or config['port']
+        self.pool_min_size = pool_config['min_size'] if pool_min_size is None else pool_min_size
+        self.pool_max_size = pool_config['max_size'] if pool_max_size is None else pool_max_size
+        self.pool_timeout = pool_config['timeout'] if pool_timeout is None else pool_timeout
+        self.pool_max_idle = pool_config['max_idle'] if pool_max_idle is None else pool_max_idle
         self.connection: Optional[pymysql.Connection] = None
-        self.logger = self._setup_logger()
+        self.pool: Optional[ConnectionPool] = None
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        # Connection of the transaction the current thread is running, if any
+        self._local = threading.local()
+        self._logger: Optional['logging.Logger'] = None
+    
+    @property
+    def logger(self) -> 'logging.Logger':
+        """Logger, configured on first use rather than on construction."""
+        if self._logger is None:
+            self._logger = self._setup_logger()
+        return self._logger
     
-    def _setup_logger(self) -> logging.Logger:
+    def _setup_logger(self) -> 'logging.Logger':
         """Setup logging configuration."""
-        logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
-        
-        if not logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
-        
-        return logger
+        return setup_logger(__name__)
+    
+    @property
+    def is_pooled(self) -> bool:
+        """Whether queries are served from a connection pool."""
+        return self.pool_max_size > 0
+    
+    def _create_connection(self) -> pymysql.Connection:
+        """Open a new pymysql connection with the configured parameters."""
+        return pymysql.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            charset='utf8mb4',
+            cursorclass=pymysql.cursors.DictCursor,
+            # Report matched rather than changed rows so rowcount confirms ownership
+            client_flag=CLIENT.FOUND_ROWS,
+            autocommit=True  # Add this for better transaction handling
+        )
     
     def connect(self) -> bool:
         """Establish database connection."""
         try:
-            self.connection = pymysql.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                charset='utf8mb4',
-                cursorclass=pymysql.cursors.DictCursor,
-                autocommit=True  # Add this for better transaction handling
-            )
-            self.logger.info("Database connection established successfully")
+            if self.is_pooled:
+                self.pool = ConnectionPool(
+                    self._create_connection,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    timeout=self.pool_timeout,
+                    max_idle=self.pool_max_idle
+                )
+                self.pool.fill()
+                self.logger.info(
+                    f"Database connection pool established "
+                    f"(min={self.pool_min_size}, max={self.pool_max_size})"
+                )
+            else:
+                self.connection = self._create_connection()
+                self.logger.info("Database connection established successfully")
             return True
         except pymysql.Error as e:
             self.logger.error(f"Database connection failed: {e}")
@@ -57,31 +279,156 @@ class DatabaseConnection:
                 self.logger.error("Please run the database setup script first")
             elif "Can't connect to MySQL server" in str(e):
                 self.logger.error("Please ensure MySQL server is running")
+            if self.pool:
+                self.pool.close()
+                self.pool = None
             return False
     
     def disconnect(self) -> None:
         """Close database connection."""
+        if self.pool:
+            self.pool.close()
+            self.pool = None
+            self.logger.info("Database connection pool closed")
         if self.connection:
             self.connection.close()
+            self.connection = None
             self.logger.info("Database connection closed")
     
+    @property
+    def is_connected(self) -> bool:
+        """Whether connect() has succeeded (and disconnect() not been called since)."""
+        return self.pool is not None or self.connection is not None
+    
+    def _ensure_connected(self) -> None:
+        """Connect on first use, so callers that never query never connect."""
+        if self.is_connected:
+            return
+        with self._connect_lock:
+            if not self.is_connected and not self.connect():
+                raise pymysql.err.OperationalError("Could not connect to the database")
+    
+    @contextmanager
+    def _borrow(self) -> Iterator[pymysql.Connection]:
+        """Yield a connection for exclusive use by the calling thread."""
+        active = getattr(self._local, 'connection', None)
+        if active is not None:
+            # Queries inside transaction() reuse its connection
+            yield active
+            return
+        
+        self._ensure_connected()
+        if self.pool is None:
+            with self._lock:
+                yield self.connection
+            return
+        
+        # disconnect() may clear self.pool while the connection is out
+        pool = self.pool
+        conn = pool.acquire()
+        try:
+            yield conn
+        finally:
+            pool.release(conn)
+    
+    @property
+    def in_transaction(self) -> bool:
+        """Whether the calling thread is inside transaction()."""
+        return getattr(self._local, 'connection', None) is not None
+    
+    @contextmanager
+    def transaction(self) -> Iterator[pymysql.Connection]:
+        """Run the enclosed queries on one connection as a single transaction.
+        
+        execute_query, fetch_* calls made by the same thread inside the block
+        join the transaction instead of committing individually. It commits
+        when the block exits normally and rolls back if it raises. Nested
+        blocks join the outermost transaction; if one raises, the outermost
+        block rolls back and raises RollbackOnlyError even when the error
+        was caught in between, since part of the nested work may be applied.
+        """
+        if self.in_transaction:
+            try:
+                yield self._local.connection
+            except BaseException:
+                self._local.rollback_only = True
+                raise
+            return
+        
+        with self._borrow() as connection:
+            connection.begin()
+            self._local.connection = connection
+            self._local.rollback_only = False
+            try:
+                yield connection
+                if self._local.rollback_only:
+                    raise RollbackOnlyError("A nested transaction failed; all its changes were rolled back")
+                connection.commit()
+            except BaseException:
+                self._rollback(connection)
+                raise
+            finally:
+                self._local.connection = None
+    
     def execute_query(self, query: str, params: tuple = ()) -> Optional[pymysql.cursors.Cursor]:
         """Execute SQL query with error handling."""
+        in_transaction = self.in_transaction
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params)
-                self.connection.commit()
-                return cursor
+            with self._borrow() as connection:
+                try:
+                    with connection.cursor() as cursor:
+                        cursor.execute(query, params)
+                        if not in_transaction:
+                            connection.commit()
+                        return cursor
+                except pymysql.Error as e:
+                    self.logger.error(f"Query execution failed: {e}")
+                    # Inside transaction() the owner of the block decides
+                    if not in_transaction:
+                        self._rollback(connection)
+                    return None
         except pymysql.Error as e:
-            self.logger.error(f"Query execution failed: {e}")
-            self.connection.rollback()
+            self.logger.error(f"Could not obtain a database connection: {e}")
             return None
     
+    def _rollback(self, connection: pymysql.Connection) -> None:
+        """Roll back, tolerating connections that are already broken."""
+        try:
+            connection.rollback()
+        except pymysql.Error:
+            pass
+    
     def fetch_all(self, query: str, params: tuple = ()) -> list:
         """Execute query and fetch all results."""
         cursor = self.execute_query(query, params)
         return cursor.fetchall() if cursor else []
     
+    def fetch_iter(self, query: str, params: tuple = (),
+                   batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Stream query results through a server-side cursor.
+        
+        Rows are read from MySQL batch_size at a time, so memory stays bounded
+        however large the result is. The connection is held until the
+        generator is exhausted or closed; in single-connection mode, do not
+        run other queries on this DatabaseConnection while iterating. Errors
+        are logged and re-raised, since a silently truncated stream would look
+        like a complete one.
+        """
+        with self._borrow() as connection:
+            cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+            try:
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+            except pymysql.Error as e:
+                self.logger.error(f"Streaming query failed: {e}")
+                raise
+            finally:
+                cursor.close()
+    
     def fetch_one(self, query: str, params: tuple = ()) -> Optional[Dict[str, Any]]:
         """Execute query and fetch single result."""
         cursor = self.execute_query(query, params)
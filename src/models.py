@@ -1,12 +1,41 @@
+from array import array
 from datetime import datetime, date
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, Tuple
 import re
 
+# NumPy is optional (TaskBatch falls back to array-module reductions) and
+# slow to import, so it is only loaded the first time a batch needs it
+_numpy = None
+
+def _load_numpy():
+    """Return the numpy module, or None when it is not installed."""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
 class Task:
     """Represents a single task with validation and business logic."""
     
+    # Slots instead of a per-instance __dict__: large accounts keep many Tasks in memory
+    __slots__ = ('_task_id', '_title', '_description', '_due_date', '_priority_level',
+                 '_status', '_creation_timestamp', '_sort_key')
+    
     VALID_PRIORITIES = {'Low', 'Medium', 'High'}
     VALID_STATUSES = {'Pending', 'In Progress', 'Completed'}
+    PRIORITY_RANK = {'High': 3, 'Medium': 2, 'Low': 1}
+    
+    # Field name -> validator method, used to check updates before they are applied
+    _FIELD_VALIDATORS = {
+        'title': '_validate_title',
+        'priority_level': '_validate_priority',
+        'status': '_validate_status',
+        'due_date': '_validate_due_date'
+    }
     
     def __init__(self, task_id: Optional[int] = None, title: str = "", 
                  description: str = "", due_date: Optional[date] = None,
@@ -22,6 +51,15 @@ class Task:
         
         # Validate initial values
         self._validate()
+        self._update_sort_key()
+    
+    def _update_sort_key(self) -> None:
+        """Recompute the display ordering key: priority (High first), then due date (unset last)."""
+        self._sort_key = (
+            -self.PRIORITY_RANK.get(self._priority_level, 0),
+            self._due_date is None,
+            self._due_date or date.max
+        )
     
     def _validate(self) -> None:
         """Validate all task attributes."""
@@ -54,6 +92,16 @@ class Task:
         if self._due_date and self._due_date < date.today():
             raise ValueError("Due date cannot be in the past")
     
+    @classmethod
+    def validate_fields(cls, **fields: Any) -> None:
+        """Validate field values without touching an existing task."""
+        probe = cls.__new__(cls)
+        for field, value in fields.items():
+            setattr(probe, f'_{field}', value)
+            validator = cls._FIELD_VALIDATORS.get(field)
+            if validator:
+                getattr(probe, validator)()
+    
     # Property getters with validation
     @property
     def task_id(self) -> Optional[int]:
@@ -84,6 +132,7 @@ class Task:
     def due_date(self, value: Optional[date]) -> None:
         self._due_date = value
         self._validate_due_date()
+        self._update_sort_key()
     
     @property
     def priority_level(self) -> str:
@@ -93,6 +142,7 @@ class Task:
     def priority_level(self, value: str) -> None:
         self._priority_level = value
         self._validate_priority()
+        self._update_sort_key()
     
     @property
     def status(self) -> str:
@@ -107,6 +157,10 @@ class Task:
     def creation_timestamp(self) -> datetime:
         return self._creation_timestamp
     
+    @property
+    def sort_key(self) -> Tuple[int, bool, date]:
+        return self._sort_key
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary for database operations."""
         return {
@@ -132,10 +186,148 @@ class Task:
             creation_timestamp=data.get('creation_timestamp')
         )
     
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> 'Task':
+        """Create Task instance from a tasks table row without re-validating it.
+        
+        The schema already constrains these values (NOT NULL title, ENUM
+        priority and status), and stored due dates may legitimately be in the
+        past, so the checks in _validate are skipped.
+        """
+        task = cls.__new__(cls)
+        task._task_id = row['task_id']
+        task._title = row['title']
+        task._description = row.get('description') or ''
+        task._due_date = row.get('due_date')
+        task._priority_level = row.get('priority_level') or 'Medium'
+        task._status = row.get('status') or 'Pending'
+        task._creation_timestamp = row.get('creation_timestamp') or datetime.now()
+        task._update_sort_key()
+        return task
+    
     def __str__(self) -> str:
         due_date_str = self._due_date.strftime('%Y-%m-%d') if self._due_date else 'Not set'
         return (f"Task {self._task_id}: {self._title} "
                 f"({self._status}, Priority: {self._priority_level}, Due: {due_date_str})")
     
     def __repr__(self) -> str:
-        return f"Task(task_id={self._task_id}, title='{self._title}', status='{self._status}')"
\ No newline at end of file
+        return f"Task(task_id={self._task_id}, title='{self._title}', status='{self._status}')"
+
+class TaskBatch:
+    """Columnar view of many tasks for bulk statistics.
+    
+    Each field is a parallel typed array (priority and status as small
+    integer codes, due date as an ordinal with 0 for unset, creation time as
+    a POSIX timestamp), so counts and histograms are single C-level
+    reductions instead of one Python pass per statistic. NumPy is used when
+    installed. Rows can be changed in place with put and remove, so a batch
+    can be kept up to date alongside a TaskCache rather than rebuilt.
+    """
+    
+    PRIORITY_CODES = dict(Task.PRIORITY_RANK)
+    STATUS_CODES = {'Pending': 0, 'In Progress': 1, 'Completed': 2}
+    
+    def __init__(self):
+        self.task_ids = array('q')
+        self.priorities = array('b')
+        self.statuses = array('b')
+        self.due_ordinals = array('l')
+        self.created = array('d')
+        # task_id -> its row in the arrays
+        self._positions: Dict[int, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.task_ids)
+    
+    def _columns(self) -> Tuple[array, ...]:
+        return (self.task_ids, self.priorities, self.statuses, self.due_ordinals, self.created)
+    
+    def append(self, task_id: int, priority_level: str, status: str,
+               due_date: Optional[date], creation_timestamp: Optional[datetime]) -> None:
+        self._positions[task_id or 0] = len(self.task_ids)
+        self.task_ids.append(task_id or 0)
+        self.priorities.append(self.PRIORITY_CODES.get(priority_level, 0))
+        self.statuses.append(self.STATUS_CODES.get(status, -1))
+        self.due_ordinals.append(due_date.toordinal() if due_date else 0)
+        self.created.append(creation_timestamp.timestamp() if creation_timestamp else 0.0)
+    
+    def put(self, task: Task) -> None:
+        """Add a task, or overwrite its row with the task's current values."""
+        position = self._positions.get(task.task_id)
+        if position is None:
+            self.append(task.task_id, task.priority_level, task.status,
+                        task.due_date, task.creation_timestamp)
+            return
+        self.priorities[position] = self.PRIORITY_CODES.get(task.priority_level, 0)
+        self.statuses[position] = self.STATUS_CODES.get(task.status, -1)
+        self.due_ordinals[position] = task.due_date.toordinal() if task.due_date else 0
+        self.created[position] = (task.creation_timestamp.timestamp()
+                                  if task.creation_timestamp else 0.0)
+    
+    def remove(self, task_id: int) -> None:
+        """Drop a task's row by moving the last row into its place (order is not kept)."""
+        position = self._positions.pop(task_id, None)
+        if position is None:
+            return
+        last = len(self.task_ids) - 1
+        for column in self._columns():
+            column[position] = column[last]
+            column.pop()
+        if position != last:
+            self._positions[self.task_ids[position]] = position
+    
+    def clear(self) -> None:
+        for column in self._columns():
+            del column[:]
+        self._positions.clear()
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'TaskBatch':
+        """Build a batch straight from tasks table rows (no Task objects)."""
+        batch = cls()
+        for row in rows:
+            batch.append(row['task_id'], row.get('priority_level'), row.get('status'),
+                         row.get('due_date'), row.get('creation_timestamp'))
+        return batch
+    
+    @classmethod
+    def from_tasks(cls, tasks: Iterable[Task]) -> 'TaskBatch':
+        """Build a batch from Task objects."""
+        batch = cls()
+        for task in tasks:
+            batch.append(task.task_id, task.priority_level, task.status,
+                         task.due_date, task.creation_timestamp)
+        return batch
+    
+    def count_status(self, status: str) -> int:
+        return self.statuses.count(self.STATUS_CODES[status])
+    
+    def count_priority(self, priority_level: str) -> int:
+        return self.priorities.count(self.PRIORITY_CODES[priority_level])
+    
+    def priority_histogram(self) -> Dict[str, int]:
+        """Number of tasks per priority level."""
+        return {name: self.priorities.count(code) for name, code in self.PRIORITY_CODES.items()}
+    
+    def count_overdue(self, today: Optional[date] = None) -> int:
+        """Tasks with a due date before today that are not completed."""
+        today_ordinal = (today or date.today()).toordinal()
+        completed = self.STATUS_CODES['Completed']
+        numpy = _load_numpy()
+        if numpy is not None:
+            due = numpy.frombuffer(self.due_ordinals, dtype=self.due_ordinals.typecode)
+            statuses = numpy.frombuffer(self.statuses, dtype=numpy.int8)
+            return int(numpy.count_nonzero((due > 0) & (due < today_ordinal) & (statuses != completed)))
+        return sum(1 for due, status in zip(self.due_ordinals, self.statuses)
+                   if 0 < due < today_ordinal and status != completed)
+    
+    def statistics(self, today: Optional[date] = None) -> Dict[str, Any]:
+        """Same counters as TaskManager.get_statistics."""
+        return {
+            'total_tasks': len(self),
+            'completed': self.count_status('Completed'),
+            'pending': self.count_status('Pending'),
+            'in_progress': self.count_status('In Progress'),
+            'high_priority': self.count_priority('High'),
+            'overdue': self.count_overdue(today)
+        }
\ No newline at end of file
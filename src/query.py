@@ -0,0 +1,242 @@
+import re
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .models import Task
+from .search import DESCRIPTION_SCORE, TITLE_PREFIX_SCORE, TITLE_SCORE
+
+# Columns update_task and update_tasks may change
+UPDATABLE_FIELDS = frozenset({'title', 'description', 'due_date', 'priority_level', 'status'})
+
+STATISTICS_FIELDS = ('total_tasks', 'completed', 'pending', 'in_progress', 'high_priority', 'overdue')
+
+# One pass over the user's rows; each boolean SUM counts matching tasks
+STATISTICS_QUERY = """
+    SELECT COUNT(*) AS total_tasks,
+           COALESCE(SUM(status = 'Completed'), 0) AS completed,
+           COALESCE(SUM(status = 'Pending'), 0) AS pending,
+           COALESCE(SUM(status = 'In Progress'), 0) AS in_progress,
+           COALESCE(SUM(priority_level = 'High'), 0) AS high_priority,
+           COALESCE(SUM(due_date < CURDATE() AND status != 'Completed'), 0) AS overdue
+    FROM tasks
+    WHERE user_id = %s
+"""
+
+# Most recent tasks first; callers ask for one row past the cache limit
+LOAD_QUERY = "SELECT * FROM tasks WHERE user_id = %s ORDER BY creation_timestamp DESC LIMIT %s"
+
+# Rows changed and tasks deleted since a sync watermark; both use (user_id, time) indexes
+CHANGES_QUERY = "SELECT * FROM tasks WHERE user_id = %s AND updated_at >= %s"
+TOMBSTONES_QUERY = "SELECT task_id, deleted_at FROM task_tombstones WHERE user_id = %s AND deleted_at >= %s"
+# Tombstones past the retention window, which incremental syncs no longer rely on
+PURGE_TOMBSTONES_QUERY = "DELETE FROM task_tombstones WHERE deleted_at < NOW() - INTERVAL %s HOUR"
+
+# Seconds between the tombstone purges incremental syncs run
+TOMBSTONE_PURGE_INTERVAL = 3600
+
+# Filter key -> (column, SQL operator); equality filters on status and priority
+# line up with the (user_id, status) and (user_id, priority_level) indexes
+FILTER_CONDITIONS = {
+    'status': ('status', '='),
+    'priority': ('priority_level', '='),
+    'due_date': ('due_date', '='),
+    'due_before': ('due_date', '<'),
+    'due_after': ('due_date', '>'),
+}
+
+# The most selective index for each equality filter, in order of preference
+INDEX_HINTS = (
+    ('status', 'idx_user_status'),
+    ('priority', 'idx_user_priority'),
+)
+
+def matches_filters(task: Task, filters: Dict[str, Any]) -> bool:
+    """In-memory equivalent of the WHERE clause TaskQuery builds."""
+    if 'status' in filters and task.status != filters['status']:
+        return False
+    if 'priority' in filters and task.priority_level != filters['priority']:
+        return False
+    if 'due_date' in filters and task.due_date != filters['due_date']:
+        return False
+    if 'due_before' in filters and not (task.due_date and task.due_date < filters['due_before']):
+        return False
+    if 'due_after' in filters and not (task.due_date and task.due_date > filters['due_after']):
+        return False
+    return True
+
+class TaskQuery:
+    """Builds a parameterized, keyset-paginated SELECT over one user's tasks.
+    
+    Rows come back in list order: priority (High first), due date (unset
+    last), then task_id, matching the in-memory sort key.
+    """
+    
+    def __init__(self, user_id: int):
+        self.user_id = user_id
+        self._conditions: List[str] = ["user_id = %s"]
+        self._params: List[Any] = [user_id]
+        self._index: Optional[str] = None
+        self._limit: Optional[int] = None
+    
+    def filter(self, filters: Dict[str, Any]) -> 'TaskQuery':
+        """Add list filters (unknown keys are ignored, as in matches_filters)."""
+        for key, (column, operator) in FILTER_CONDITIONS.items():
+            if key in filters:
+                self._conditions.append(f"{column} {operator} %s")
+                self._params.append(filters[key])
+        
+        for key, index in INDEX_HINTS:
+            if key in filters:
+                self._index = index
+                break
+        return self
+    
+    def after(self, key: Optional[Tuple[Any, ...]]) -> 'TaskQuery':
+        """Resume after the row with the given view key (see cache.view_key)."""
+        if key is None:
+            return self
+        
+        negative_rank, _, due, task_id = key
+        rank = -negative_rank
+        # Lower priorities are listed as ENUM values rather than compared
+        # numerically, so the priority index can still be used for the range
+        lower = [name for name, value in Task.PRIORITY_RANK.items() if value < rank]
+        same_priority = ("(priority_level = %s AND (COALESCE(due_date, %s) > %s "
+                         "OR (COALESCE(due_date, %s) = %s AND task_id > %s)))")
+        priority_name = next((name for name, value in Task.PRIORITY_RANK.items()
+                              if value == rank), None)
+        params: List[Any] = [priority_name, date.max, due, date.max, due, task_id]
+        
+        if lower:
+            placeholders = ", ".join(["%s"] * len(lower))
+            self._conditions.append(f"(priority_level IN ({placeholders}) OR {same_priority})")
+            self._params.extend(lower + params)
+        else:
+            self._conditions.append(same_priority)
+            self._params.extend(params)
+        return self
+    
+    def limit(self, limit: Optional[int]) -> 'TaskQuery':
+        self._limit = limit
+        return self
+    
+    def build(self) -> Tuple[str, tuple]:
+        """Return the SQL text and its parameters."""
+        hint = f" USE INDEX ({self._index})" if self._index else ""
+        query = (
+            f"SELECT * FROM tasks{hint}"
+            f" WHERE {' AND '.join(self._conditions)}"
+            " ORDER BY priority_level DESC, COALESCE(due_date, %s), task_id"
+        )
+        params = self._params + [date.max]
+        if self._limit is not None:
+            query += " LIMIT %s"
+            params.append(self._limit)
+        return query, tuple(params)
+
+def tasks_from_specs(specs: Iterable[Any]) -> List[Task]:
+    """Validate add_tasks specs; on any error print them all and return []."""
+    tasks = []
+    errors = []
+    for number, spec in enumerate(specs, 1):
+        if isinstance(spec, Task):
+            tasks.append(spec)
+            continue
+        try:
+            tasks.append(Task(
+                title=spec.get('title', ''),
+                description=spec.get('description') or '',
+                due_date=spec.get('due_date'),
+                priority_level=spec.get('priority_level') or 'Medium'
+            ))
+        except (ValueError, TypeError, AttributeError) as e:
+            errors.append(f"#{number}: {e}")
+    
+    if errors:
+        print(f"❌ {len(errors)} invalid task(s), nothing was added:")
+        for error in errors:
+            print(f"   {error}")
+        return []
+    return tasks
+
+def insert_statement(user_id: int, tasks: List[Task]) -> Tuple[str, List[Any]]:
+    """Multi-row INSERT for tasks, and its parameters."""
+    placeholders = ", ".join(["(%s, %s, %s, %s, %s, %s)"] * len(tasks))
+    query = (
+        "INSERT INTO tasks (user_id, title, description, due_date, priority_level, status) "
+        f"VALUES {placeholders}"
+    )
+    params: List[Any] = []
+    for task in tasks:
+        params.extend((user_id, task.title, task.description, task.due_date,
+                       task.priority_level, task.status))
+    return query, params
+
+def assign_ids(cursor, tasks: List[Task]) -> None:
+    """Give tasks the IDs of the multi-row INSERT just run on cursor.
+    
+    InnoDB hands a multi-row INSERT consecutive AUTO_INCREMENT values
+    starting at LAST_INSERT_ID(), so the IDs are a range from lastrowid.
+    """
+    if cursor.rowcount != len(tasks):
+        raise RuntimeError(f"expected {len(tasks)} inserted rows, got {cursor.rowcount}")
+    for offset, task in enumerate(tasks):
+        task._task_id = cursor.lastrowid + offset
+
+def keyword_condition(keyword: str, prefix: bool) -> Tuple[str, Tuple[str, ...]]:
+    """WHERE clause (and parameters) matching keyword in title or description."""
+    if prefix:
+        start_term, word_term = f"{keyword}%", f"% {keyword}%"
+        return ("(title LIKE %s OR title LIKE %s OR description LIKE %s OR description LIKE %s)",
+                (start_term, word_term, start_term, word_term))
+    search_term = f"%{keyword}%"
+    return "(title LIKE %s OR description LIKE %s)", (search_term, search_term)
+
+def ranked_search_query(user_id: int, keyword: str, prefix: bool,
+                        limit: Optional[int]) -> Tuple[str, Tuple[Any, ...]]:
+    """SELECT scoring, ordering and limiting keyword matches like search.rank_hits."""
+    condition, match_params = keyword_condition(keyword, prefix)
+    # Same scoring as search.match_score, so ranking and LIMIT happen server-side
+    query = f"""
+        SELECT *, CASE WHEN title LIKE %s THEN {TITLE_PREFIX_SCORE}
+                       WHEN title LIKE %s THEN {TITLE_SCORE}
+                       ELSE {DESCRIPTION_SCORE} END AS score
+        FROM tasks
+        WHERE user_id = %s
+        AND {condition}
+        ORDER BY score DESC, priority_level DESC, COALESCE(due_date, %s), task_id
+    """
+    params: Tuple[Any, ...] = (f"{keyword}%", f"%{keyword}%", user_id) + match_params + (date.max,)
+    if limit is not None:
+        query += " LIMIT %s"
+        params += (limit,)
+    return query, params
+
+def fulltext_query(user_id: int, keyword: str, limit: Optional[int],
+                   offset: int) -> Optional[Tuple[str, Tuple[Any, ...]]]:
+    """FULLTEXT SELECT for keyword, or None when it has no searchable words."""
+    # Boolean mode: every word is required and matched as a prefix; operators
+    # typed by the user are dropped rather than interpreted
+    words = re.findall(r'\w+', keyword)
+    if not words:
+        return None
+    against = " ".join(f"+{word}*" for word in words)
+    
+    query = """
+        SELECT *, MATCH(title, description) AGAINST (%s IN BOOLEAN MODE) AS relevance
+        FROM tasks
+        WHERE user_id = %s
+        AND MATCH(title, description) AGAINST (%s IN BOOLEAN MODE)
+        ORDER BY relevance DESC, task_id DESC
+    """
+    params: Tuple[Any, ...] = (against, user_id, against)
+    if limit is not None or offset:
+        # MySQL needs a LIMIT before OFFSET; this is its documented "no limit" value
+        query += " LIMIT %s OFFSET %s"
+        params += (limit if limit is not None else 18446744073709551615, offset)
+    return query, params
+
+def paginate(tasks: List[Task], limit: Optional[int], offset: int) -> List[Task]:
+    """One page of an already ordered result list."""
+    if limit is None:
+        return tasks[offset:]
+    return tasks[offset:offset + limit]
\ No newline at end of file
@@ -0,0 +1,110 @@
+import json
+from datetime import date
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Sequence
+from .models import Task
+from .transfer import task_record
+from .utils import DateUtils
+
+if TYPE_CHECKING:
+    from .search import SearchHit
+
+STATUS_ICONS = {'Completed': "✅", 'In Progress': "🔄"}
+PRIORITY_ICONS = {'High': "⚡", 'Medium': "🔶"}
+RULE = "-" * 80
+
+class TaskRenderer:
+    """Formats a page of tasks into a single string.
+    
+    Formats: "full" (the interactive layout), "table" (one line per task),
+    "json" (an array) and "ndjson" (one object per line). Callers pass only
+    the tasks to be shown, and the whole page is written with one call.
+    The current date is read once per renderer rather than once per task.
+    """
+    
+    FORMATS = ('full', 'table', 'json', 'ndjson')
+    
+    def __init__(self, fmt: str = 'full', today: Optional[date] = None):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Format must be one of: {', '.join(self.FORMATS)}")
+        self.fmt = fmt
+        self.today = today or date.today()
+    
+    @property
+    def is_machine_readable(self) -> bool:
+        return self.fmt in ('json', 'ndjson')
+    
+    def render(self, tasks: Sequence[Task], start: int = 1) -> str:
+        """Format tasks, numbering them from start in the full layout."""
+        if self.fmt == 'json':
+            return json.dumps([task_record(task) for task in tasks], ensure_ascii=False) + "\n"
+        if self.fmt == 'ndjson':
+            return "".join(json.dumps(task_record(task), ensure_ascii=False) + "\n"
+                           for task in tasks)
+        if self.fmt == 'table':
+            return "".join(self._table_row(task) for task in tasks)
+        return "".join(self._full_entry(number, task)
+                       for number, task in enumerate(tasks, start))
+    
+    def render_stream(self, pages: Iterable[Sequence[Task]]) -> Iterator[str]:
+        """Format pages of tasks one at a time as a single document.
+        
+        Each page is only fetched once the text before it was consumed. In
+        json the pages form one array, so the output still parses.
+        """
+        number = 1
+        for tasks in pages:
+            if self.fmt == 'json':
+                records = (json.dumps(task_record(task), ensure_ascii=False) for task in tasks)
+                yield ("[" if number == 1 else ", ") + ", ".join(records)
+            else:
+                yield self.render(tasks, start=number)
+            number += len(tasks)
+        if self.fmt == 'json':
+            yield "[]\n" if number == 1 else "]\n"
+    
+    def table_header(self) -> str:
+        return f"{'ID':>7}  {'Status':<11}  {'Priority':<8}  {'Due':<10}  Title\n"
+    
+    def _table_row(self, task: Task) -> str:
+        due = DateUtils.format_date(task.due_date) if task.due_date else "-"
+        return (f"{task.task_id:>7}  {task.status:<11}  {task.priority_level:<8}  "
+                f"{due:<10}  {task.title}\n")
+    
+    def _due_info(self, task: Task) -> str:
+        due_info = f"Due: {DateUtils.format_date(task.due_date)}"
+        days_left = DateUtils.days_until_due(task.due_date, self.today)
+        if days_left is not None:
+            if days_left < 0:
+                due_info += " 📅 OVERDUE!"
+            elif days_left == 0:
+                due_info += " 📅 Due today!"
+            elif days_left <= 3:
+                due_info += f" 📅 {days_left} days left!"
+        return due_info
+    
+    def _full_entry(self, number: int, task: Task) -> str:
+        status_icon = STATUS_ICONS.get(task.status, "⏳")
+        priority_icon = PRIORITY_ICONS.get(task.priority_level, "🔷")
+        lines = [
+            f"{number:2d}. {status_icon} {priority_icon} {task.title}",
+            f"     ID: {task.task_id} | Status: {task.status} | Priority: {task.priority_level}",
+            f"     {self._due_info(task)}",
+        ]
+        if task.description:
+            ellipsis = '...' if len(task.description) > 100 else ''
+            lines.append(f"     Description: {task.description[:100]}{ellipsis}")
+        lines.append(RULE)
+        return "\n".join(lines) + "\n"
+    
+    def render_search(self, hits: Sequence['SearchHit'], start: int = 1) -> str:
+        """Format search hits: title plus the excerpt the search engine highlighted."""
+        if self.fmt != 'full':
+            return self.render([hit.task for hit in hits], start)
+        parts: List[str] = []
+        for number, hit in enumerate(hits, start):
+            status_icon = STATUS_ICONS.get(hit.task.status, "⏳")
+            parts.append(f"{number:2d}. {status_icon} {hit.task.title} (ID: {hit.task.task_id})\n")
+            if hit.excerpt:
+                parts.append(f"     {hit.excerpt}\n")
+            parts.append(RULE + "\n")
+        return "".join(parts)
\ No newline at end of file
@@ -0,0 +1,223 @@
+import heapq
+import re
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from .models import Task
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Markers placed around the matched text in search excerpts
+HIGHLIGHT_START = "**"
+HIGHLIGHT_END = "**"
+EXCERPT_BEFORE = 20
+EXCERPT_AFTER = 50
+
+# Title relevance: the keyword opening the title beats it appearing later in
+# the title, which beats a match in the description only
+TITLE_PREFIX_SCORE = 2
+TITLE_SCORE = 1
+DESCRIPTION_SCORE = 0
+
+class SearchHit(NamedTuple):
+    task: Task
+    score: int
+    excerpt: str  # Highlighted text around the match, or '' when only the title matched
+
+def match_score(task: Task, keyword: str) -> int:
+    """Relevance of a matching task for keyword (lower-cased)."""
+    title = task.title.lower()
+    if title.startswith(keyword):
+        return TITLE_PREFIX_SCORE
+    if keyword in title:
+        return TITLE_SCORE
+    return DESCRIPTION_SCORE
+
+def highlight_excerpt(text: Optional[str], keyword: str) -> str:
+    """The part of text around the first occurrence of keyword (lower-cased), highlighted."""
+    if not text or not keyword:
+        return ""
+    position = text.lower().find(keyword)
+    if position < 0:
+        return ""
+    end = position + len(keyword)
+    start = max(0, position - EXCERPT_BEFORE)
+    stop = min(len(text), end + EXCERPT_AFTER)
+    return (("..." if start else "") + text[start:position]
+            + HIGHLIGHT_START + text[position:end] + HIGHLIGHT_END
+            + text[end:stop] + ("..." if stop < len(text) else ""))
+
+def hit_order(score: int, task: Task) -> Tuple[Any, ...]:
+    """Ranking key: best score first, then list order (priority, due date, task_id)."""
+    return (-score, task.sort_key, task.task_id or 0)
+
+def rank_hits(tasks: Iterable[Task], keyword: str, limit: Optional[int] = None,
+              scores: Optional[Dict[int, int]] = None) -> List[SearchHit]:
+    """Rank matching tasks and build excerpts for the top limit only.
+    
+    scores maps task_id to an already computed score (e.g. from SQL); other
+    tasks are scored here.
+    """
+    keyword = keyword.lower()
+    scored = [(scores[task.task_id] if scores and task.task_id in scores
+               else match_score(task, keyword), task) for task in tasks]
+    if limit is None:
+        scored.sort(key=lambda item: hit_order(*item))
+    else:
+        scored = heapq.nsmallest(limit, scored, key=lambda item: hit_order(*item))
+    return [SearchHit(task, score, highlight_excerpt(task.description, keyword))
+            for score, task in scored]
+
+def hits_from_rows(rows: List[Dict[str, Any]], keyword: str) -> List[SearchHit]:
+    """Hits for rows scored by query.ranked_search_query."""
+    scores = {row['task_id']: row['score'] for row in rows}
+    return rank_hits((Task.from_row(row) for row in rows), keyword, scores=scores)
+
+def fulltext_hits(tasks: List[Task], keyword: str) -> List[SearchHit]:
+    """Hits for FULLTEXT results, keeping the server's relevance order."""
+    keyword = keyword.lower()
+    return [SearchHit(task, match_score(task, keyword), highlight_excerpt(task.description, keyword))
+            for task in tasks]
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+class SearchIndex:
+    """Inverted index over task titles and descriptions.
+    
+    Tasks are indexed by word token, and the (much smaller) token vocabulary
+    is indexed by trigram. A substring search finds the vocabulary tokens
+    containing each word of the keyword, unions their postings and only
+    re-checks the stored text when the keyword spans several words. Prefix
+    searches walk the sorted vocabulary.
+    """
+    
+    def __init__(self):
+        self._text: Dict[int, str] = {}
+        self._tokens: Dict[str, Set[int]] = {}
+        self._token_grams: Dict[str, Set[str]] = {}
+        self._sorted_tokens: List[str] = []
+    
+    def __len__(self) -> int:
+        return len(self._text)
+    
+    @staticmethod
+    def _haystack(task: Task) -> str:
+        return f"{task.title}\n{task.description or ''}".lower()
+    
+    def clear(self) -> None:
+        self._text.clear()
+        self._tokens.clear()
+        self._token_grams.clear()
+        self._sorted_tokens.clear()
+    
+    def build(self, tasks: Iterable[Task]) -> None:
+        """Index tasks from scratch."""
+        self.clear()
+        tokens = self._tokens
+        for task in tasks:
+            text = self._haystack(task)
+            self._text[task.task_id] = text
+            for token in set(TOKEN_PATTERN.findall(text)):
+                postings = tokens.get(token)
+                if postings is None:
+                    tokens[token] = {task.task_id}
+                else:
+                    postings.add(task.task_id)
+        
+        for token in tokens:
+            for gram in _trigrams(token):
+                self._token_grams.setdefault(gram, set()).add(token)
+        self._sorted_tokens = sorted(tokens)
+    
+    def add(self, task: Task) -> None:
+        """Index one task (re-indexing it if already present)."""
+        if task.task_id in self._text:
+            self.remove(task.task_id)
+        
+        text = self._haystack(task)
+        self._text[task.task_id] = text
+        for token in set(TOKEN_PATTERN.findall(text)):
+            postings = self._tokens.get(token)
+            if postings is None:
+                postings = self._tokens[token] = set()
+                for gram in _trigrams(token):
+                    self._token_grams.setdefault(gram, set()).add(token)
+                insort(self._sorted_tokens, token)
+            postings.add(task.task_id)
+    
+    def remove(self, task_id: int) -> None:
+        """Drop a task from the index."""
+        text = self._text.pop(task_id, None)
+        if text is None:
+            return
+        
+        for token in set(TOKEN_PATTERN.findall(text)):
+            postings = self._tokens[token]
+            postings.discard(task_id)
+            if postings:
+                continue
+            del self._tokens[token]
+            del self._sorted_tokens[bisect_left(self._sorted_tokens, token)]
+            for gram in _trigrams(token):
+                vocabulary = self._token_grams[gram]
+                vocabulary.discard(token)
+                if not vocabulary:
+                    del self._token_grams[gram]
+    
+    def _tokens_containing(self, fragment: str) -> List[str]:
+        """Vocabulary tokens that contain fragment."""
+        if len(fragment) < 3:
+            return [token for token in self._tokens if fragment in token]
+        
+        candidates = None
+        # Intersect starting from the rarest trigram to keep the working set small
+        for vocabulary in sorted((self._token_grams.get(gram, set())
+                                  for gram in _trigrams(fragment)), key=len):
+            candidates = set(vocabulary) if candidates is None else candidates & vocabulary
+            if not candidates:
+                return []
+        return [token for token in candidates if fragment in token]
+    
+    def _postings_containing(self, fragment: str) -> Set[int]:
+        matches: Set[int] = set()
+        for token in self._tokens_containing(fragment):
+            matches |= self._tokens[token]
+        return matches
+    
+    def search(self, keyword: str) -> Set[int]:
+        """IDs of tasks whose title or description contains keyword (case-insensitive)."""
+        keyword = keyword.lower()
+        if not keyword:
+            return set()
+        
+        words = TOKEN_PATTERN.findall(keyword)
+        if not words:
+            return {task_id for task_id, text in self._text.items() if keyword in text}
+        if len(words) == 1 and words[0] == keyword:
+            return self._postings_containing(keyword)
+        
+        # Multi-word keyword: every word must occur somewhere, then confirm the
+        # exact phrase against the few remaining candidates
+        candidates = None
+        for word in sorted(set(words), key=len, reverse=True):
+            matches = self._postings_containing(word)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return set()
+        return {task_id for task_id in candidates if keyword in self._text[task_id]}
+    
+    def search_prefix(self, prefix: str) -> Set[int]:
+        """IDs of tasks containing a word that starts with prefix (case-insensitive)."""
+        prefix = prefix.lower()
+        if not prefix:
+            return set()
+        
+        matches: Set[int] = set()
+        position = bisect_left(self._sorted_tokens, prefix)
+        while position < len(self._sorted_tokens):
+            token = self._sorted_tokens[position]
+            if not token.startswith(prefix):
+                break
+            matches |= self._tokens[token]
+            position += 1
+        return matches
\ No newline at end of file
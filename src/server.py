@@ -0,0 +1,296 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from .auth import AuthenticationManager
+from .cache import TenantCache
+from .config import CacheConfig
+from .context import user_context
+from .models import Task
+from .query import UPDATABLE_FIELDS
+from .task_manager import TaskManager
+from .transfer import task_record
+from .utils import InputValidator
+
+if TYPE_CHECKING:
+    from .database import DatabaseConnection
+
+# (method, path pattern, handler method); path groups become handler arguments
+ROUTES = (
+    ('GET', r'/tasks', '_list_tasks'),
+    ('POST', r'/tasks', '_add_tasks'),
+    ('POST', r'/tasks/complete', '_complete_tasks'),
+    ('GET', r'/tasks/(\d+)', '_get_task'),
+    ('PATCH', r'/tasks/(\d+)', '_update_task'),
+    ('DELETE', r'/tasks/(\d+)', '_delete_task'),
+    ('GET', r'/search', '_search'),
+    ('GET', r'/stats', '_stats'),
+)
+COMPILED_ROUTES = [(method, re.compile(pattern + r'/?'), name) for method, pattern, name in ROUTES]
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+class ApiError(Exception):
+    """Turned into a JSON error response with the given HTTP status."""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+def _positive_int(value: str, name: str) -> int:
+    if not value.isdigit() or int(value) <= 0:
+        raise ApiError(400, f"{name} must be a positive integer")
+    return int(value)
+
+def _task_fields(data: Any) -> Dict[str, Any]:
+    """Updatable task fields from a JSON object, with due_date parsed."""
+    if not isinstance(data, dict):
+        raise ApiError(400, "Expected a JSON object")
+    unknown = set(data) - UPDATABLE_FIELDS
+    if unknown:
+        raise ApiError(400, f"Unknown field(s): {', '.join(sorted(unknown))}")
+    fields = dict(data)
+    if fields.get('due_date'):
+        if not isinstance(fields['due_date'], str):
+            raise ApiError(400, "due_date must be a date string")
+        fields['due_date'] = InputValidator.validate_filter_date(fields['due_date'])
+    return fields
+
+class TaskApiHandler(BaseHTTPRequestHandler):
+    """JSON endpoints over TaskManager; see ROUTES.
+    
+    Every request carries "Authorization: Bearer <token>" (a token from
+    "task-manager token") and runs the server's TaskManager inside a
+    user_context for that token's user, so concurrent requests never share
+    a login and each user's tasks are cached in their own partition.
+    Responses always have a Content-Length, so clients can keep the
+    connection open for further requests (HTTP/1.1 keep-alive).
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    server: 'TaskApiServer'
+    
+    def setup(self) -> None:
+        # Idle keep-alive connections are closed after this many seconds,
+        # which frees their worker
+        self.timeout = self.server.keep_alive_timeout
+        super().setup()
+    
+    def do_GET(self) -> None:
+        self._dispatch('GET')
+    
+    def do_POST(self) -> None:
+        self._dispatch('POST')
+    
+    def do_PUT(self) -> None:
+        self._dispatch('PUT')
+    
+    def do_PATCH(self) -> None:
+        self._dispatch('PATCH')
+    
+    def do_DELETE(self) -> None:
+        self._dispatch('DELETE')
+    
+    def _dispatch(self, method: str) -> None:
+        try:
+            # Read the body first so the connection stays usable after an error
+            body = self._read_body()
+            url = urlsplit(self.path)
+            handler, args = self._route(method, url.path)
+            user = self._authenticate()
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            with user_context(user['user_id'], user['username']):
+                # Pick up writes made by other processes (CLI, other servers) first
+                self.server.task_manager.sync_tasks()
+                status, payload = handler(self.server.task_manager, params, body, *args)
+        except ApiError as e:
+            status, payload = e.status, {'error': e.message}
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        except Exception as e:
+            self.log_error("Unhandled error for %s %s: %s", method, self.path, e)
+            status, payload = 500, {'error': "Internal server error"}
+        self._send_json(status, payload)
+    
+    def _read_body(self) -> Any:
+        header = (self.headers.get('Content-Length') or '0').strip()
+        if not header.isdigit():
+            # The body's end is unknown, so the connection cannot be reused
+            self.close_connection = True
+            raise ApiError(400, "Content-Length must be a non-negative integer")
+        length = int(header)
+        if length > MAX_BODY_SIZE:
+            self.close_connection = True
+            raise ApiError(413, "Request body too large")
+        if not length:
+            return None
+        raw = self.rfile.read(length)
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise ApiError(400, "Request body is not valid JSON")
+    
+    def _route(self, method: str, path: str):
+        allowed = []
+        for route_method, pattern, name in COMPILED_ROUTES:
+            match = pattern.fullmatch(path)
+            if match:
+                if route_method == method:
+                    return getattr(self, name), [int(group) for group in match.groups()]
+                allowed.append(route_method)
+        if allowed:
+            raise ApiError(405, f"Use {', '.join(allowed)} for {path}")
+        raise ApiError(404, f"No such endpoint: {path}")
+    
+    def _authenticate(self) -> Dict[str, Any]:
+        scheme, _, token = (self.headers.get('Authorization') or '').partition(' ')
+        if scheme.lower() != 'bearer' or not token:
+            raise ApiError(401, "Send 'Authorization: Bearer <token>'")
+        try:
+            return self.server.auth.verify_token(token)
+        except ValueError as e:
+            raise ApiError(401, str(e))
+    
+    def _send_json(self, status: int, payload: Any) -> None:
+        data = json.dumps(payload, ensure_ascii=False, default=str).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        if status == 401:
+            self.send_header('WWW-Authenticate', 'Bearer')
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.log_requests:
+            super().log_message(format, *args)
+    
+    def _list_tasks(self, manager: TaskManager, params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        filters: Dict[str, Any] = {}
+        for key in ('status', 'priority'):
+            if key in params:
+                filters[key] = params[key]
+        for key in ('due_date', 'due_before', 'due_after'):
+            if key in params:
+                filters[key] = InputValidator.validate_filter_date(params[key])
+        limit = _positive_int(params['limit'], 'limit') if 'limit' in params else None
+        
+        tasks = manager.list_tasks(filters, limit=limit, after_cursor=params.get('after'))
+        more = limit is not None and len(tasks) == limit
+        return 200, {'tasks': [task_record(task) for task in tasks],
+                     'next': manager.page_cursor(tasks[-1]) if more else None}
+    
+    def _add_tasks(self, manager: TaskManager, params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        specs = body if isinstance(body, list) else [body]
+        if not specs:
+            raise ApiError(400, "Expected at least one task")
+        tasks: List[Task] = []
+        for number, spec in enumerate(specs, 1):
+            fields = _task_fields(spec)
+            try:
+                tasks.append(Task(**fields))
+            except (ValueError, TypeError) as e:
+                raise ApiError(400, f"Task #{number}: {e}")
+        
+        task_ids = manager.add_tasks(tasks)
+        if not task_ids:
+            raise ApiError(500, "Tasks could not be added")
+        return 201, {'task_ids': task_ids}
+    
+    def _complete_tasks(self, manager: TaskManager, params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        task_ids = body.get('task_ids') if isinstance(body, dict) else None
+        if not isinstance(task_ids, list) or not all(
+                isinstance(task_id, int) and task_id > 0 for task_id in task_ids):
+            raise ApiError(400, "Expected {\"task_ids\": [positive integers]}")
+        results = manager.complete_tasks(task_ids)
+        return 200, {'completed': [task_id for task_id, done in results.items() if done],
+                     'not_found': [task_id for task_id, done in results.items() if not done]}
+    
+    def _get_task(self, manager: TaskManager, params: Dict[str, str], body: Any,
+                  task_id: int) -> Tuple[int, Any]:
+        task = manager.get_task(task_id)
+        if task is None:
+            raise ApiError(404, f"Task {task_id} not found")
+        return 200, task_record(task)
+    
+    def _update_task(self, manager: TaskManager, params: Dict[str, str], body: Any,
+                     task_id: int) -> Tuple[int, Any]:
+        fields = _task_fields(body)
+        Task.validate_fields(**fields)
+        if manager.get_task(task_id) is None:
+            raise ApiError(404, f"Task {task_id} not found")
+        if not manager.update_task(task_id, **fields):
+            raise ApiError(500, f"Task {task_id} could not be updated")
+        return 200, task_record(manager.get_task(task_id))
+    
+    def _delete_task(self, manager: TaskManager, params: Dict[str, str], body: Any,
+                     task_id: int) -> Tuple[int, Any]:
+        if not manager.delete_task(task_id):
+            raise ApiError(404, f"Task {task_id} not found")
+        return 200, {'deleted': task_id}
+    
+    def _search(self, manager: TaskManager, params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        keyword = params.get('q', '').strip()
+        if not keyword:
+            raise ApiError(400, "Missing search keyword 'q'")
+        limit = _positive_int(params['limit'], 'limit') if 'limit' in params else None
+        hits = manager.search_hits(keyword, limit=limit, prefix=params.get('prefix') == '1')
+        return 200, {'hits': [{'task': task_record(hit.task), 'score': hit.score,
+                               'excerpt': hit.excerpt} for hit in hits]}
+    
+    def _stats(self, manager: TaskManager, params: Dict[str, str], body: Any) -> Tuple[int, Any]:
+        return 200, manager.get_statistics()
+
+class TaskApiServer(HTTPServer):
+    """HTTP server that hands each connection to a fixed pool of worker threads.
+    
+    A keep-alive connection holds its worker until it closes or sits idle
+    for keep_alive_timeout seconds; further connections wait for a free
+    worker. The DatabaseConnection must be pooled to serve workers in parallel.
+    """
+    
+    def __init__(self, address: Tuple[str, int], db: 'DatabaseConnection', workers: int = 8,
+                 keep_alive_timeout: float = 15.0, log_requests: bool = False,
+                 cache_ttl: Optional[float] = None):
+        super().__init__(address, TaskApiHandler)
+        self.db = db
+        # Only used to verify tokens; it never logs in
+        self.auth = AuthenticationManager(db)
+        # Shared by every request; each runs in the user_context of its token. Its
+        # own short-lived tenants bound staleness where incremental sync is unavailable
+        ttl = CacheConfig.API_CACHE_TTL if cache_ttl is None else cache_ttl
+        self.task_manager = TaskManager(db, self.auth, tenant_cache=TenantCache(ttl=ttl))
+        self.keep_alive_timeout = keep_alive_timeout
+        self.log_requests = log_requests
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='task-api')
+    
+    def process_request(self, request, client_address) -> None:
+        self._workers.submit(self._process, request, client_address)
+    
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+    
+    def server_close(self) -> None:
+        super().server_close()
+        self._workers.shutdown(wait=True)
+
+def serve(db: 'DatabaseConnection', host: str = '127.0.0.1', port: int = 8080,
+          workers: int = 8, log_requests: bool = False) -> None:
+    """Run the API server until interrupted."""
+    server = TaskApiServer((host, port), db, workers=workers, log_requests=log_requests)
+    print(f"🌐 Serving the task API on http://{host}:{server.server_port} ({workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
\ No newline at end of file
@@ -1,57 +1,168 @@
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Callable, List, Optional, Dict, Any, Iterable
 from datetime import date, datetime
-import threading
-from .models import Task
-from .database import DatabaseConnection
-from .auth import AuthenticationManager
+import time
+from contextlib import closing
+from .models import Task, TaskBatch
+from .cache import (TaskCache, TenantCache, can_sync, is_warm, latest_value, merge_changes,
+                    page_cursor, parse_cursor, sync_since)
+from .config import CacheConfig, DatabaseConfig
+from .context import current_user
+from .query import (CHANGES_QUERY, LOAD_QUERY, PURGE_TOMBSTONES_QUERY, STATISTICS_FIELDS,
+                    STATISTICS_QUERY, TOMBSTONE_PURGE_INTERVAL, TOMBSTONES_QUERY, UPDATABLE_FIELDS,
+                    TaskQuery, assign_ids, fulltext_query, insert_statement, keyword_condition,
+                    matches_filters, paginate, ranked_search_query, tasks_from_specs)
+from .search import SearchHit, fulltext_hits, hits_from_rows, rank_hits
+
+if TYPE_CHECKING:
+    from .database import DatabaseConnection
+    from .auth import AuthenticationManager
 
 class TaskManager:
-    """Manages task operations with database persistence and user isolation."""
+    """Manages task operations with database persistence and user isolation.
+    
+    Each call acts for the user of the active context.user_context, else
+    for the user logged in to auth_manager, so one manager can serve
+    interleaved calls from many users. Cached tasks are partitioned per
+    user in a TenantCache, by default the one shared by every manager on
+    db_connection, so a user's partition outlives their session and is
+    reused on their next login. A partition is loaded the first time its
+    user is served, and reloaded once the TenantCache evicted or expired it.
+    """
     
-    def __init__(self, db_connection: DatabaseConnection, auth_manager: AuthenticationManager):
+    def __init__(self, db_connection: 'DatabaseConnection', auth_manager: 'AuthenticationManager',
+                 cache_statistics: bool = False, cache_limit: Optional[int] = None,
+                 tenant_cache: Optional[TenantCache] = None):
         self.db = db_connection
         self.auth = auth_manager
-        self._tasks: List[Task] = []
-        self._lock = threading.Lock()
-        self._load_tasks()
+        self.cache_statistics = cache_statistics
+        # Most recent tasks kept in memory; larger accounts page from the database
+        self.cache_limit = CacheConfig.TASK_CACHE_LIMIT if cache_limit is None else cache_limit
+        # user_id -> that user's cached tasks
+        self._tenants = TenantCache.shared(db_connection) if tenant_cache is None else tenant_cache
+        # time.monotonic() of the last tombstone purge
+        self._purged_at: Optional[float] = None
+        # Shared with every manager on the same TenantCache, as they share partitions
+        self._lock = self._tenants.lock
+        self.warm_up()
     
-    def _load_tasks(self) -> None:
-        """Load current user's tasks from database into memory."""
-        if not self.auth.is_authenticated():
-            with self._lock:
-                self._tasks.clear()
-            return
-            
+    def _user_id(self) -> Optional[int]:
+        """The user this call acts for (see the class docstring), or None."""
+        context = current_user()
+        if context is not None:
+            return context.user_id
+        return self.auth.get_current_user_id() if self.auth.is_authenticated() else None
+    
+    def _cache_for(self, user_id: int) -> TaskCache:
+        """The cache partition of user_id, loaded on first use; call without the lock."""
+        if self.cache_limit <= 0:
+            # With caching disabled every read goes to MySQL; this one stays cold
+            return TaskCache()
+        with self._lock:
+            cache = self._tenants.get(user_id)
+            if cache is not None:
+                return cache
+            cache = TaskCache()
+            self._tenants.put(user_id, cache)
+        self._load_tasks(user_id, cache)
+        return cache
+    
+    def warm_up(self) -> None:
+        """Load the current user's partition unless it is already cached (e.g. on login)."""
+        user_id = self._user_id()
+        if user_id is not None:
+            self._cache_for(user_id)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Metrics of the TenantCache behind this manager (see TenantCache.stats)."""
+        return self._tenants.stats()
+    
+    def _load_tasks(self, user_id: int, cache: TaskCache) -> None:
+        """Load the user's most recent tasks (up to cache_limit) into their partition."""
+        writes = self._tenants.write_count(user_id)
         try:
-            user_id = self.auth.get_current_user_id()
-            query = "SELECT * FROM tasks WHERE user_id = %s ORDER BY creation_timestamp DESC"
-            results = self.db.fetch_all(query, (user_id,))
+            # One extra row tells us whether the account fits in the cache
+            query = LOAD_QUERY
             
-            with self._lock:
-                self._tasks.clear()
-                for task_data in results:
-                    if task_data.get('due_date'):
-                        task_data['due_date'] = task_data['due_date']
+            # Rows are streamed and turned into Tasks one at a time rather than
+            # materializing the whole result set first
+            tasks = []
+            complete = True
+            watermark = None
+            with closing(self.db.fetch_iter(query, (user_id, self.cache_limit + 1))) as rows:
+                for task_data in rows:
+                    if len(tasks) == self.cache_limit:
+                        complete = False
+                        break
+                    watermark = latest_value(watermark, [task_data], 'updated_at')
                     if task_data.get('creation_timestamp'):
                         if isinstance(task_data['creation_timestamp'], str):
                             task_data['creation_timestamp'] = datetime.fromisoformat(
                                 task_data['creation_timestamp'].replace('Z', '+00:00')
                             )
                     
-                    task = Task.from_dict(task_data)
-                    self._tasks.append(task)
+                    tasks.append(Task.from_row(task_data))
+            
+            tasks.reverse()
+            with self._lock:
+                # A write that raced the query may be missing from the rows, so
+                # such a partition is not trusted to answer reads on its own
+                written = self._tenants.write_count(user_id) != writes
+                cache.load(tasks, complete=complete and not written, watermark=watermark)
+                self._tenants.resize(user_id)
+                if written:
+                    # Dropped, so the next read loads it again
+                    self._tenants.discard(user_id, cache)
         except Exception as e:
             print(f"Error loading tasks: {e}")
     
+    def _sync_tasks(self, user_id: int, cache: TaskCache) -> bool:
+        """Merge rows changed since the partition's watermark; False if it needs a full reload."""
+        since = sync_since(cache)
+        writes = self._tenants.write_count(user_id)
+        try:
+            rows = self.db.fetch_all(CHANGES_QUERY, (user_id, since))
+            tombstones = self.db.fetch_all(TOMBSTONES_QUERY, (user_id, since))
+        except Exception as e:
+            print(f"Error syncing tasks: {e}")
+            return False
+        
+        with self._lock:
+            # As in _load_tasks, rows read before a racing write may be stale
+            if self._tenants.write_count(user_id) != writes:
+                return False
+            merge_changes(cache, rows, tombstones, self.cache_limit)
+            self._tenants.resize(user_id)
+            self._tenants.renew(user_id)
+            if rows or tombstones:
+                self._tenants.drop_statistics(user_id)
+        
+        if self._purge_due():
+            self.purge_tombstones()
+        return True
+    
+    def purge_tombstones(self) -> int:
+        """Delete tombstones older than TASK_TOMBSTONE_RETENTION_HOURS; returns how many."""
+        self._purged_at = time.monotonic()
+        try:
+            cursor = self.db.execute_query(PURGE_TOMBSTONES_QUERY,
+                                           (CacheConfig.TASK_TOMBSTONE_RETENTION_HOURS,))
+            return cursor.rowcount if cursor else 0
+        except Exception as e:
+            print(f"Error purging tombstones: {e}")
+            return 0
+    
+    def _purge_due(self) -> bool:
+        return self._purged_at is None or time.monotonic() - self._purged_at >= TOMBSTONE_PURGE_INTERVAL
+    
     def add_task(self, title: str, description: str = "", due_date: Optional[date] = None,
                 priority_level: str = "Medium") -> bool:
         """Add a new task for the current user."""
-        if not self.auth.is_authenticated():
+        user_id = self._user_id()
+        if user_id is None:
             print("❌ Please log in to add tasks")
             return False
             
         try:
-            user_id = self.auth.get_current_user_id()
             task = Task(title=title, description=description, 
                        due_date=due_date, priority_level=priority_level)
             
@@ -67,8 +178,8 @@ class TaskManager:
                 task_id = cursor.lastrowid
                 task._task_id = task_id
                 
-                with self._lock:
-                    self._tasks.insert(0, task)
+                self._update_cache(user_id, lambda cache: cache.add(task))
+                self._invalidate_statistics(user_id)
                 
                 print(f"✅ Task added successfully with ID: {task_id}")
                 return True
@@ -78,284 +189,428 @@ class TaskManager:
             print(f"Error adding task: {e}")
             return False
     
+    def add_tasks(self, specs: Iterable[Dict[str, Any]],
+                  chunk_size: Optional[int] = None) -> List[int]:
+        """Add many tasks for the current user in a single transaction.
+        
+        Each spec is a dict of add_task keyword arguments, or an already
+        validated Task (whose status is kept). Every spec is validated
+        before anything is written; if any is invalid nothing is
+        inserted. Rows are written chunk_size at a time, one multi-row INSERT
+        per chunk. Returns the new task IDs in spec order (empty on failure).
+        """
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to add tasks")
+            return []
+        
+        chunk_size = DatabaseConfig.BULK_CHUNK_SIZE if chunk_size is None else chunk_size
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        
+        tasks = tasks_from_specs(specs)
+        if not tasks:
+            return []
+        
+        try:
+            with self.db.transaction() as connection:
+                for start in range(0, len(tasks), chunk_size):
+                    self._insert_chunk(connection, user_id, tasks[start:start + chunk_size])
+        except Exception as e:
+            print(f"Error adding tasks: {e}")
+            return []
+        
+        def add_to_cache(cache: TaskCache) -> None:
+            if len(cache) + len(tasks) <= self.cache_limit:
+                cache.add_many(tasks)
+            else:
+                # Past the cache limit the account is served from MySQL instead
+                cache.complete = False
+        self._update_cache(user_id, add_to_cache)
+        self._invalidate_statistics(user_id)
+        
+        print(f"✅ {len(tasks)} tasks added successfully")
+        return [task.task_id for task in tasks]
+    
+    @classmethod
+    def _insert_chunk(cls, connection, user_id: int, tasks: List[Task]) -> None:
+        """Insert tasks with one statement and assign their IDs."""
+        with connection.cursor() as cursor:
+            cursor.execute(*insert_statement(user_id, tasks))
+            assign_ids(cursor, tasks)
+    
     def get_task(self, task_id: int) -> Optional[Task]:
         """Retrieve a task by ID (only if owned by current user)."""
-        if not self.auth.is_authenticated():
+        user_id = self._user_id()
+        if user_id is None:
             return None
-            
-        user_id = self.auth.get_current_user_id()
         
+        # A partition only ever holds its user's tasks, so a hit is already owned
+        cache = self._cache_for(user_id)
         with self._lock:
-            for task in self._tasks:
-                if task.task_id == task_id:
-                    if self._verify_task_ownership(task_id, user_id):
-                        return task
-                    return None
-        
-        if self._verify_task_ownership(task_id, user_id):
-            task_data = self.db.fetch_one("SELECT * FROM tasks WHERE task_id = %s", (task_id,))
-            if task_data:
-                task = Task.from_dict(task_data)
-                with self._lock:
-                    self._tasks.append(task)
-                return task
+            task = cache.get(task_id)
+        if task is not None:
+            return task
+        
+        task_data = self.db.fetch_one(
+            "SELECT * FROM tasks WHERE task_id = %s AND user_id = %s",
+            (task_id, user_id)
+        )
+        if task_data:
+            task = Task.from_row(task_data)
+            self._update_cache(user_id, lambda cache: cache.add(task))
+            return task
         
         return None
     
-    def _verify_task_ownership(self, task_id: int, user_id: int) -> bool:
-        """Verify that the current user owns the specified task."""
-        try:
-            result = self.db.fetch_one(
-                "SELECT user_id FROM tasks WHERE task_id = %s", 
-                (task_id,)
-            )
-            return result and result['user_id'] == user_id
-        except Exception:
-            return False
-    
     def update_task(self, task_id: int, **kwargs) -> bool:
         """Update task details (only if owned by current user)."""
-        if not self.auth.is_authenticated():
+        user_id = self._user_id()
+        if user_id is None:
             print("❌ Please log in to update tasks")
             return False
             
         try:
-            user_id = self.auth.get_current_user_id()
+            updates = {k: v for k, v in kwargs.items() if k in UPDATABLE_FIELDS}
             
-            if not self._verify_task_ownership(task_id, user_id):
-                print(f"❌ Task with ID {task_id} not found or access denied")
-                return False
-            
-            task = self.get_task(task_id)
-            if not task:
-                return False
+            if not updates:
+                print("ℹ️  No changes made")
+                return True
             
-            allowed_fields = {'title', 'description', 'due_date', 'priority_level', 'status'}
-            updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+            Task.validate_fields(**updates)
             
-            for field, value in updates.items():
-                setattr(task, field, value)
+            # Ownership is enforced by the WHERE clause: no matched row means the
+            # task does not exist or belongs to someone else
+            set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
+            query = f"UPDATE tasks SET {set_clause} WHERE task_id = %s AND user_id = %s"
+            params = tuple(updates.values()) + (task_id, user_id)
             
-            if updates:
-                set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
-                query = f"UPDATE tasks SET {set_clause} WHERE task_id = %s AND user_id = %s"
-                params = tuple(updates.values()) + (task_id, user_id)
-                
-                if self.db.execute_query(query, params):
-                    print(f"✅ Task {task_id} updated successfully")
-                    return True
+            cursor = self.db.execute_query(query, params)
+            if not cursor:
                 return False
-            else:
-                print("ℹ️  No changes made")
-                return True
+            if cursor.rowcount == 0:
+                print(f"❌ Task with ID {task_id} not found or access denied")
+                return False
+            
+            self._update_cache(user_id, lambda cache: cache.update(task_id, updates))
+            self._invalidate_statistics(user_id)
+            print(f"✅ Task {task_id} updated successfully")
+            return True
                 
         except Exception as e:
             print(f"Error updating task: {e}")
             return False
     
+    def update_tasks(self, task_ids: Iterable[int], **kwargs) -> Dict[int, bool]:
+        """Apply the same field updates to many tasks (only those owned by current user).
+        
+        Sends one UPDATE per chunk of IDs inside a single transaction and
+        returns whether each task was updated. Rowcount reports how many IDs
+        matched; only when some did not is a follow-up query used to find which.
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        user_id = self._user_id()
+        if user_id is None:
+            print("❌ Please log in to update tasks")
+            return {task_id: False for task_id in task_ids}
+        if not task_ids:
+            return {}
+        
+        updates = {k: v for k, v in kwargs.items() if k in UPDATABLE_FIELDS}
+        if not updates:
+            print("ℹ️  No changes made")
+            return {task_id: True for task_id in task_ids}
+        
+        try:
+            Task.validate_fields(**updates)
+            set_clause = ", ".join([f"{field} = %s" for field in updates.keys()])
+            chunk_size = DatabaseConfig.BULK_CHUNK_SIZE
+            
+            updated = set()
+            with self.db.transaction() as connection:
+                with connection.cursor() as cursor:
+                    for start in range(0, len(task_ids), chunk_size):
+                        chunk = task_ids[start:start + chunk_size]
+                        placeholders = ", ".join(["%s"] * len(chunk))
+                        cursor.execute(
+                            f"UPDATE tasks SET {set_clause} "
+                            f"WHERE user_id = %s AND task_id IN ({placeholders})",
+                            tuple(updates.values()) + (user_id,) + tuple(chunk)
+                        )
+                        if cursor.rowcount == len(chunk):
+                            updated.update(chunk)
+                            continue
+                        cursor.execute(
+                            f"SELECT task_id FROM tasks WHERE user_id = %s AND task_id IN ({placeholders})",
+                            (user_id,) + tuple(chunk)
+                        )
+                        updated.update(row['task_id'] for row in cursor.fetchall())
+        except Exception as e:
+            print(f"Error updating tasks: {e}")
+            return {task_id: False for task_id in task_ids}
+        
+        if updated:
+            def update_cache(cache: TaskCache) -> None:
+                for task_id in updated:
+                    cache.update(task_id, updates)
+            self._update_cache(user_id, update_cache)
+            self._invalidate_statistics(user_id)
+        
+        missing = [task_id for task_id in task_ids if task_id not in updated]
+        if updated:
+            print(f"✅ {len(updated)} task(s) updated successfully")
+        if missing:
+            print(f"❌ Not found or access denied: {', '.join(map(str, missing))}")
+        return {task_id: task_id in updated for task_id in task_ids}
+    
     def delete_task(self, task_id: int) -> bool:
         """Delete a task from the system (only if owned by current user)."""
-        if not self.auth.is_authenticated():
+        user_id = self._user_id()
+        if user_id is None:
             print("❌ Please log in to delete tasks")
             return False
             
         try:
-            user_id = self.auth.get_current_user_id()
-            
-            if not self._verify_task_ownership(task_id, user_id):
+            query = "DELETE FROM tasks WHERE task_id = %s AND user_id = %s"
+            cursor = self.db.execute_query(query, (task_id, user_id))
+            if not cursor:
+                return False
+            if cursor.rowcount == 0:
                 print(f"❌ Task with ID {task_id} not found or access denied")
                 return False
             
-            query = "DELETE FROM tasks WHERE task_id = %s AND user_id = %s"
-            if self.db.execute_query(query, (task_id, user_id)):
-                with self._lock:
-                    self._tasks = [task for task in self._tasks if task.task_id != task_id]
-                print(f"✅ Task {task_id} deleted successfully")
-                return True
-            return False
+            self._update_cache(user_id, lambda cache: cache.remove(task_id))
+            self._invalidate_statistics(user_id)
+            print(f"✅ Task {task_id} deleted successfully")
+            return True
         except Exception as e:
             print(f"Error deleting task: {e}")
             return False
     
-    def list_tasks(self, filters: Optional[Dict[str, Any]] = None) -> List[Task]:
-        """List tasks for current user with optional filtering."""
-        if not self.auth.is_authenticated():
+    def list_tasks(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                   after_cursor: Optional[str] = None) -> List[Task]:
+        """List tasks for current user with optional filtering.
+        
+        Supported filters: status, priority, due_date, due_before, due_after.
+        Tasks are ordered by priority, then due date. Pass limit to get one
+        page, and page_cursor(last_task) as after_cursor to get the next.
+        """
+        user_id = self._user_id()
+        if user_id is None:
             print("❌ Please log in to list tasks")
             return []
-            
-        with self._lock:
-            tasks = self._tasks.copy()
-        
-        if filters:
-            tasks = self._apply_filters(tasks, filters)
         
-        return self._sort_tasks(tasks)
-    
-    def _apply_filters(self, tasks: List[Task], filters: Dict[str, Any]) -> List[Task]:
-        """Apply filters to task list."""
-        filtered_tasks = tasks
-        
-        if 'status' in filters:
-            filtered_tasks = [t for t in filtered_tasks if t.status == filters['status']]
-        
-        if 'priority' in filters:
-            filtered_tasks = [t for t in filtered_tasks if t.priority_level == filters['priority']]
-        
-        if 'due_date' in filters:
-            filtered_tasks = [t for t in filtered_tasks if t.due_date == filters['due_date']]
-        
-        return filtered_tasks
-    
-    def _sort_tasks(self, tasks: List[Task]) -> List[Task]:
-        """Sort tasks by priority and due date using custom sorting algorithm."""
-        if not tasks:
-            return tasks
-        
-        return self._merge_sort(tasks)
-    
-    def _merge_sort(self, tasks: List[Task]) -> List[Task]:
-        """Merge sort implementation for tasks."""
-        if len(tasks) <= 1:
-            return tasks
+        after = parse_cursor(after_cursor) if after_cursor else None
+        predicate = (lambda task: matches_filters(task, filters)) if filters else None
         
-        mid = len(tasks) // 2
-        left = self._merge_sort(tasks[:mid])
-        right = self._merge_sort(tasks[mid:])
+        # A warm cache answers from its sorted view; otherwise the filters are
+        # pushed down to MySQL where the (user_id, ...) indexes apply
+        cache = self._cache_for(user_id)
+        with self._lock:
+            if is_warm(cache):
+                return cache.sorted_page(after, limit, predicate)
         
-        return self._merge(left, right)
+        query, params = TaskQuery(user_id) \
+            .filter(filters or {}).after(after).limit(limit).build()
+        try:
+            results = self.db.fetch_all(query, params)
+            return [Task.from_row(task_data) for task_data in results]
+        except Exception as e:
+            print(f"Error listing tasks: {e}")
+            return []
     
-    def _merge(self, left: List[Task], right: List[Task]) -> List[Task]:
-        """Merge two sorted lists of tasks."""
-        merged = []
-        i = j = 0
-        
-        priority_order = {'High': 3, 'Medium': 2, 'Low': 1}
-        
-        while i < len(left) and j < len(right):
-            left_task = left[i]
-            right_task = right[j]
-            
-            left_priority = priority_order.get(left_task.priority_level, 0)
-            right_priority = priority_order.get(right_task.priority_level, 0)
-            
-            if left_priority > right_priority:
-                merged.append(left_task)
-                i += 1
-            elif left_priority < right_priority:
-                merged.append(right_task)
-                j += 1
-            else:
-                if left_task.due_date and right_task.due_date:
-                    if left_task.due_date < right_task.due_date:
-                        merged.append(left_task)
-                        i += 1
-                    else:
-                        merged.append(right_task)
-                        j += 1
-                elif left_task.due_date:
-                    merged.append(left_task)
-                    i += 1
-                else:
-                    merged.append(right_task)
-                    j += 1
-        
-        merged.extend(left[i:])
-        merged.extend(right[j:])
-        return merged
+    @staticmethod
+    def page_cursor(task: Task) -> str:
+        """Cursor for list_tasks(after_cursor=...) that resumes after task."""
+        return page_cursor(task)
     
     def mark_completed(self, task_id: int) -> bool:
         """Mark a task as completed (only if owned by current user)."""
         return self.update_task(task_id, status='Completed')
     
+    def complete_tasks(self, task_ids: Iterable[int]) -> Dict[int, bool]:
+        """Mark many tasks as completed; see update_tasks."""
+        return self.update_tasks(task_ids, status='Completed')
+    
     def get_statistics(self) -> Dict[str, Any]:
         """Get task statistics for current user."""
-        if not self.auth.is_authenticated():
-            return {
-                'total_tasks': 0,
-                'completed': 0,
-                'pending': 0,
-                'in_progress': 0,
-                'high_priority': 0,
-                'overdue': 0
-            }
+        user_id = self._user_id()
+        if user_id is None:
+            return dict.fromkeys(STATISTICS_FIELDS, 0)
             
-        user_id = self.auth.get_current_user_id()
+        today = date.today()
+        
+        if self.cache_statistics:
+            cached = self._tenants.get_statistics(user_id, today)
+            if cached is not None:
+                return cached
         
+        writes = self._tenants.write_count(user_id)
         try:
-            # Use individual queries to avoid complex SQL syntax issues
-            total_result = self.db.fetch_one("SELECT COUNT(*) as count FROM tasks WHERE user_id = %s", (user_id,))
-            completed_result = self.db.fetch_one("SELECT COUNT(*) as count FROM tasks WHERE user_id = %s AND status = 'Completed'", (user_id,))
-            pending_result = self.db.fetch_one("SELECT COUNT(*) as count FROM tasks WHERE user_id = %s AND status = 'Pending'", (user_id,))
-            in_progress_result = self.db.fetch_one("SELECT COUNT(*) as count FROM tasks WHERE user_id = %s AND status = 'In Progress'", (user_id,))
-            high_priority_result = self.db.fetch_one("SELECT COUNT(*) as count FROM tasks WHERE user_id = %s AND priority_level = 'High'", (user_id,))
-            overdue_result = self.db.fetch_one("SELECT COUNT(*) as count FROM tasks WHERE user_id = %s AND due_date < CURDATE() AND status != 'Completed'", (user_id,))
+            result = self.db.fetch_one(STATISTICS_QUERY, (user_id,))
+            if not result:
+                raise RuntimeError("statistics query returned no result")
             
-            return {
-                'total_tasks': total_result['count'] if total_result else 0,
-                'completed': completed_result['count'] if completed_result else 0,
-                'pending': pending_result['count'] if pending_result else 0,
-                'in_progress': in_progress_result['count'] if in_progress_result else 0,
-                'high_priority': high_priority_result['count'] if high_priority_result else 0,
-                'overdue': overdue_result['count'] if overdue_result else 0
-            }
+            stats = {key: int(result[key] or 0) for key in STATISTICS_FIELDS}
+            
+            with self._lock:
+                # Not cached if a write (by any manager) may have raced the query
+                if self.cache_statistics and self._tenants.write_count(user_id) == writes:
+                    self._tenants.put_statistics(user_id, today, stats)
+            return stats
             
         except Exception as e:
             print(f"Error getting statistics from database: {e}")
-            return self._get_statistics_from_memory()
+            return self._get_statistics_from_memory(user_id)
     
-    def _get_statistics_from_memory(self) -> Dict[str, Any]:
+    def _invalidate_statistics(self, user_id: int) -> None:
+        """Note a write for the given user, dropping statistics cached by any manager."""
+        self._tenants.note_write(user_id)
+    
+    def _update_cache(self, user_id: int, update: Callable[[TaskCache], None]) -> None:
+        """Apply a write to the user's partition, if it has one."""
+        with self._lock:
+            cache = self._tenants.peek(user_id)
+            if cache is not None:
+                update(cache)
+                self._tenants.resize(user_id)
+    
+    def _get_statistics_from_memory(self, user_id: int) -> Dict[str, Any]:
         """Fallback method to calculate statistics from in-memory tasks."""
         with self._lock:
-            total = len(self._tasks)
-            completed = len([t for t in self._tasks if t.status == 'Completed'])
-            pending = len([t for t in self._tasks if t.status == 'Pending'])
-            in_progress = len([t for t in self._tasks if t.status == 'In Progress'])
-            high_priority = len([t for t in self._tasks if t.priority_level == 'High'])
-            overdue = len([t for t in self._tasks if t.due_date and t.due_date < date.today() and t.status != 'Completed'])
-        
-        return {
-            'total_tasks': total,
-            'completed': completed,
-            'pending': pending,
-            'in_progress': in_progress,
-            'high_priority': high_priority,
-            'overdue': overdue
-        }
+            cache = self._tenants.peek(user_id)
+            return cache.statistics() if cache is not None else TaskBatch().statistics()
     
-    def search_tasks(self, keyword: str) -> List[Task]:
-        """Search tasks by keyword in title or description."""
-        if not self.auth.is_authenticated():
+    def search_tasks(self, keyword: str, prefix: bool = False, fulltext: bool = False,
+                     limit: Optional[int] = None, offset: int = 0) -> List[Task]:
+        """Search tasks by keyword in title or description.
+        
+        Matches substrings by default, or word prefixes when prefix=True.
+        Served from the in-memory index when the whole account is cached.
+        With fulltext=True the server-side FULLTEXT index is used instead and
+        results come back ranked by relevance.
+        """
+        user_id = self._user_id()
+        if user_id is None:
             return []
-            
-        user_id = self.auth.get_current_user_id()
+        
+        if fulltext:
+            return self._search_fulltext(user_id, keyword, limit, offset)
+        
+        cache = self._cache_for(user_id)
+        with self._lock:
+            if is_warm(cache):
+                tasks = cache.search(keyword, prefix=prefix)
+                return paginate(tasks, limit, offset)
         
         try:
-            query = """
+            condition, match_params = keyword_condition(keyword, prefix)
+            query = f"""
                 SELECT * FROM tasks 
                 WHERE user_id = %s 
-                AND (title LIKE %s OR description LIKE %s)
+                AND {condition}
                 ORDER BY creation_timestamp DESC
             """
-            search_term = f"%{keyword}%"
-            results = self.db.fetch_all(query, (user_id, search_term, search_term))
+            params = (user_id,) + match_params
+            results = self.db.fetch_all(query, params)
             
             matching_tasks = []
             for task_data in results:
-                task = Task.from_dict(task_data)
+                task = Task.from_row(task_data)
                 matching_tasks.append(task)
             
-            return matching_tasks
+            return paginate(matching_tasks, limit, offset)
             
         except Exception as e:
             print(f"Error searching tasks: {e}")
-            with self._lock:
-                matching_tasks = []
-                for task in self._tasks:
-                    if (keyword.lower() in task.title.lower() or 
-                        keyword.lower() in task.description.lower()):
-                        matching_tasks.append(task)
-                return matching_tasks
+            return []
     
-    def refresh_tasks(self) -> None:
-        """Reload tasks from database (useful after user login/logout)."""
-        self._load_tasks()
\ No newline at end of file
+    def search_hits(self, keyword: str, limit: Optional[int] = None, prefix: bool = False,
+                    fulltext: bool = False) -> List[SearchHit]:
+        """Ranked search results with highlighted description excerpts.
+        
+        Answered from the in-memory index when the whole account is cached,
+        otherwise by a single query that ranks and limits in MySQL. Hits are
+        ordered by title relevance (see search.match_score), then list order;
+        with fulltext=True by FULLTEXT relevance. Excerpts are only built for
+        the hits returned.
+        """
+        user_id = self._user_id()
+        if user_id is None or not keyword:
+            return []
+        
+        if fulltext:
+            return fulltext_hits(self._search_fulltext(user_id, keyword, limit, 0), keyword)
+        
+        cache = self._cache_for(user_id)
+        with self._lock:
+            if is_warm(cache):
+                return rank_hits(cache.matches(keyword, prefix=prefix), keyword, limit)
+        
+        query, params = ranked_search_query(
+            user_id, keyword, prefix, limit)
+        try:
+            results = self.db.fetch_all(query, params)
+        except Exception as e:
+            print(f"Error searching tasks: {e}")
+            return []
+        
+        return hits_from_rows(results, keyword)
+    
+    def _search_fulltext(self, user_id: int, keyword: str, limit: Optional[int], offset: int) -> List[Task]:
+        """Relevance-ranked search through the FULLTEXT index on tasks(title, description)."""
+        statement = fulltext_query(user_id, keyword, limit, offset)
+        if statement is None:
+            return []
+        query, params = statement
+        
+        try:
+            results = self.db.fetch_all(query, params)
+            return [Task.from_row(task_data) for task_data in results]
+        except Exception as e:
+            print(f"Error searching tasks: {e}")
+            return []
+    
+    def sync_tasks(self) -> None:
+        """Merge changes made by other processes into the current user's cached tasks.
+        
+        Cheap enough to call before every request: only rows changed since
+        the last sync are read. A partition that cannot be synced this way
+        (see refresh_tasks) is left to its TTL; one whose sync failed is
+        dropped, so the next read loads it again.
+        """
+        user_id = self._user_id()
+        if user_id is None or self.cache_limit <= 0:
+            return
+        with self._lock:
+            cache = self._tenants.peek(user_id)
+            if not can_sync(cache):
+                return
+        if not self._sync_tasks(user_id, cache):
+            self._tenants.discard(user_id, cache)
+    
+    def refresh_tasks(self, incremental: bool = False) -> None:
+        """Reload the current user's tasks from database, e.g. after a rollback.
+        
+        With incremental=True only the rows changed and the tasks deleted
+        since the partition's last sync (its updated_at watermark) are read
+        and merged in, so the cost follows the volume of changes rather than
+        the size of the account. A partition that is not fully cached or has
+        no watermark yet is reloaded in full.
+        """
+        user_id = self._user_id()
+        if user_id is None:
+            return
+        
+        self._invalidate_statistics(user_id)
+        if self.cache_limit <= 0:
+            return
+        if incremental:
+            with self._lock:
+                cache = self._tenants.peek(user_id)
+                syncable = can_sync(cache)
+            if syncable and self._sync_tasks(user_id, cache):
+                return
+        cache = TaskCache()
+        self._tenants.put(user_id, cache)
+        self._load_tasks(user_id, cache)
\ No newline at end of file
@@ -0,0 +1,164 @@
+import csv
+import json
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, IO, Iterator, List, NamedTuple, Optional
+from contextlib import closing
+from .models import Task
+
+if TYPE_CHECKING:
+    from .database import DatabaseConnection
+    from .task_manager import TaskManager
+
+FORMATS = ('jsonl', 'csv')
+
+# Column order of exported records (Task.to_dict keys)
+EXPORT_FIELDS = ('task_id', 'title', 'description', 'due_date', 'priority_level',
+                 'status', 'creation_timestamp')
+
+class ImportResult(NamedTuple):
+    imported: int
+    # Records consumed so far; pass as offset to resume an unfinished import
+    next_offset: int
+    errors: List[str]
+    finished: bool
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def task_record(task: Task) -> Dict[str, Any]:
+    """Task.to_dict with dates as ISO strings, ready for JSON or CSV."""
+    return {key: _serialize(value) for key, value in task.to_dict().items()}
+
+def export_tasks(db: 'DatabaseConnection', user_id: int, out: IO[str], fmt: str = 'jsonl',
+                 batch_size: int = 1000) -> int:
+    """Write every task of a user to out as JSON lines or CSV; return how many.
+    
+    Rows are streamed through a server-side cursor and written one at a
+    time, so memory use does not grow with the size of the account.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
+    
+    writer = None
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+    
+    query = "SELECT * FROM tasks WHERE user_id = %s ORDER BY task_id"
+    count = 0
+    with closing(db.fetch_iter(query, (user_id,), batch_size=batch_size)) as rows:
+        for row in rows:
+            record = task_record(Task.from_row(row))
+            if writer:
+                writer.writerow(record)
+            else:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+def read_records(source: IO[str], fmt: str = 'jsonl') -> Iterator[Dict[str, Any]]:
+    """Yield raw records from a JSON lines or CSV stream, one at a time."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Format must be one of: {', '.join(FORMATS)}")
+    
+    if fmt == 'csv':
+        yield from csv.DictReader(source)
+        return
+    
+    for line_number, line in enumerate(source, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            # Hand the error to the caller as a record so it is reported, not fatal
+            record = {'_error': f"line {line_number}: invalid JSON ({e})"}
+        if not isinstance(record, dict):
+            record = {'_error': f"line {line_number}: expected a JSON object"}
+        yield record
+
+def _text(record: Dict[str, Any], field: str, default: str) -> str:
+    """A string field of a record; missing, null or empty values give default."""
+    value = record.get(field)
+    if value is None or value == '':
+        return default
+    if not isinstance(value, str):
+        raise ValueError(f"{field} must be a string, not {type(value).__name__}")
+    return value
+
+def record_to_task(record: Dict[str, Any]) -> Task:
+    """Validate an exported record and turn it into a new (unsaved) Task.
+    
+    task_id and creation_timestamp are not carried over. Due dates in the
+    past are accepted, since exports routinely contain overdue tasks.
+    """
+    if '_error' in record:
+        raise ValueError(record['_error'])
+    
+    due_date = _text(record, 'due_date', '') or None
+    if due_date is not None:
+        try:
+            due_date = date.fromisoformat(due_date)
+        except ValueError:
+            raise ValueError(f"Invalid due date: {due_date!r}")
+    
+    fields = {
+        'title': _text(record, 'title', '').strip(),
+        'description': _text(record, 'description', ''),
+        'due_date': due_date,
+        'priority_level': _text(record, 'priority_level', 'Medium'),
+        'status': _text(record, 'status', 'Pending'),
+    }
+    Task.validate_fields(title=fields['title'], priority_level=fields['priority_level'],
+                         status=fields['status'])
+    return Task.from_row(dict(fields, task_id=None))
+
+def import_tasks(task_manager: 'TaskManager', source: IO[str], fmt: str = 'jsonl',
+                 chunk_size: int = 500, offset: int = 0,
+                 progress: Optional[Callable[[int, int], None]] = None) -> ImportResult:
+    """Bulk-insert the records of source for the current user.
+    
+    Records are validated as they are read and inserted chunk_size at a
+    time, each chunk in its own transaction. The first offset records are
+    skipped, so an interrupted import can be resumed from the offset it
+    reported. Invalid records are skipped and described in the returned
+    errors. progress(next_offset, imported) is called after every chunk.
+    If a chunk fails to insert, the import stops with finished=False and
+    next_offset pointing at the start of that chunk.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    
+    imported = 0
+    position = committed = offset
+    chunk: List[Task] = []
+    errors: List[str] = []
+    
+    def flush() -> bool:
+        nonlocal imported, committed
+        if chunk:
+            if not task_manager.add_tasks(chunk, chunk_size=chunk_size):
+                return False
+            imported += len(chunk)
+            chunk.clear()
+        committed = position
+        if progress:
+            progress(committed, imported)
+        return True
+    
+    for position, record in enumerate(read_records(source, fmt), 1):
+        if position <= offset:
+            continue
+        try:
+            chunk.append(record_to_task(record))
+        except ValueError as e:
+            errors.append(f"record {position}: {e}")
+        if len(chunk) >= chunk_size and not flush():
+            return ImportResult(imported, committed, errors, False)
+    
+    position = max(position, offset)
+    finished = flush()
+    return ImportResult(imported, committed, errors, finished)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from datetime import datetime, date
-from typing import Any, Optional
+from typing import Any, Dict, List, Optional
 import re
 
 class InputValidator:
@@ -42,6 +42,16 @@ class InputValidator:
         except ValueError as e:
             raise ValueError(f"Invalid date: {e}")
     
+    @staticmethod
+    def validate_filter_date(date_str: str) -> date:
+        """Parse a date used for filtering (past dates are allowed)."""
+        for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y.%m.%d'):
+            try:
+                return datetime.strptime(date_str, fmt).date()
+            except ValueError:
+                continue
+        raise ValueError("Invalid date format. Use YYYY-MM-DD, DD/MM/YYYY, or MM/DD/YYYY")
+    
     @staticmethod
     def validate_priority(priority: str) -> str:
         """Validate priority level."""
@@ -68,6 +78,38 @@ class InputValidator:
             return task_id_int
         except ValueError:
             raise ValueError("Task ID must be a valid integer")
+    
+    @staticmethod
+    def validate_positive_int(value: str, name: str, allow_zero: bool = False) -> int:
+        """Validate a count or size option such as --limit, naming it in the error."""
+        if not value.strip().isdigit() or int(value) < (0 if allow_zero else 1):
+            kind = "a non-negative" if allow_zero else "a positive"
+            raise ValueError(f"{name} must be {kind} integer")
+        return int(value)
+    
+    @staticmethod
+    def validate_task_ids(spec: str, max_count: int = 10000) -> List[int]:
+        """Parse a task ID list such as "12,13,40-55" (duplicates dropped, order kept)."""
+        task_ids: Dict[int, None] = {}
+        for part in spec.replace(' ', '').split(','):
+            if not part:
+                continue
+            if '-' in part:
+                start_str, _, end_str = part.partition('-')
+                start = InputValidator.validate_task_id(start_str)
+                end = InputValidator.validate_task_id(end_str)
+                if end < start:
+                    raise ValueError(f"Invalid task ID range: {part}")
+                if end - start + 1 > max_count:
+                    raise ValueError(f"Cannot select more than {max_count} tasks at once")
+                task_ids.update(dict.fromkeys(range(start, end + 1)))
+            else:
+                task_ids[InputValidator.validate_task_id(part)] = None
+            if len(task_ids) > max_count:
+                raise ValueError(f"Cannot select more than {max_count} tasks at once")
+        if not task_ids:
+            raise ValueError("At least one task ID is required")
+        return list(task_ids)
 
 class DateUtils:
     """Utility functions for date operations."""
@@ -80,8 +122,8 @@ class DateUtils:
         return dt.strftime('%Y-%m-%d')
     
     @staticmethod
-    def days_until_due(due_date: Optional[date]) -> Optional[int]:
-        """Calculate days until due date."""
+    def days_until_due(due_date: Optional[date], today: Optional[date] = None) -> Optional[int]:
+        """Calculate days until due date (pass today when computing many at once)."""
         if not due_date:
             return None
-        return (due_date - date.today()).days
\ No newline at end of file
+        return (due_date - (today or date.today())).days
\ No newline at end of file
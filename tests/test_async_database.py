@@ -0,0 +1,169 @@
+import asyncio
+import types
+import unittest
+import unittest.mock
+import pymysql
+from src.async_database import AsyncDatabaseConnection
+from src.database import PoolTimeoutError, RollbackOnlyError
+
+class FakeAsyncCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self.lastrowid = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        return False
+    
+    async def execute(self, query, params):
+        if query == self.connection.failing_query:
+            raise pymysql.err.OperationalError(1064, "syntax error")
+        self.connection.events.append(('execute', query))
+        self.rowcount = len(self.connection.rows)
+    
+    async def fetchall(self):
+        return tuple(self.connection.rows)
+    
+    async def fetchone(self):
+        return self.connection.rows[0] if self.connection.rows else None
+
+class FakeAsyncConnection:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.events = []
+        self.failing_query = None
+    
+    def cursor(self, cursor_class=None):
+        return FakeAsyncCursor(self)
+    
+    async def begin(self):
+        self.events.append('begin')
+    
+    async def commit(self):
+        self.events.append('commit')
+    
+    async def rollback(self):
+        self.events.append('rollback')
+
+class FakePool:
+    """Stands in for an aiomysql pool of one connection."""
+    
+    def __init__(self, connection):
+        self.connection = connection
+        self.borrowed = False
+        self.acquired = 0
+        self.closed = False
+    
+    async def acquire(self):
+        while self.borrowed:
+            await asyncio.sleep(0.001)
+        self.borrowed = True
+        self.acquired += 1
+        return self.connection
+    
+    def release(self, connection):
+        self.borrowed = False
+    
+    def close(self):
+        self.closed = True
+    
+    async def wait_closed(self):
+        pass
+
+class TestAsyncDatabaseConnection(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.connection = FakeAsyncConnection(rows=[{'task_id': 1}, {'task_id': 2}])
+        self.db = AsyncDatabaseConnection(pool_timeout=0.05)
+        self.db.pool = FakePool(self.connection)
+    
+    async def test_queries_borrow_commit_and_release_a_connection(self):
+        rows = await self.db.fetch_all("SELECT * FROM tasks")
+        cursor = await self.db.execute_query("UPDATE tasks SET status = %s", ('Completed',))
+        
+        self.assertEqual(rows, [{'task_id': 1}, {'task_id': 2}])
+        self.assertEqual(cursor.rowcount, 2)
+        self.assertEqual(self.connection.events, [('execute', "SELECT * FROM tasks"), 'commit',
+                                                  ('execute', "UPDATE tasks SET status = %s"), 'commit'])
+        self.assertEqual(self.db.pool.acquired, 2)
+        self.assertFalse(self.db.pool.borrowed)
+    
+    async def test_failed_query_rolls_back_and_returns_no_rows(self):
+        self.connection.failing_query = "SELECT broken"
+        with self.assertLogs('src.async_database', 'ERROR'):
+            self.assertEqual(await self.db.fetch_all("SELECT broken"), [])
+            self.assertIsNone(await self.db.fetch_one("SELECT broken"))
+        self.assertEqual(self.connection.events, ['rollback', 'rollback'])
+        self.assertFalse(self.db.pool.borrowed)
+    
+    async def test_transaction_keeps_one_connection_and_rolls_back_on_error(self):
+        async with self.db.transaction():
+            await self.db.execute_query("INSERT INTO tasks VALUES (1)")
+            await self.db.execute_query("INSERT INTO tasks VALUES (2)")
+        self.assertEqual(self.db.pool.acquired, 1)
+        self.assertEqual(self.connection.events[0], 'begin')
+        self.assertEqual(self.connection.events[-1], 'commit')
+        self.assertEqual(self.connection.events.count('commit'), 1)
+        
+        self.connection.events.clear()
+        with self.assertRaises(RuntimeError):
+            async with self.db.transaction():
+                await self.db.execute_query("INSERT INTO tasks VALUES (3)")
+                raise RuntimeError("abort")
+        self.assertEqual(self.connection.events[-1], 'rollback')
+        self.assertNotIn('commit', self.connection.events)
+        self.assertFalse(self.db.in_transaction)
+    
+    async def test_failed_nested_block_rolls_back_the_outer_transaction(self):
+        with self.assertRaises(RollbackOnlyError):
+            async with self.db.transaction():
+                await self.db.execute_query("INSERT INTO tasks VALUES (1)")
+                try:
+                    async with self.db.transaction():
+                        raise RuntimeError("chunk failed")
+                except RuntimeError:
+                    pass
+        self.assertEqual(self.connection.events[-1], 'rollback')
+        self.assertNotIn('commit', self.connection.events)
+    
+    async def test_exhausted_pool_times_out(self):
+        self.db.pool.borrowed = True
+        with self.assertRaises(PoolTimeoutError):
+            async with self.db._borrow():
+                pass
+    
+    async def test_disconnect_while_borrowed_still_releases(self):
+        pool = self.db.pool
+        async with self.db._borrow():
+            await self.db.disconnect()
+        self.assertFalse(pool.borrowed)
+        self.assertTrue(pool.closed)
+    
+    async def test_connect_passes_pool_settings_to_aiomysql(self):
+        created = {}
+        
+        async def create_pool(**kwargs):
+            created.update(kwargs)
+            return FakePool(self.connection)
+        
+        fake_aiomysql = types.SimpleNamespace(create_pool=create_pool, DictCursor=object())
+        db = AsyncDatabaseConnection(pool_min_size=2, pool_max_size=4, pool_recycle=600)
+        with unittest.mock.patch('src.async_database.aiomysql', fake_aiomysql):
+            self.assertTrue(await db.connect())
+        
+        self.assertEqual((created['minsize'], created['maxsize']), (2, 4))
+        self.assertEqual(created['pool_recycle'], 600)
+        self.assertIs(created['cursorclass'], fake_aiomysql.DictCursor)
+        await db.disconnect()
+        self.assertFalse(db.is_connected)
+    
+    async def test_connect_without_aiomysql_fails(self):
+        db = AsyncDatabaseConnection()
+        with unittest.mock.patch('src.async_database.aiomysql', None):
+            with self.assertLogs('src.async_database', 'ERROR'):
+                self.assertFalse(await db.connect())
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,178 @@
+import asyncio
+import io
+import re
+import sqlite3
+import unittest
+import unittest.mock
+from contextlib import asynccontextmanager
+from datetime import date
+from src.async_task_manager import AsyncTaskManager
+from src.context import user_context
+from src.models import Task
+
+SCHEMA = """
+    CREATE TABLE tasks (
+        task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        due_date DATE,
+        priority_level TEXT COLLATE priority NOT NULL DEFAULT 'Medium',
+        status TEXT NOT NULL DEFAULT 'Pending',
+        creation_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+
+def _priority_collation(left, right):
+    # Orders like the MySQL ENUM('Low', 'Medium', 'High')
+    return Task.PRIORITY_RANK.get(left, 0) - Task.PRIORITY_RANK.get(right, 0)
+
+class StandInCursor:
+    """Async cursor over sqlite3 that reports lastrowid the way MySQL does."""
+    def __init__(self, connection):
+        self._cursor = connection.cursor()
+        self.rowcount = -1
+        self.lastrowid = None
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        self._cursor.close()
+    
+    async def execute(self, query, params=()):
+        # Let other coroutines run, as a network round trip would
+        await asyncio.sleep(0)
+        query = re.sub(r' USE INDEX \(\w+\)', '', query).replace('%s', '?')
+        self._cursor.execute(query, tuple(params))
+        self.rowcount = self._cursor.rowcount
+        if query.lstrip().startswith('INSERT'):
+            # MySQL gives the first ID of a multi-row INSERT, SQLite the last
+            self.lastrowid = self._cursor.lastrowid - self.rowcount + 1
+    
+    async def fetchall(self):
+        return [dict(row) for row in self._cursor.fetchall()]
+    
+    async def fetchone(self):
+        row = self._cursor.fetchone()
+        return dict(row) if row else None
+
+class StandInConnection:
+    def __init__(self, sqlite):
+        self.sqlite = sqlite
+    
+    def cursor(self):
+        return StandInCursor(self.sqlite)
+
+class SQLiteStandIn:
+    """In-memory stand-in for AsyncDatabaseConnection (MySQL dialect bits translated)."""
+    def __init__(self):
+        self.sqlite = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES,
+                                      isolation_level=None)
+        self.sqlite.row_factory = sqlite3.Row
+        self.sqlite.create_collation('priority', _priority_collation)
+        self.sqlite.create_function('CURDATE', 0, lambda: date.today().isoformat())
+        self.sqlite.execute(SCHEMA)
+        self.queries = 0
+    
+    @asynccontextmanager
+    async def transaction(self):
+        self.sqlite.execute('BEGIN')
+        try:
+            yield StandInConnection(self.sqlite)
+        except BaseException:
+            self.sqlite.execute('ROLLBACK')
+            raise
+        self.sqlite.execute('COMMIT')
+    
+    async def _run(self, query, params):
+        self.queries += 1
+        cursor = StandInCursor(self.sqlite)
+        await cursor.execute(query, params)
+        return cursor
+    
+    async def execute_query(self, query, params=()):
+        return await self._run(query, params)
+    
+    async def fetch_all(self, query, params=()):
+        return await (await self._run(query, params)).fetchall()
+    
+    async def fetch_one(self, query, params=()):
+        return await (await self._run(query, params)).fetchone()
+
+class FakeAuth:
+    def __init__(self, user_id=1):
+        self.current_user = {'user_id': user_id, 'username': 'tester'}
+    
+    def is_authenticated(self):
+        return self.current_user is not None
+    
+    def get_current_user_id(self):
+        return self.current_user['user_id']
+
+class TestAsyncTaskManager(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.db = SQLiteStandIn()
+        self.manager = AsyncTaskManager(self.db, FakeAuth())
+        patcher = unittest.mock.patch('sys.stdout', io.StringIO())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    async def test_concurrent_adds_then_list_in_priority_order(self):
+        results = await asyncio.gather(*(
+            self.manager.add_task(f'Task {i}', priority_level=('Low', 'High', 'Medium')[i % 3])
+            for i in range(9)
+        ))
+        self.assertTrue(all(results))
+        
+        tasks = await self.manager.list_tasks()
+        self.assertEqual([t.priority_level for t in tasks], ['High'] * 3 + ['Medium'] * 3 + ['Low'] * 3)
+        page = await self.manager.list_tasks({'priority': 'Low'}, limit=2)
+        rest = await self.manager.list_tasks({'priority': 'Low'}, after_cursor=self.manager.page_cursor(page[-1]))
+        self.assertEqual(len(page) + len(rest), 3)
+    
+    async def test_bulk_add_update_and_statistics(self):
+        task_ids = await self.manager.add_tasks([{'title': 'Report'}, {'title': 'Review', 'due_date': date.max}])
+        self.assertEqual(len(task_ids), 2)
+        self.assertEqual(await self.manager.complete_tasks(task_ids + [999]),
+                         {task_ids[0]: True, task_ids[1]: True, 999: False})
+        
+        stats = await self.manager.get_statistics()
+        self.assertEqual((stats['total_tasks'], stats['completed']), (2, 2))
+        self.assertEqual((await self.manager.get_task(task_ids[1])).due_date, date.max)
+    
+    async def test_warm_cache_answers_without_queries(self):
+        await self.manager.add_task('Write report', 'quarterly numbers')
+        await self.manager.refresh_tasks()
+        self.db.queries = 0
+        
+        hits = await self.manager.search_hits('quarter')
+        self.assertEqual(hits[0].excerpt, '**quarter**ly numbers')
+        self.assertEqual(len(await self.manager.list_tasks()), 1)
+        self.assertEqual(self.db.queries, 0)
+    
+    async def test_other_users_tasks_are_invisible(self):
+        await self.manager.add_task('Mine')
+        other = AsyncTaskManager(self.db, FakeAuth(user_id=2))
+        self.assertEqual(await other.list_tasks(), [])
+        self.assertFalse(await other.delete_task(1))
+        self.assertTrue(await self.manager.delete_task(1))
+    
+    async def test_user_context_scopes_each_asyncio_task(self):
+        await self.manager.add_task('Mine')
+        
+        async def titles_for(user_id):
+            with user_context(user_id):
+                await self.manager.add_task(f'Task of {user_id}')
+                return [task.title for task in await self.manager.list_tasks()]
+        
+        mine, other = await asyncio.gather(titles_for(1), titles_for(2))
+        self.assertEqual(sorted(mine), ['Mine', 'Task of 1'])
+        self.assertEqual(other, ['Task of 2'])
+        self.assertEqual((1 in self.manager._tenants, 2 in self.manager._tenants), (True, True))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,200 @@
+import io
+import json
+import unittest
+import unittest.mock
+from contextlib import contextmanager, redirect_stdout
+from src.auth import AuthenticationManager
+from src.cli import TaskManagerCLI
+from src.commands import BufferedOutput, build_parser, run_list
+from src.renderer import TaskRenderer
+from src.task_manager import TaskManager
+
+USER = {'user_id': 7, 'username': 'alice', 'password_hash': 'a' * 64,
+        'email': '', 'created_at': None}
+
+class FakeUserDatabase:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+    
+    def fetch_one(self, query, params=()):
+        return dict(USER) if params and params[0] in (7, 'alice') else None
+    
+    def fetch_iter(self, query, params=(), batch_size=1000):
+        return iter([])
+    
+    def fetch_all(self, query, params=()):
+        self.last_query = (query, params)
+        return [dict(row) for row in self.rows]
+
+class TestCommandParser(unittest.TestCase):
+    def test_list_options(self):
+        args = build_parser().parse_args(['list', '--status', 'Pending', '--json', '--limit', '5'])
+        self.assertEqual((args.command, args.status, args.json, args.limit), ('list', 'Pending', True, 5))
+    
+    def test_validator_errors_are_usage_errors(self):
+        with self.assertRaises(SystemExit), unittest.mock.patch('sys.stderr', io.StringIO()):
+            build_parser().parse_args(['complete', '9-3'])
+    
+    def test_count_options_must_be_positive_and_name_the_option(self):
+        for argv in (['list', '--limit', '0'], ['serve', '--workers', 'x'], ['token', '--days', '-1']):
+            stderr = io.StringIO()
+            with self.assertRaises(SystemExit), unittest.mock.patch('sys.stderr', stderr):
+                build_parser().parse_args(argv)
+            self.assertIn(f"{argv[1]} must be a positive integer", stderr.getvalue())
+    
+    def test_import_offset_may_be_zero_but_not_negative(self):
+        self.assertEqual(build_parser().parse_args(['import', 'tasks.jsonl', '--offset', '0']).offset, 0)
+        stderr = io.StringIO()
+        with self.assertRaises(SystemExit), unittest.mock.patch('sys.stderr', stderr):
+            build_parser().parse_args(['import', 'tasks.jsonl', '--offset', '-3'])
+        self.assertIn("--offset must be a non-negative integer", stderr.getvalue())
+
+class FakePager:
+    """Stands in for the pager process; quits after reading the first chunk."""
+    
+    def __init__(self, *args, **kwargs):
+        self.stdin = self
+        self.chunks = []
+    
+    def write(self, chunk):
+        if self.chunks:
+            raise BrokenPipeError
+        self.chunks.append(chunk)
+    
+    def close(self):
+        pass
+    
+    def wait(self):
+        return 0
+
+class TestListOptions(unittest.TestCase):
+    def setUp(self):
+        self.auth = AuthenticationManager(FakeUserDatabase())
+        self.auth.current_user = dict(USER)
+        self.manager = unittest.mock.Mock()
+        self.manager.list_tasks.side_effect = lambda filters, limit=None, after_cursor=None: [
+            unittest.mock.Mock(task_id=n, title=f'Task {n}', description='', due_date=None,
+                               priority='Medium', status='Pending', created_at=None)
+            for n in range(limit)]
+        self.cli = TaskManagerCLI(self.manager, self.auth)
+    
+    def run_command(self, line):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            self.cli.onecmd(line)
+        return output.getvalue()
+    
+    def test_page_size_is_rejected_where_it_cannot_apply(self):
+        for line in ('list --format json --page-size 2', 'list --format ndjson --page-size 2',
+                     'search report --page-size 3'):
+            self.assertIn("--page-size", self.run_command(line))
+        self.manager.list_tasks.assert_not_called()
+        self.manager.search_hits.assert_not_called()
+    
+    def test_pager_only_fetches_what_it_reads(self):
+        pager = FakePager()
+        output = io.StringIO()
+        output.isatty = lambda: True
+        with unittest.mock.patch('subprocess.Popen', return_value=pager), redirect_stdout(output):
+            self.cli.onecmd('list --format table --pager')
+        self.assertEqual(self.manager.list_tasks.call_count, 1)
+        self.assertEqual(pager.chunks, [TaskRenderer('table').table_header()])
+
+class TestTokenLogin(unittest.TestCase):
+    def setUp(self):
+        self.auth = AuthenticationManager(FakeUserDatabase())
+        self.auth.current_user = dict(USER)
+    
+    def test_token_round_trip(self):
+        token = self.auth.issue_token()
+        other = AuthenticationManager(FakeUserDatabase())
+        self.assertTrue(other.login_with_token(token))
+        self.assertEqual(other.get_current_user_id(), 7)
+    
+    def test_tampered_or_expired_token_is_rejected(self):
+        user_id, expires, signature = self.auth.issue_token().split('.')
+        other = AuthenticationManager(FakeUserDatabase())
+        with unittest.mock.patch('sys.stdout', io.StringIO()):
+            self.assertFalse(other.login_with_token(f"{user_id}.{int(expires) + 1}.{signature}"))
+            self.assertFalse(other.login_with_token(self.auth.issue_token(ttl_days=-1)))
+        self.assertIsNone(other.current_user)
+
+class TestListCommand(unittest.TestCase):
+    def test_json_output_and_filter_pushdown(self):
+        row = {'task_id': 3, 'user_id': 7, 'title': 'Write report', 'description': '',
+               'due_date': None, 'priority_level': 'High', 'status': 'Pending',
+               'creation_timestamp': None}
+        db = FakeUserDatabase([row])
+        auth = AuthenticationManager(db)
+        auth.current_user = dict(USER)
+        out = io.StringIO()
+        args = build_parser().parse_args(['list', '--status', 'Pending', '--json'])
+        
+        self.assertEqual(run_list(args, db, auth, out), 0)
+        self.assertEqual(json.loads(out.getvalue())[0]['title'], 'Write report')
+        query, params = db.last_query
+        self.assertIn("status = %s", query)
+        self.assertEqual(params[:2], (7, 'Pending'))
+
+class FakeScriptCursor:
+    rowcount = 1
+    lastrowid = 50
+
+class FakeScriptDatabase:
+    """Records each write with the number of the transaction it ran in (0 = none)."""
+    def __init__(self, rows):
+        self.rows = rows
+        self.transactions = 0
+        self.current = 0
+        self.writes = []
+    
+    @contextmanager
+    def transaction(self):
+        self.transactions += 1
+        self.current = self.transactions
+        try:
+            yield None
+        finally:
+            self.current = 0
+    
+    def execute_query(self, query, params=()):
+        self.writes.append((query.split()[0], self.current))
+        return FakeScriptCursor()
+    
+    def fetch_iter(self, query, params=(), batch_size=1000):
+        for row in self.rows:
+            yield dict(row)
+    
+    def fetch_all(self, query, params=()):
+        return []
+    
+    def fetch_one(self, query, params=()):
+        return None
+
+class TestScriptMode(unittest.TestCase):
+    def test_consecutive_writes_share_a_transaction(self):
+        rows = [{'task_id': task_id, 'user_id': 7, 'title': f'Task {task_id}', 'description': '',
+                 'due_date': None, 'priority_level': 'Medium', 'status': 'Pending',
+                 'creation_timestamp': None} for task_id in (2, 1)]
+        db = FakeScriptDatabase(rows)
+        auth = AuthenticationManager(db)
+        auth.current_user = dict(USER)
+        script = io.StringIO(
+            "# nightly grooming\n"
+            "add\nBuy milk\n\n\nHigh\n"
+            "complete 1\n"
+            "list\n"
+            "complete 2\n"
+        )
+        target = io.StringIO()
+        output = BufferedOutput(target)
+        with redirect_stdout(output):
+            TaskManagerCLI(TaskManager(db, auth), auth).run_script(script)
+            self.assertEqual(target.getvalue(), '')
+        output.drain()
+        
+        self.assertEqual(db.writes, [('INSERT', 1), ('UPDATE', 1), ('UPDATE', 2)])
+        self.assertIn('Buy milk', target.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,180 @@
+import unittest
+import unittest.mock
+import pymysql
+from src.auth import AuthenticationManager
+from src.config import DatabaseConfig
+from src.context import user_context
+from src.database import ConnectionPool, DatabaseConnection, PoolTimeoutError, RollbackOnlyError
+from src.task_manager import TaskManager
+
+class FakeConnection:
+    def __init__(self):
+        self.open = True
+        self.healthy = True
+    
+    def ping(self, reconnect=True):
+        if not self.healthy:
+            raise pymysql.err.OperationalError(2006, "MySQL server has gone away")
+    
+    def close(self):
+        self.open = False
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+        
+        def factory():
+            conn = FakeConnection()
+            self.created.append(conn)
+            return conn
+        
+        self.factory = factory
+    
+    def test_reuses_released_connection(self):
+        pool = ConnectionPool(self.factory, min_size=1, max_size=2)
+        pool.fill()
+        conn = pool.acquire()
+        pool.release(conn)
+        self.assertIs(pool.acquire(), conn)
+        self.assertEqual(len(self.created), 1)
+    
+    def test_acquire_times_out_when_exhausted(self):
+        pool = ConnectionPool(self.factory, min_size=0, max_size=1)
+        pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            pool.acquire(timeout=0.01)
+    
+    def test_unhealthy_connection_is_replaced_on_borrow(self):
+        pool = ConnectionPool(self.factory, min_size=1, max_size=1, health_check_interval=0)
+        pool.fill()
+        stale = self.created[0]
+        stale.healthy = False
+        conn = pool.acquire()
+        self.assertIsNot(conn, stale)
+        self.assertFalse(stale.open)
+        self.assertEqual(pool.size, 1)
+    
+    def test_idle_connections_are_evicted_down_to_min_size(self):
+        pool = ConnectionPool(self.factory, min_size=1, max_size=3, max_idle=0)
+        borrowed = [pool.acquire() for _ in range(3)]
+        for conn in borrowed:
+            pool.release(conn)
+        self.assertEqual(pool.evict_idle(), 2)
+        self.assertEqual(pool.size, 1)
+    
+    def test_disconnect_while_borrowed_closes_the_connection_on_release(self):
+        db = DatabaseConnection()
+        db.pool = ConnectionPool(self.factory, min_size=0, max_size=1)
+        with db._borrow() as conn:
+            db.disconnect()
+        self.assertFalse(conn.open)
+        self.assertFalse(db.is_connected)
+
+class FakeStreamingCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+    
+    def execute(self, query, params):
+        self.query = query
+    
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+    
+    def close(self):
+        self.closed = True
+
+class FakeStreamingConnection(FakeConnection):
+    def __init__(self, rows):
+        super().__init__()
+        self.cursors = []
+        self._rows = rows
+    
+    def cursor(self, cursor_class=None):
+        cursor = FakeStreamingCursor(self._rows)
+        cursor.cursor_class = cursor_class
+        self.cursors.append(cursor)
+        return cursor
+
+class TestFetchIter(unittest.TestCase):
+    def test_streams_rows_through_server_side_cursor(self):
+        db = DatabaseConnection(pool_max_size=0)
+        db.connection = FakeStreamingConnection([{'task_id': i} for i in range(5)])
+        
+        rows = list(db.fetch_iter("SELECT * FROM tasks", batch_size=2))
+        
+        self.assertEqual([row['task_id'] for row in rows], [0, 1, 2, 3, 4])
+        cursor = db.connection.cursors[0]
+        self.assertIs(cursor.cursor_class, pymysql.cursors.SSDictCursor)
+        self.assertTrue(cursor.closed)
+
+class FakeTransactionalCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+    
+    def execute(self, query, params=()):
+        self.connection.executed.append(query.split()[0])
+        if len(self.connection.executed) == self.connection.fail_at:
+            raise pymysql.err.OperationalError(1205, "Lock wait timeout exceeded")
+        self.rowcount = 1
+    
+    def fetchall(self):
+        return []
+
+class FakeTransactionalConnection(FakeConnection):
+    """Fails the fail_at-th statement it executes."""
+    def __init__(self, fail_at=None):
+        super().__init__()
+        self.fail_at = fail_at
+        self.executed = []
+        self.events = []
+    
+    def cursor(self, cursor_class=None):
+        return FakeTransactionalCursor(self)
+    
+    def begin(self):
+        self.events.append('begin')
+    
+    def commit(self):
+        self.events.append('commit')
+    
+    def rollback(self):
+        self.events.append('rollback')
+
+class TestTransaction(unittest.TestCase):
+    def setUp(self):
+        self.db = DatabaseConnection(pool_max_size=0)
+    
+    def test_nested_blocks_join_and_commit_once(self):
+        self.db.connection = FakeTransactionalConnection()
+        with self.db.transaction():
+            self.db.execute_query("INSERT INTO tasks VALUES (1)")
+            with self.db.transaction():
+                self.db.execute_query("INSERT INTO tasks VALUES (2)")
+        self.assertEqual(self.db.connection.events, ['begin', 'commit'])
+    
+    def test_failed_nested_block_rolls_back_the_outer_transaction(self):
+        self.db.connection = FakeTransactionalConnection(fail_at=3)
+        manager = TaskManager(self.db, AuthenticationManager(self.db), cache_limit=0)
+        
+        with self.assertRaises(RollbackOnlyError):
+            with self.db.transaction(), user_context(7, 'alice'):
+                self.db.execute_query("DELETE FROM tasks WHERE task_id = 9")
+                # The second chunk fails; update_tasks reports it and carries on
+                with unittest.mock.patch.object(DatabaseConfig, 'BULK_CHUNK_SIZE', 1):
+                    self.assertEqual(manager.complete_tasks([1, 2]), {1: False, 2: False})
+        
+        self.assertEqual(self.db.connection.executed, ['DELETE', 'UPDATE', 'UPDATE'])
+        self.assertEqual(self.db.connection.events, ['begin', 'rollback'])
+        self.assertFalse(self.db.in_transaction)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,47 @@
+import json
+import unittest
+from datetime import date
+from src.models import Task
+from src.renderer import TaskRenderer
+from src.search import rank_hits
+
+TODAY = date(2025, 3, 10)
+
+def make_task(task_id, title, due_date=None, description=''):
+    return Task.from_row({'task_id': task_id, 'title': title, 'description': description,
+                          'due_date': due_date, 'priority_level': 'High', 'status': 'Pending'})
+
+class TestTaskRenderer(unittest.TestCase):
+    def test_full_layout_numbers_from_start_and_flags_due_dates(self):
+        tasks = [make_task(1, 'Late', date(2025, 3, 9)), make_task(2, 'Soon', date(2025, 3, 12))]
+        text = TaskRenderer(today=TODAY).render(tasks, start=21)
+        self.assertIn("21. ⏳ ⚡ Late", text)
+        self.assertIn("OVERDUE!", text)
+        self.assertIn("22. ⏳ ⚡ Soon", text)
+        self.assertIn("2 days left!", text)
+    
+    def test_machine_readable_formats(self):
+        tasks = [make_task(1, 'One'), make_task(2, 'Two')]
+        ndjson = TaskRenderer('ndjson', TODAY).render(tasks).splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in ndjson], ['One', 'Two'])
+        self.assertEqual(json.loads(TaskRenderer('json', TODAY).render([])), [])
+    
+    def test_stream_of_pages_is_one_document(self):
+        pages = [[make_task(1, 'One'), make_task(2, 'Two')], [make_task(3, 'Three')]]
+        records = json.loads(''.join(TaskRenderer('json', TODAY).render_stream(pages)))
+        self.assertEqual([record['title'] for record in records], ['One', 'Two', 'Three'])
+        self.assertEqual(json.loads(''.join(TaskRenderer('json', TODAY).render_stream([]))), [])
+        self.assertIn("3. ⏳ ⚡ Three", ''.join(TaskRenderer(today=TODAY).render_stream(pages)))
+    
+    def test_table_and_search_excerpt(self):
+        task = make_task(5, 'Report', description='Collect the quarterly numbers for finance')
+        self.assertRegex(TaskRenderer('table', TODAY).render([task]), r"^\s+5  Pending\s+High\s+-\s+Report\n$")
+        self.assertIn("Collect the **quarterly** numbers",
+                      TaskRenderer(today=TODAY).render_search(rank_hits([task], 'QUARTERLY')))
+    
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TaskRenderer('xml')
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import unittest
+from src.models import Task
+from src.search import SearchIndex, highlight_excerpt, rank_hits
+
+def make_task(task_id, title, description=""):
+    return Task(task_id=task_id, title=title, description=description)
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.build([
+            make_task(1, "Quarterly report", "Send the numbers to finance"),
+            make_task(2, "Team meeting", "Prepare the agenda"),
+            make_task(3, "Report bug", "Meeting notes are missing"),
+        ])
+    
+    def test_substring_search_is_case_insensitive(self):
+        self.assertEqual(self.index.search("REPORT"), {1, 3})
+        self.assertEqual(self.index.search("eeting"), {2, 3})
+        self.assertEqual(self.index.search("genda"), {2})
+    
+    def test_trigrams_must_be_adjacent(self):
+        self.assertEqual(self.index.search("report meeting"), set())
+    
+    def test_short_keywords(self):
+        self.assertEqual(self.index.search("ag"), {2})
+    
+    def test_prefix_search_matches_word_starts(self):
+        self.assertEqual(self.index.search_prefix("me"), {2, 3})
+        self.assertEqual(self.index.search_prefix("eeting"), set())
+    
+    def test_incremental_updates(self):
+        self.index.remove(3)
+        self.assertEqual(self.index.search("report"), {1})
+        self.assertEqual(self.index.search_prefix("bug"), set())
+        self.index.add(make_task(1, "Annual summary"))
+        self.assertEqual(self.index.search("report"), set())
+        self.assertEqual(self.index.search_prefix("ann"), {1})
+
+class TestRanking(unittest.TestCase):
+    def test_title_matches_rank_above_description_matches(self):
+        tasks = [
+            Task(task_id=1, title="Team meeting", description="Prepare the report", priority_level='High'),
+            Task(task_id=2, title="Quarterly report", priority_level='Low'),
+            Task(task_id=3, title="Report bug", priority_level='Low'),
+            Task(task_id=4, title="Report archive", priority_level='High'),
+        ]
+        hits = rank_hits(tasks, "Report")
+        self.assertEqual([hit.task.task_id for hit in hits], [4, 3, 2, 1])
+        self.assertEqual([hit.task.task_id for hit in rank_hits(tasks, "report", limit=2)], [4, 3])
+        self.assertEqual(hits[-1].excerpt, "Prepare the **report**")
+    
+    def test_excerpt_is_trimmed_around_the_match(self):
+        text = "x" * 30 + "needle" + "y" * 60
+        self.assertEqual(highlight_excerpt(text, "needle"), "..." + "x" * 20 + "**needle**" + "y" * 50 + "...")
+        self.assertEqual(highlight_excerpt(text, "absent"), "")
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import http.client
+import io
+import json
+import threading
+import unittest
+import unittest.mock
+from datetime import datetime
+from src.auth import AuthenticationManager
+from src.server import TaskApiServer
+
+USERS = {
+    7: {'user_id': 7, 'username': 'alice', 'password_hash': 'a' * 64, 'email': '', 'created_at': None},
+    8: {'user_id': 8, 'username': 'bob', 'password_hash': 'b' * 64, 'email': '', 'created_at': None},
+}
+
+class FakeApiDatabase:
+    """Answers user lookups and task listings, scoped by the user_id parameter."""
+    def __init__(self):
+        self.tasks = {
+            7: [{'task_id': 1, 'user_id': 7, 'title': 'Alice task', 'description': '',
+                 'due_date': None, 'priority_level': 'High', 'status': 'Pending',
+                 'creation_timestamp': None, 'updated_at': datetime.now()}],
+            8: [],
+        }
+    
+    def fetch_one(self, query, params=()):
+        if 'FROM users' in query:
+            return dict(USERS[params[0]]) if params[0] in USERS else None
+        return None
+    
+    def fetch_all(self, query, params=()):
+        if 'task_tombstones' in query:
+            return []
+        return [dict(row) for row in self.tasks.get(params[0], [])]
+    
+    def fetch_iter(self, query, params=()):
+        yield from self.fetch_all(query, params)
+
+def token_for(user_id):
+    auth = AuthenticationManager(FakeApiDatabase())
+    auth.current_user = dict(USERS[user_id])
+    return auth.issue_token()
+
+class TestTaskApiServer(unittest.TestCase):
+    def setUp(self):
+        self.server = TaskApiServer(('127.0.0.1', 0), FakeApiDatabase(), workers=2)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=5)
+        patcher = unittest.mock.patch('sys.stdout', io.StringIO())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def request(self, method, path, token=None, body=None):
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        data = json.dumps(body) if body is not None else None
+        self.connection.request(method, path, body=data, headers=headers)
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+    
+    def test_requests_are_scoped_to_the_token_user_on_one_connection(self):
+        status, body = self.request('GET', '/tasks', token_for(7))
+        self.assertEqual(status, 200)
+        self.assertEqual([task['title'] for task in body['tasks']], ['Alice task'])
+        socket = self.connection.sock
+        
+        status, body = self.request('GET', '/tasks', token_for(8))
+        self.assertEqual((status, body['tasks']), (200, []))
+        # Both requests went over the same kept-alive connection
+        self.assertIs(self.connection.sock, socket)
+    
+    def test_writes_by_other_processes_are_seen_on_the_next_request(self):
+        token = token_for(7)
+        self.request('GET', '/tasks', token)
+        row = self.server.task_manager.db.tasks[7][0]
+        row.update(title='Renamed elsewhere', updated_at=datetime.now())
+        
+        status, body = self.request('GET', '/tasks', token)
+        self.assertEqual([task['title'] for task in body['tasks']], ['Renamed elsewhere'])
+    
+    def test_missing_or_bad_token_is_rejected(self):
+        self.assertEqual(self.request('GET', '/stats')[0], 401)
+        user_id, expires, signature = token_for(7).split('.')
+        self.assertEqual(self.request('GET', '/stats', f'{user_id}.{expires}.{"0" * 64}')[0], 401)
+    
+    def test_validation_errors_and_unknown_routes(self):
+        token = token_for(7)
+        self.assertEqual(self.request('GET', '/tasks?limit=0', token)[0], 400)
+        status, body = self.request('POST', '/tasks', token, {'title': 'x', 'owner': 8})
+        self.assertEqual((status, body['error']), (400, 'Unknown field(s): owner'))
+        self.assertEqual(self.request('POST', '/tasks', token, []), (400, {'error': 'Expected at least one task'}))
+        self.assertEqual(self.request('POST', '/tasks', token, {'title': 'x', 'due_date': 20240101})[0], 400)
+        self.assertEqual(self.request('PATCH', '/tasks/1', token, {'due_date': ['2024-01-01']})[0], 400)
+        self.assertEqual(self.request('PUT', '/tasks/1', token), (405, {'error': 'Use GET, PATCH, DELETE for /tasks/1'}))
+        self.assertEqual(self.request('DELETE', '/stats', token)[0], 405)
+        self.assertEqual(self.request('GET', '/nothing', token)[0], 404)
+    
+    def test_bad_content_length_is_rejected(self):
+        for length in ('-1', 'ten'):
+            connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port, timeout=5)
+            connection.putrequest('POST', '/tasks')
+            connection.putheader('Content-Length', length)
+            connection.endheaders()
+            response = connection.getresponse()
+            self.assertEqual(response.status, 400)
+            self.assertEqual(json.loads(response.read()),
+                             {'error': 'Content-Length must be a non-negative integer'})
+            connection.close()
+    
+    def test_failed_update_of_an_existing_task_is_a_server_error(self):
+        token = token_for(7)
+        self.assertEqual(self.request('PATCH', '/tasks/99', token, {'title': 'x'})[0], 404)
+        with unittest.mock.patch.object(self.server.task_manager, 'update_task', return_value=False):
+            status, body = self.request('PATCH', '/tasks/1', token, {'title': 'x'})
+        self.assertEqual((status, body), (500, {'error': 'Task 1 could not be updated'}))
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
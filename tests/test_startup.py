@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed for the task-manager entry point. Python's
+# own startup is not included; override on slow machines.
+IMPORT_BUDGET_MS = float(os.getenv('STARTUP_IMPORT_BUDGET_MS', '150'))
+
+# Modules a one-shot command should only load once it actually needs them
+DEFERRED_MODULES = ('pymysql', 'cmd', 'getpass', 'logging', 'numpy',
+                    'src.database', 'src.auth', 'src.task_manager')
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True,
+                          text=True, timeout=60)
+
+class TestStartup(unittest.TestCase):
+    def test_parsing_a_command_loads_no_database_modules(self):
+        code = (
+            "import sys, src.commands\n"
+            "src.commands.build_parser().parse_args(['list', '--status', 'Pending', '--json'])\n"
+            f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+        )
+        result = run_python('-c', code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+    
+    def test_entry_point_import_time_budget(self):
+        # Best of a few runs, so a busy machine does not fail the test
+        timings = []
+        for _ in range(3):
+            result = run_python('-X', 'importtime', '-c', 'import src.commands')
+            self.assertEqual(result.returncode, 0, result.stderr)
+            for line in result.stderr.splitlines():
+                fields = [field.strip() for field in line.split('|')]
+                if len(fields) == 3 and fields[2] == 'src.commands':
+                    timings.append(int(fields[1]) / 1000)
+        self.assertTrue(timings, "no importtime line for src.commands")
+        self.assertLess(min(timings), IMPORT_BUDGET_MS,
+                        f"importing src.commands took {min(timings):.1f} ms")
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
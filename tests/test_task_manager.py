@@ -1,7 +1,17 @@
+import os
+import re
+import threading
 import unittest
-from datetime import date
-from src.models import Task
+from datetime import date, datetime
+from contextlib import contextmanager
+from src.cache import TaskCache, TenantCache
+from src.context import user_context
+from src.models import Task, TaskBatch
 from src.utils import InputValidator
+from src.config import CacheConfig
+from src.task_manager import TaskManager
+from src.query import (INDEX_HINTS, LOAD_QUERY, PURGE_TOMBSTONES_QUERY, STATISTICS_FIELDS,
+                       STATISTICS_QUERY, TaskQuery)
 
 class TestTask(unittest.TestCase):
     def test_task_creation(self):
@@ -21,6 +31,52 @@ class TestTask(unittest.TestCase):
         task_dict = task.to_dict()
         self.assertEqual(task_dict['title'], "Test")
         self.assertEqual(task_dict['priority_level'], "High")
+    
+    def test_task_is_slotted(self):
+        task = Task(title="Test")
+        self.assertFalse(hasattr(task, '__dict__'))
+    
+    def test_from_row_trusts_stored_values(self):
+        past = date(2000, 1, 1)
+        task = Task.from_row({
+            'task_id': 3, 'title': 'Imported: legacy', 'description': None,
+            'due_date': past, 'priority_level': 'Low', 'status': 'Completed',
+            'creation_timestamp': None
+        })
+        self.assertEqual(task.due_date, past)
+        self.assertEqual(task.description, '')
+        self.assertEqual(task.sort_key, (-1, False, past))
+
+class TestTaskBatch(unittest.TestCase):
+    def test_statistics_match_row_values(self):
+        today = date(2030, 6, 1)
+        rows = [
+            {'task_id': 1, 'priority_level': 'High', 'status': 'Pending', 'due_date': date(2030, 5, 1)},
+            {'task_id': 2, 'priority_level': 'High', 'status': 'Completed', 'due_date': date(2030, 5, 1)},
+            {'task_id': 3, 'priority_level': 'Low', 'status': 'In Progress', 'due_date': None},
+            {'task_id': 4, 'priority_level': 'Medium', 'status': 'Pending', 'due_date': date(2030, 7, 1)},
+        ]
+        batch = TaskBatch.from_rows(rows)
+        self.assertEqual(batch.statistics(today), {
+            'total_tasks': 4, 'completed': 1, 'pending': 2, 'in_progress': 1,
+            'high_priority': 2, 'overdue': 1
+        })
+        self.assertEqual(batch.priority_histogram(), {'High': 2, 'Medium': 1, 'Low': 1})
+    
+    def test_cache_columns_follow_every_change(self):
+        cache = TaskCache()
+        cache.load([Task.from_row(task_row(i, f'Task {i}', priority='High')) for i in (1, 2, 3)])
+        cache.add(Task.from_row(task_row(4, 'New', status='Completed')))
+        cache.update(1, {'status': 'In Progress', 'priority_level': 'Low'})
+        cache.remove(2)
+        cache.merge([Task.from_row(task_row(3, 'Changed', status='Completed')),
+                     Task.from_row(task_row(5, 'Synced'))], [4], None)
+        
+        self.assertEqual(cache.statistics(), TaskBatch.from_tasks(cache.values()).statistics())
+        self.assertEqual(cache.statistics(), {
+            'total_tasks': 3, 'completed': 1, 'pending': 1, 'in_progress': 1,
+            'high_priority': 0, 'overdue': 0
+        })
 
 class TestInputValidator(unittest.TestCase):
     def test_validate_string(self):
@@ -29,6 +85,11 @@ class TestInputValidator(unittest.TestCase):
         with self.assertRaises(ValueError):
             InputValidator.validate_string("", "Test")
     
+    def test_validate_task_ids(self):
+        self.assertEqual(InputValidator.validate_task_ids("12,13, 40-42,13"), [12, 13, 40, 41, 42])
+        with self.assertRaises(ValueError):
+            InputValidator.validate_task_ids("5-2")
+    
     def test_validate_date(self):
         future_date = date.today().replace(year=date.today().year + 1)
         future_str = future_date.strftime('%Y-%m-%d')
@@ -37,5 +98,522 @@ class TestInputValidator(unittest.TestCase):
         with self.assertRaises(ValueError):
             InputValidator.validate_date("invalid-date")
 
+class FakeAuth:
+    def __init__(self, user_id=1):
+        self.current_user = {'user_id': user_id, 'username': 'tester'}
+    
+    def is_authenticated(self):
+        return self.current_user is not None
+    
+    def get_current_user_id(self):
+        return self.current_user['user_id']
+
+class FakeCursor:
+    def __init__(self, rowcount=1, lastrowid=None):
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+
+class FakeTransactionCursor:
+    """Cursor of a FakeDatabase transaction; inserts get IDs from next_id."""
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = 0
+        self.lastrowid = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def execute(self, query, params=()):
+        self.db.queries.append((query, tuple(params)))
+        if query.startswith('INSERT'):
+            self.rowcount = query.count('(%s')
+            self.lastrowid = self.db.next_id
+            self.db.next_id += self.rowcount
+            return
+        # UPDATE/SELECT ... task_id IN (...): only IDs in db.owned match
+        task_ids = params[len(params) - query.count('%s', query.index(' IN (')):]
+        self.matched = [task_id for task_id in task_ids if task_id in self.db.owned]
+        self.rowcount = len(self.matched)
+    
+    def fetchall(self):
+        return [{'task_id': task_id} for task_id in self.matched]
+
+class FakeTransactionConnection:
+    def __init__(self, db):
+        self.db = db
+    
+    def cursor(self):
+        return FakeTransactionCursor(self.db)
+
+class FakeDatabase:
+    """Records queries and answers them from canned results."""
+    def __init__(self, rows=None, one=None, rowcount=1):
+        self.rows = rows or []
+        self.one = one
+        self.rowcount = rowcount
+        self.queries = []
+        self.next_id = 100
+        self.owned = set()
+        self.commits = 0
+        self.rollbacks = 0
+    
+    @contextmanager
+    def transaction(self):
+        try:
+            yield FakeTransactionConnection(self)
+        except BaseException:
+            self.rollbacks += 1
+            raise
+        self.commits += 1
+    
+    def execute_query(self, query, params=()):
+        self.queries.append((query, params))
+        return FakeCursor(rowcount=self.rowcount)
+    
+    def fetch_all(self, query, params=()):
+        self.queries.append((query, params))
+        return [dict(row) for row in self.rows]
+    
+    def fetch_iter(self, query, params=(), batch_size=1000):
+        self.queries.append((query, params))
+        for row in self.rows:
+            yield dict(row)
+    
+    def fetch_one(self, query, params=()):
+        self.queries.append((query, params))
+        return self.one
+
+class TestTaskManagerStatistics(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDatabase(one={
+            'total_tasks': 5, 'completed': 2, 'pending': 2, 'in_progress': 1,
+            'high_priority': 3, 'overdue': 1
+        })
+        self.manager = TaskManager(self.db, FakeAuth(), cache_statistics=True)
+        self.db.queries.clear()
+    
+    def test_statistics_use_single_query(self):
+        stats = self.manager.get_statistics()
+        self.assertEqual(len(self.db.queries), 1)
+        self.assertEqual(stats['total_tasks'], 5)
+        self.assertEqual(stats['overdue'], 1)
+    
+    def test_statistics_cache_is_invalidated_by_writes(self):
+        writes = (
+            lambda: self.manager.add_task("New task"),
+            lambda: self.manager.update_task(1, status='Completed'),
+            lambda: self.manager.delete_task(1),
+        )
+        for total, write in enumerate(writes, 6):
+            with self.subTest(total_tasks=total):
+                self.manager.get_statistics()
+                self.db.one = dict(self.db.one, total_tasks=total)
+                # Still answered from the cache until a write happens
+                self.assertEqual(self.manager.get_statistics()['total_tasks'], total - 1)
+                
+                self.db.queries.clear()
+                self.assertTrue(write())
+                self.assertEqual(self.manager.get_statistics()['total_tasks'], total)
+                self.assertEqual(sum(query == STATISTICS_QUERY for query, _ in self.db.queries), 1)
+
+def task_row(task_id, title, priority='Medium', due_date=None, status='Pending'):
+    return {
+        'task_id': task_id, 'user_id': 1, 'title': title, 'description': '',
+        'due_date': due_date, 'priority_level': priority, 'status': status,
+        'creation_timestamp': None
+    }
+
+class TestTaskManagerWrites(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDatabase(rows=[task_row(2, 'Second'), task_row(1, 'First')])
+        self.manager = TaskManager(self.db, FakeAuth())
+        self.db.queries.clear()
+    
+    def test_update_is_a_single_scoped_query(self):
+        self.assertTrue(self.manager.update_task(1, priority_level='High'))
+        self.assertEqual(len(self.db.queries), 1)
+        query, params = self.db.queries[0]
+        self.assertIn("WHERE task_id = %s AND user_id = %s", query)
+        self.assertEqual(params, ('High', 1, 1))
+        self.assertEqual(self.manager.get_task(1).priority_level, 'High')
+    
+    def test_update_of_unowned_task_fails_without_touching_cache(self):
+        self.db.rowcount = 0
+        self.assertFalse(self.manager.update_task(2, status='Completed'))
+        self.assertEqual(self.manager.get_task(2).status, 'Pending')
+    
+    def test_invalid_update_is_rejected_before_query(self):
+        self.assertFalse(self.manager.update_task(1, priority_level='Urgent'))
+        self.assertEqual(self.db.queries, [])
+    
+    def test_delete_removes_task_from_index(self):
+        self.assertTrue(self.manager.delete_task(2))
+        self.assertEqual(len(self.db.queries), 1)
+        self.assertEqual([t.task_id for t in self.manager.list_tasks()], [1])
+
+class TestBulkAdd(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDatabase(rows=[task_row(2, 'Second', 'High'), task_row(1, 'First')])
+        self.manager = TaskManager(self.db, FakeAuth())
+        self.db.queries.clear()
+    
+    def test_chunks_share_one_transaction_and_get_consecutive_ids(self):
+        specs = [{'title': f'Bulk {i}', 'priority_level': 'Low'} for i in range(5)]
+        task_ids = self.manager.add_tasks(specs, chunk_size=2)
+        self.assertEqual(task_ids, [100, 101, 102, 103, 104])
+        self.assertEqual(len(self.db.queries), 3)
+        self.assertEqual(self.db.commits, 1)
+        self.assertEqual(self.db.queries[0][1][:3], (1, 'Bulk 0', ''))
+        listed = [t.task_id for t in self.manager.list_tasks()]
+        self.assertEqual(listed, [2, 1, 100, 101, 102, 103, 104])
+        self.assertEqual([t.task_id for t in self.manager.search_tasks('bulk 3')], [103])
+    
+    def test_batch_past_cache_limit_is_left_to_sql(self):
+        self.manager.cache_limit = 3
+        self.assertEqual(len(self.manager.add_tasks([{'title': 'A'}, {'title': 'B'}])), 2)
+        cache = self.manager._cache_for(1)
+        self.assertNotIn(100, cache)
+        self.assertFalse(cache.complete)
+    
+    def test_one_invalid_spec_rejects_the_batch(self):
+        specs = [{'title': 'Fine'}, {'title': 'Bad', 'priority_level': 'Urgent'}]
+        self.assertEqual(self.manager.add_tasks(specs), [])
+        self.assertEqual(self.db.queries, [])
+        self.assertEqual(len(self.manager.list_tasks()), 2)
+    
+    def test_failed_chunk_rolls_back_and_leaves_cache_alone(self):
+        self.db.next_id = None
+        self.assertEqual(self.manager.add_tasks([{'title': 'A'}, {'title': 'B'}]), [])
+        self.assertEqual(self.db.rollbacks, 1)
+        self.assertEqual(len(self.manager.list_tasks()), 2)
+
+class TestBulkUpdate(unittest.TestCase):
+    def setUp(self):
+        self.db = FakeDatabase(rows=[task_row(i, f'Task {i}') for i in range(4, 0, -1)])
+        self.db.owned = {1, 2, 3, 4}
+        self.manager = TaskManager(self.db, FakeAuth())
+        self.db.queries.clear()
+    
+    def test_all_owned_needs_only_the_update(self):
+        outcomes = self.manager.complete_tasks([1, 2, 3])
+        self.assertEqual(outcomes, {1: True, 2: True, 3: True})
+        self.assertEqual(len(self.db.queries), 1)
+        query, params = self.db.queries[0]
+        self.assertIn("WHERE user_id = %s AND task_id IN (%s, %s, %s)", query)
+        self.assertEqual(params, ('Completed', 1, 1, 2, 3))
+        self.assertEqual([t.status for t in self.manager.list_tasks({'status': 'Completed'})],
+                         ['Completed'] * 3)
+    
+    def test_unowned_ids_are_reported_and_left_alone(self):
+        outcomes = self.manager.update_tasks([4, 9], priority_level='High')
+        self.assertEqual(outcomes, {4: True, 9: False})
+        self.assertTrue(self.db.queries[1][0].startswith("SELECT task_id"))
+        self.assertEqual(self.manager.list_tasks()[0].task_id, 4)
+    
+    def test_invalid_update_touches_nothing(self):
+        self.assertEqual(self.manager.update_tasks([1], status='Done'), {1: False})
+        self.assertEqual(self.db.queries, [])
+
+class ScopedDatabase(FakeDatabase):
+    """Answers task queries with the rows of the user in the first parameter."""
+    def __init__(self, rows_by_user):
+        super().__init__()
+        self.rows_by_user = rows_by_user
+        self.during_fetch = None
+    
+    def fetch_iter(self, query, params=(), batch_size=1000):
+        self.queries.append((query, params))
+        if self.during_fetch:
+            self.during_fetch()
+        for row in self.rows_by_user.get(params[0], []):
+            yield dict(row, user_id=params[0])
+
+class TestUserContext(unittest.TestCase):
+    def setUp(self):
+        self.db = ScopedDatabase({1: [task_row(1, 'Mine')], 2: [task_row(2, 'Theirs')]})
+        self.manager = TaskManager(self.db, FakeAuth())
+    
+    def test_context_user_overrides_login_and_gets_own_partition(self):
+        with user_context(2):
+            self.assertEqual([t.title for t in self.manager.list_tasks()], ['Theirs'])
+            self.assertIsNone(self.manager.get_task(1))
+        self.assertEqual([t.title for t in self.manager.list_tasks()], ['Mine'])
+        # Each partition was loaded once, on first use
+        self.assertEqual([params[0] for _, params in self.db.queries if params][:2], [1, 2])
+    
+    def test_interleaved_threads_see_only_their_user(self):
+        seen = {}
+        
+        def serve(user_id):
+            with user_context(user_id):
+                seen[user_id] = [t.title for t in self.manager.list_tasks()]
+        
+        threads = [threading.Thread(target=serve, args=(user_id,)) for user_id in (1, 2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(seen, {1: ['Mine'], 2: ['Theirs']})
+    
+    def test_write_during_partition_load_is_reloaded_on_next_read(self):
+        # Another request for user 2 commits a write while the partition loads
+        self.db.during_fetch = lambda: self.manager._invalidate_statistics(2)
+        with user_context(2):
+            self.manager.list_tasks()
+        self.assertNotIn(2, self.manager._tenants)
+        
+        self.db.during_fetch = None
+        with user_context(2):
+            self.manager.list_tasks()
+        self.assertTrue(self.manager._tenants.peek(2).complete)
+    
+    def test_managers_sharing_partitions_see_each_others_writes(self):
+        other = TaskManager(self.db, FakeAuth(), cache_statistics=True)
+        self.assertIs(other._tenants, self.manager._tenants)
+        
+        # The other manager deletes user 2's task while this one loads the partition
+        def delete_from_other_manager():
+            with user_context(2):
+                self.assertTrue(other.delete_task(2))
+        self.db.during_fetch = delete_from_other_manager
+        with user_context(2):
+            self.manager.list_tasks()
+        self.assertNotIn(2, self.manager._tenants)
+        
+        # Statistics cached through one manager are dropped by the other's writes
+        self.db.during_fetch = None
+        self.db.one = dict.fromkeys(STATISTICS_FIELDS, 1)
+        self.manager.cache_statistics = True
+        with user_context(2):
+            self.assertEqual(self.manager.get_statistics()['total_tasks'], 1)
+            self.db.one = dict.fromkeys(STATISTICS_FIELDS, 0)
+            self.assertEqual(self.manager.get_statistics()['total_tasks'], 1)
+            other.update_task(2, status='Completed')
+            self.assertEqual(self.manager.get_statistics()['total_tasks'], 0)
+
+class TestTenantCache(unittest.TestCase):
+    def loaded(self, *titles):
+        cache = TaskCache()
+        cache.load([Task.from_row(task_row(i, title)) for i, title in enumerate(titles, 1)])
+        return cache
+    
+    def test_least_recently_used_users_are_evicted_past_the_limits(self):
+        tenants = TenantCache(max_users=2, memory_budget=10 ** 6, ttl=0)
+        tenants.put(1, self.loaded('a'))
+        tenants.put(2, self.loaded('b'))
+        self.assertIsNotNone(tenants.get(1))
+        tenants.put(3, self.loaded('c'))
+        self.assertEqual((1 in tenants, 2 in tenants, 3 in tenants), (True, False, True))
+        
+        # A user that outgrows the memory budget pushes the others out
+        tenants.memory_budget = tenants.peek(3).size * 3
+        tenants.peek(3).add_many([Task.from_row(task_row(i, 'more')) for i in (10, 11)])
+        tenants.resize(3)
+        self.assertEqual(len(tenants), 1)
+        self.assertIsNone(tenants.get(2))
+        self.assertEqual({key: tenants.stats()[key] for key in ('hits', 'misses', 'evictions')},
+                         {'hits': 1, 'misses': 1, 'evictions': 2})
+    
+    def test_tasks_expire_after_ttl(self):
+        now = [0.0]
+        tenants = TenantCache(ttl=60, clock=lambda: now[0])
+        tenants.put(1, self.loaded('a'))
+        now[0] = 59
+        self.assertIsNotNone(tenants.get(1))
+        now[0] = 60
+        self.assertIsNone(tenants.get(1))
+        self.assertEqual(tenants.stats()['expirations'], 1)
+    
+    def test_managers_on_one_database_share_warm_users(self):
+        db = ScopedDatabase({1: [task_row(1, 'Mine')]})
+        TaskManager(db, FakeAuth()).list_tasks()
+        # A later session (e.g. the next login) finds the user still cached
+        manager = TaskManager(db, FakeAuth())
+        self.assertEqual([t.title for t in manager.list_tasks()], ['Mine'])
+        self.assertEqual(len(db.queries), 1)
+        self.assertGreater(manager.cache_stats()['hit_rate'], 0)
+
+class SyncDatabase(FakeDatabase):
+    """Loads rows through fetch_iter and answers the change and tombstone queries."""
+    def __init__(self, rows):
+        super().__init__(rows)
+        self.tombstones = []
+    
+    def fetch_all(self, query, params=()):
+        self.queries.append((query, params))
+        if 'task_tombstones' in query:
+            return [dict(row) for row in self.tombstones if row['deleted_at'] >= params[1]]
+        return [dict(row) for row in self.rows if row['updated_at'] >= params[1]]
+
+class TestIncrementalSync(unittest.TestCase):
+    def setUp(self):
+        self.loaded_at = datetime(2030, 1, 1, 12, 0, 0)
+        self.db = SyncDatabase([dict(task_row(i, title), updated_at=self.loaded_at)
+                                for i, title in enumerate(['Report', 'Review', 'Plan'], 1)])
+        self.manager = TaskManager(self.db, FakeAuth())
+        self.db.queries.clear()
+    
+    def test_only_changes_since_the_watermark_are_merged(self):
+        changed_at = datetime(2030, 1, 1, 13, 0, 0)
+        self.db.rows[1] = dict(task_row(2, 'Review slides', priority='High'), updated_at=changed_at)
+        self.db.rows.append(dict(task_row(4, 'Budget'), updated_at=changed_at))
+        del self.db.rows[2]
+        self.db.tombstones.append({'task_id': 3, 'deleted_at': changed_at})
+        
+        self.manager.refresh_tasks(incremental=True)
+        self.assertEqual([query for query, _ in self.db.queries if 'LIMIT' in query], [])
+        self.assertEqual([t.title for t in self.manager.list_tasks()], ['Review slides', 'Report', 'Budget'])
+        self.assertEqual([t.title for t in self.manager.search_tasks('slides')], ['Review slides'])
+        self.assertEqual(self.manager._tenants.peek(1).watermark, changed_at)
+    
+    def test_partition_without_watermark_is_reloaded_in_full(self):
+        for row in self.db.rows:
+            row['updated_at'] = None
+        self.manager.refresh_tasks()
+        self.db.queries.clear()
+        
+        self.manager.refresh_tasks(incremental=True)
+        self.assertEqual([query for query, _ in self.db.queries], [LOAD_QUERY])
+    
+    def test_stale_watermark_is_reloaded_in_full(self):
+        self.manager._tenants.peek(1).watermark = datetime(2000, 1, 1)
+        self.manager.refresh_tasks(incremental=True)
+        self.assertEqual([query for query, _ in self.db.queries], [LOAD_QUERY])
+    
+    def test_syncs_purge_old_tombstones_once_per_interval(self):
+        self.manager.refresh_tasks(incremental=True)
+        self.manager.refresh_tasks(incremental=True)
+        purges = [params for query, params in self.db.queries if query == PURGE_TOMBSTONES_QUERY]
+        self.assertEqual(purges, [(CacheConfig.TASK_TOMBSTONE_RETENTION_HOURS,)])
+    
+    def test_schema_files_track_changes_and_deletes(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for schema in ('setup_multi_user.py', 'users.sql'):
+            with open(os.path.join(root, schema)) as f:
+                text = f.read()
+            for name in ('updated_at TIMESTAMP', 'idx_user_updated', 'task_tombstones',
+                         'idx_deleted', 'trg_tasks_tombstone'):
+                self.assertIn(name, text, f"{schema} lacks {name}")
+
+class TestTaskOrdering(unittest.TestCase):
+    def test_list_orders_by_priority_then_due_date_with_unset_last(self):
+        soon = date.today().replace(year=date.today().year + 1)
+        later = soon.replace(year=soon.year + 1)
+        rows = [
+            task_row(5, 'Low soon', 'Low', soon),
+            task_row(4, 'High unset', 'High'),
+            task_row(3, 'High later', 'High', later),
+            task_row(2, 'Medium unset', 'Medium'),
+            task_row(1, 'High soon', 'High', soon),
+        ]
+        manager = TaskManager(FakeDatabase(rows=rows), FakeAuth())
+        self.assertEqual([t.task_id for t in manager.list_tasks()], [1, 3, 4, 2, 5])
+    
+    def test_sorted_view_follows_updates_and_inserts(self):
+        manager = TaskManager(FakeDatabase(rows=[task_row(2, 'B'), task_row(1, 'A')]), FakeAuth())
+        manager.update_task(2, priority_level='High')
+        self.assertEqual([t.task_id for t in manager.list_tasks()], [2, 1])
+        manager.update_task(2, priority_level='Medium')
+        self.assertEqual([t.task_id for t in manager.list_tasks()], [1, 2])
+
+class TestTaskPagination(unittest.TestCase):
+    def setUp(self):
+        self.rows = [task_row(i, f'Task {i}', 'High' if i % 2 else 'Low') for i in range(6, 0, -1)]
+    
+    def test_cached_pages_follow_list_order(self):
+        manager = TaskManager(FakeDatabase(rows=self.rows), FakeAuth())
+        pages, cursor = [], None
+        while True:
+            page = manager.list_tasks(limit=4, after_cursor=cursor)
+            if not page:
+                break
+            pages.append([t.task_id for t in page])
+            cursor = manager.page_cursor(page[-1])
+        self.assertEqual(pages, [[1, 3, 5, 2], [4, 6]])
+        self.assertEqual([t.task_id for t in manager.list_tasks({'priority': 'Low'}, limit=2)], [2, 4])
+    
+    def test_large_accounts_page_from_database(self):
+        db = FakeDatabase(rows=self.rows)
+        manager = TaskManager(db, FakeAuth(), cache_limit=3)
+        db.rows = [task_row(3, 'Task 3', 'High')]
+        db.queries.clear()
+        
+        after = manager.page_cursor(Task(task_id=1, title='Task 1', priority_level='High'))
+        page = manager.list_tasks({'status': 'Pending'}, limit=2, after_cursor=after)
+        
+        self.assertEqual([t.task_id for t in page], [3])
+        query, params = db.queries[0]
+        self.assertIn("ORDER BY priority_level DESC", query)
+        self.assertEqual(params[:2], (1, 'Pending'))
+        self.assertEqual(params[-1], 2)
+    
+    def test_uncached_search_ranks_and_limits_in_sql(self):
+        db = FakeDatabase(rows=self.rows)
+        manager = TaskManager(db, FakeAuth(), cache_limit=3)
+        db.rows = [dict(task_row(4, 'Task 4', 'Low'), description='Follow up on task list', score=0)]
+        db.queries.clear()
+        
+        hits = manager.search_hits('task', limit=5)
+        
+        self.assertEqual(len(db.queries), 1)
+        query, params = db.queries[0]
+        self.assertIn("ORDER BY score DESC, priority_level DESC", query)
+        self.assertEqual(params[-1], 5)
+        self.assertEqual(hits[0].excerpt, "Follow up on **task** list")
+    
+    def test_invalid_cursor_is_rejected(self):
+        manager = TaskManager(FakeDatabase(rows=self.rows), FakeAuth())
+        with self.assertRaises(ValueError):
+            manager.list_tasks(limit=2, after_cursor='garbage')
+
+class TestTaskQuery(unittest.TestCase):
+    def test_filters_become_parameterized_conditions_with_index_hint(self):
+        cutoff = date(2030, 1, 1)
+        query, params = TaskQuery(1).filter({'priority': 'High', 'due_before': cutoff}).limit(5).build()
+        self.assertIn("USE INDEX (idx_user_priority)", query)
+        self.assertIn("priority_level = %s AND due_date < %s", query)
+        self.assertEqual(params, (1, 'High', cutoff, date.max, 5))
+    
+    def test_index_hints_name_indexes_the_schema_creates(self):
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for schema in ('setup_multi_user.py', 'users.sql'):
+            with open(os.path.join(root, schema)) as f:
+                created = set(re.findall(r'INDEX (\w+) \(', f.read()))
+            for key, index in INDEX_HINTS:
+                query, _ = TaskQuery(1).filter({key: 'x'}).build()
+                self.assertIn(f"USE INDEX ({index})", query)
+                self.assertIn(index, created, f"{schema} does not create {index}")
+    
+    def test_keyset_condition_lists_lower_priorities(self):
+        key = (-2, False, date(2030, 1, 1), 9)
+        query, params = TaskQuery(1).after(key).build()
+        self.assertIn("priority_level IN (%s)", query)
+        self.assertEqual(params[1:3], ('Low', 'Medium'))
+    
+    def test_range_filters_apply_to_cached_tasks(self):
+        soon = date.today().replace(year=date.today().year + 1)
+        rows = [task_row(1, 'Soon', due_date=soon), task_row(2, 'Unset')]
+        manager = TaskManager(FakeDatabase(rows=rows), FakeAuth())
+        self.assertEqual([t.task_id for t in manager.list_tasks({'due_after': date.today()})], [1])
+        self.assertEqual(manager.list_tasks({'due_before': date.today()}), [])
+
+class TestTaskSearch(unittest.TestCase):
+    def test_fulltext_search_is_ranked_and_paginated_in_sql(self):
+        db = FakeDatabase(rows=[])
+        manager = TaskManager(db, FakeAuth())
+        db.rows = [task_row(7, 'Budget review')]
+        db.queries.clear()
+        
+        results = manager.search_tasks('budget rev!', fulltext=True, limit=10, offset=20)
+        
+        self.assertEqual([t.task_id for t in results], [7])
+        query, params = db.queries[0]
+        self.assertIn("MATCH(title, description) AGAINST", query)
+        self.assertIn("ORDER BY relevance DESC", query)
+        self.assertEqual(params, ('+budget* +rev*', 1, '+budget* +rev*', 10, 20))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
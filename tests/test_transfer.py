@@ -0,0 +1,95 @@
+import io
+import json
+import unittest
+from datetime import date
+from src.transfer import export_tasks, import_tasks, record_to_task
+
+class FakeStreamingDatabase:
+    def __init__(self, rows):
+        self.rows = rows
+    
+    def fetch_iter(self, query, params=(), batch_size=1000):
+        for row in self.rows:
+            yield dict(row)
+
+class FakeTaskManager:
+    """Collects the chunks passed to add_tasks; fails the chunk numbers in fail_on."""
+    def __init__(self, fail_on=()):
+        self.chunks = []
+        self.fail_on = set(fail_on)
+    
+    def add_tasks(self, tasks, chunk_size=None):
+        if len(self.chunks) + 1 in self.fail_on:
+            self.fail_on.discard(len(self.chunks) + 1)
+            return []
+        self.chunks.append([task.title for task in tasks])
+        return list(range(len(tasks)))
+
+ROWS = [
+    {'task_id': 1, 'user_id': 7, 'title': 'Old report', 'description': 'Q1, final',
+     'due_date': date(2020, 1, 31), 'priority_level': 'High', 'status': 'Completed',
+     'creation_timestamp': None},
+    {'task_id': 2, 'user_id': 7, 'title': 'Plan', 'description': None,
+     'due_date': None, 'priority_level': 'Low', 'status': 'Pending',
+     'creation_timestamp': None},
+]
+
+class TestExportImport(unittest.TestCase):
+    def round_trip(self, fmt):
+        out = io.StringIO()
+        self.assertEqual(export_tasks(FakeStreamingDatabase(ROWS), 7, out, fmt), 2)
+        manager = FakeTaskManager()
+        result = import_tasks(manager, io.StringIO(out.getvalue()), fmt)
+        self.assertTrue(result.finished)
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(manager.chunks, [['Old report', 'Plan']])
+        return out.getvalue()
+    
+    def test_jsonl_round_trip(self):
+        first = json.loads(self.round_trip('jsonl').splitlines()[0])
+        self.assertEqual(first['due_date'], '2020-01-31')
+        self.assertEqual(first['status'], 'Completed')
+    
+    def test_csv_round_trip(self):
+        self.assertTrue(self.round_trip('csv').startswith('task_id,title,description'))
+    
+    def test_overdue_record_keeps_due_date_and_status(self):
+        task = record_to_task({'title': 'Late', 'due_date': '2020-01-31', 'status': 'Completed'})
+        self.assertEqual(task.due_date, date(2020, 1, 31))
+        self.assertEqual(task.status, 'Completed')
+        self.assertIsNone(task.task_id)
+    
+    def test_invalid_records_are_skipped_and_reported(self):
+        source = io.StringIO('{"title": "Good"}\nnot json\n{"title": "Bad", "status": "Done"}\n')
+        manager = FakeTaskManager()
+        result = import_tasks(manager, source)
+        self.assertEqual(manager.chunks, [['Good']])
+        self.assertEqual(len(result.errors), 2)
+        self.assertTrue(result.errors[0].startswith('record 2'))
+    
+    def test_records_with_wrongly_typed_fields_are_skipped(self):
+        bad = [{'title': 5}, {'title': 'x', 'priority_level': ['High']}, {'title': 'x', 'status': 1},
+               {'title': 'x', 'due_date': 20240101}, {'title': 'x', 'description': {'a': 1}}]
+        source = io.StringIO("".join(json.dumps(record) + "\n" for record in bad + [{'title': 'Good'}]))
+        manager = FakeTaskManager()
+        result = import_tasks(manager, source)
+        self.assertTrue(result.finished)
+        self.assertEqual(manager.chunks, [['Good']])
+        self.assertEqual([error.split(':')[0] for error in result.errors],
+                         [f'record {number}' for number in range(1, 6)])
+        self.assertIn('title must be a string, not int', result.errors[0])
+    
+    def test_failed_chunk_reports_resume_offset(self):
+        lines = "".join(json.dumps({'title': f'Task {i}'}) + "\n" for i in range(5))
+        manager = FakeTaskManager(fail_on={2})
+        result = import_tasks(manager, io.StringIO(lines), chunk_size=2)
+        self.assertFalse(result.finished)
+        self.assertEqual(result.next_offset, 2)
+        
+        result = import_tasks(manager, io.StringIO(lines), chunk_size=2, offset=result.next_offset)
+        self.assertTrue(result.finished)
+        self.assertEqual(result.next_offset, 5)
+        self.assertEqual(manager.chunks, [['Task 0', 'Task 1'], ['Task 2', 'Task 3'], ['Task 4']])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -17,8 +17,25 @@ CREATE TABLE IF NOT EXISTS tasks (
     priority_level ENUM('Low', 'Medium', 'High') NOT NULL DEFAULT 'Medium',
     status ENUM('Pending', 'In Progress', 'Completed') NOT NULL DEFAULT 'Pending',
     creation_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
     INDEX idx_user_id (user_id),
     INDEX idx_user_status (user_id, status),
-    INDEX idx_user_priority (user_id, priority_level)
-);
\ No newline at end of file
+    INDEX idx_user_priority (user_id, priority_level),
+    INDEX idx_user_updated (user_id, updated_at),
+    FULLTEXT INDEX ft_task_text (title, description)
+);
+
+-- Deleted tasks, for incremental cache refreshes; purged after TASK_TOMBSTONE_RETENTION_HOURS
+CREATE TABLE IF NOT EXISTS task_tombstones (
+    task_id INT PRIMARY KEY,
+    user_id INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_user_deleted (user_id, deleted_at),
+    INDEX idx_deleted (deleted_at)
+);
+
+DROP TRIGGER IF EXISTS trg_tasks_tombstone;
+CREATE TRIGGER trg_tasks_tombstone AFTER DELETE ON tasks FOR EACH ROW
+    INSERT INTO task_tombstones (task_id, user_id) VALUES (OLD.task_id, OLD.user_id)
+    ON DUPLICATE KEY UPDATE deleted_at = CURRENT_TIMESTAMP;
\ No newline at end of file